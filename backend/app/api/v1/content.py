@@ -1,7 +1,7 @@
 """
 内容相关API路由
 """
-from fastapi import APIRouter, Depends, Query, Path
+from fastapi import APIRouter, Depends, Query, Path, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from app.db.database import get_db
@@ -26,6 +26,8 @@ async def get_user_feed(
     page: int = Query(default=1, ge=1, description="页码"),
     page_size: int = Query(default=20, ge=1, le=50, description="每页大小"),
     refresh: bool = Query(default=False, description="是否刷新缓存"),
+    cursor: Optional[str] = Query(default=None, description="分页游标（上一页返回的next_cursor）"),
+    include_total: bool = Query(default=False, description="是否统计总数"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -37,18 +39,23 @@ async def get_user_feed(
     - **page**: 页码，从1开始
     - **page_size**: 每页大小，最大50
     - **refresh**: 是否刷新缓存获取最新内容
+    - **cursor**: 键集分页游标，传入后忽略page，深分页时推荐使用
+    - **include_total**: 是否统计总数，默认不统计，通过has_more判断是否还有下一页
     """
     logger.info(f"用户 {current_user.id} 获取动态流，页码: {page}")
     
-    result = await content_service.get_user_feed(
+    # 直接返回服务层序列化好的JSON，首页命中缓存时不再重复序列化
+    content = await content_service.get_user_feed_json(
         db=db,
         user_id=current_user.id,
         page=page,
         page_size=page_size,
-        refresh=refresh
+        refresh=refresh,
+        cursor=cursor,
+        include_total=include_total
     )
     
-    return result
+    return Response(content=content, media_type="application/json")
 
 
 @router.get("/articles/{article_id}", response_model=ArticleDetail)
@@ -83,6 +90,8 @@ async def get_articles_by_account(
     platform: str = Query(..., description="平台标识"),
     page: int = Query(default=1, ge=1, description="页码"),
     page_size: int = Query(default=20, ge=1, le=50, description="每页大小"),
+    cursor: Optional[str] = Query(default=None, description="分页游标（上一页返回的next_cursor）"),
+    include_total: bool = Query(default=False, description="是否统计总数"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -95,6 +104,8 @@ async def get_articles_by_account(
     - **platform**: 平台标识 (wechat, weibo, twitter, etc.)
     - **page**: 页码，从1开始
     - **page_size**: 每页大小，最大50
+    - **cursor**: 键集分页游标，传入后忽略page，翻页时推荐使用
+    - **include_total**: 是否统计总数，默认不统计，通过has_more判断是否还有下一页
     """
     logger.info(f"用户 {current_user.id} 获取账号 {account_id} 的文章列表，平台: {platform}")
     
@@ -103,7 +114,9 @@ async def get_articles_by_account(
         account_id=account_id,
         platform=platform,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        cursor=cursor,
+        include_total=include_total
     )
     
     return result
@@ -131,16 +144,17 @@ async def get_content_stats(
 
 @router.post("/feed/refresh")
 async def refresh_feed_cache(
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     刷新动态流缓存
     
-    手动刷新当前用户的动态流缓存，强制获取最新内容。
+    手动刷新当前用户的动态流缓存并重建动态流索引，强制获取最新内容。
     """
     logger.info(f"用户 {current_user.id} 刷新动态流缓存")
     
-    success = await content_service.refresh_user_feed_cache(current_user.id)
+    success = await content_service.refresh_user_feed_cache(current_user.id, db=db)
     
     return {
         "success": success,
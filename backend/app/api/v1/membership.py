@@ -119,7 +119,7 @@ async def check_push_limit(
 async def get_membership_benefits():
     """获取所有会员等级权益对比"""
     try:
-        benefits_info = await limits_service.get_all_membership_benefits()
+        benefits_info = limits_service.get_all_membership_benefits()
         return BaseResponse(data=benefits_info, message="获取会员权益信息成功")
     except BusinessException as e:
         raise HTTPException(status_code=e.status_code, detail=e.message)
@@ -138,7 +138,7 @@ async def get_level_benefits(level: str):
                 detail=f"无效的会员等级: {level}"
             )
         
-        benefits_info = await limits_service.get_membership_benefits_display(membership_level)
+        benefits_info = limits_service.get_membership_benefits_display(membership_level)
         return BaseResponse(data=benefits_info, message="获取会员权益信息成功")
     except BusinessException as e:
         raise HTTPException(status_code=e.status_code, detail=e.message)
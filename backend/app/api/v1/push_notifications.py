@@ -159,9 +159,14 @@ async def get_push_records(
             page_size=page_size
         )
         
+        pagination = result["pagination"]
         return PaginatedResponse(
             data=result["records"],
-            pagination=result["pagination"],
+            total=pagination["total_count"],
+            page=pagination["page"],
+            page_size=pagination["page_size"],
+            total_pages=pagination["total_pages"],
+            has_more=pagination["has_next"],
             message=f"获取到 {len(result['records'])} 条推送记录"
         )
         
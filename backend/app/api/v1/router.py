@@ -44,9 +44,9 @@ api_router.include_router(content_router, prefix="/content", tags=["内容"])
 # 注册内容检测路由
 api_router.include_router(content_detection_router, prefix="/content-detection", tags=["内容检测"])
 
-# 注册推送通知路由
+# 注册推送通知路由（已在子路由内声明prefix）
 from app.api.v1.push_notifications import router as push_notifications_router
-api_router.include_router(push_notifications_router, prefix="/push-notifications", tags=["推送通知"])
+api_router.include_router(push_notifications_router)
 
 # 注册搜索路由
 from app.api.v1.search import router as search_router
@@ -51,6 +51,10 @@ celery_app.conf.update(
             "task": "app.tasks.content.fetch_new_content",
             "schedule": 300.0,  # 每5分钟执行一次
         },
+        "refresh-user-platform-stats": {
+            "task": "app.tasks.content.refresh_user_platform_stats",
+            "schedule": 300.0,  # 每5分钟执行一次
+        },
         "send-push-notifications": {
             "task": "app.tasks.push.send_pending_notifications",
             "schedule": 60.0,  # 每分钟执行一次
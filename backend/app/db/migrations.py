@@ -8,6 +8,7 @@ from app.models.user import User
 from app.models.account import Account
 from app.models.article import Article
 from app.models.subscription import Subscription
+from app.models.user_platform_stats import UserPlatformStats
 from app.models.push_record import PushRecord
 from app.core.logging import get_logger
 
@@ -22,6 +23,41 @@ async def create_tables():
         logger.info("所有表创建完成")
 
 
+async def add_columns(session: AsyncSession):
+    """为已有表补充新增列并回填数据（create_all不会修改已存在的表）"""
+    columns = [
+        "ALTER TABLE articles ADD COLUMN publish_timestamp BIGINT NULL COMMENT '发布时间戳（写入时由publish_time计算）';",
+        "ALTER TABLE articles ADD COLUMN images JSON NULL COMMENT '图片URL列表';",
+        "ALTER TABLE articles ADD COLUMN image_count INT NOT NULL DEFAULT 0 "
+        "COMMENT '图片数量（写入时随images维护，读取时无需解析JSON）';",
+    ]
+    
+    for column_sql in columns:
+        try:
+            await session.execute(text(column_sql))
+            logger.info(f"列添加成功: {column_sql.split()[5]}")
+        except Exception as e:
+            logger.warning(f"列添加失败（可能已存在）: {column_sql} - {str(e)}")
+    
+    try:
+        await session.execute(text(
+            "UPDATE articles SET publish_timestamp = UNIX_TIMESTAMP(publish_time) "
+            "WHERE publish_timestamp IS NULL;"
+        ))
+    except Exception as e:
+        logger.warning(f"回填发布时间戳失败: {str(e)}")
+    
+    try:
+        await session.execute(text(
+            "UPDATE articles SET image_count = JSON_LENGTH(images) "
+            "WHERE images IS NOT NULL AND JSON_TYPE(images) = 'ARRAY';"
+        ))
+    except Exception as e:
+        logger.warning(f"回填图片数量失败: {str(e)}")
+    
+    await session.commit()
+
+
 async def create_indexes(session: AsyncSession):
     """创建优化索引"""
     indexes = [
@@ -35,8 +71,10 @@ async def create_indexes(session: AsyncSession):
         
         # 文章表索引
         "CREATE INDEX IF NOT EXISTS idx_article_account_time ON articles(account_id, publish_timestamp DESC);",
+        "CREATE INDEX IF NOT EXISTS idx_article_account_keyset ON articles(account_id, publish_time DESC, id DESC);",
         "CREATE INDEX IF NOT EXISTS idx_article_url ON articles(url);",
         "CREATE INDEX IF NOT EXISTS idx_article_publish_time ON articles(publish_time DESC);",
+        "CREATE INDEX IF NOT EXISTS ix_articles_image_count ON articles(image_count);",
         
         # 订阅表索引
         "CREATE INDEX IF NOT EXISTS idx_subscription_user ON subscriptions(user_id);",
@@ -68,6 +106,7 @@ async def migrate_database():
         # 创建索引
         from app.db.database import AsyncSessionLocal
         async with AsyncSessionLocal() as session:
+            await add_columns(session)
             await create_indexes(session)
         
         logger.info("数据库迁移完成")
@@ -5,6 +5,7 @@ from app.models.user import User, MembershipLevel
 from app.models.account import Account, Platform
 from app.models.article import Article
 from app.models.subscription import Subscription
+from app.models.user_platform_stats import UserPlatformStats
 from app.models.push_record import PushRecord, PushStatus
 from app.models.payment_order import PaymentOrder, PaymentStatus, PaymentChannel
 
@@ -13,6 +14,7 @@ __all__ = [
     "Account", "Platform", 
     "Article",
     "Subscription",
+    "UserPlatformStats",
     "PushRecord", "PushStatus",
     "PaymentOrder", "PaymentStatus", "PaymentChannel"
 ]
\ No newline at end of file
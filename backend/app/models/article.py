@@ -3,9 +3,25 @@
 """
 from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, ForeignKey, BigInteger, Index, func
 from sqlalchemy.dialects.mysql import MEDIUMTEXT
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from app.db.database import Base
 from datetime import datetime
+from typing import Optional
+
+
+def to_publish_timestamp(publish_time) -> Optional[int]:
+    """由publish_time计算publish_timestamp"""
+    return int(publish_time.timestamp()) if publish_time is not None else None
+
+
+def _default_publish_timestamp(context) -> Optional[int]:
+    """Core批量插入未显式给出publish_timestamp时，按同一行的publish_time计算"""
+    return to_publish_timestamp(context.get_current_parameters().get("publish_time"))
+
+
+def _default_image_count(context) -> int:
+    """Core批量插入未显式给出image_count时，按同一行的images计算"""
+    return Article.count_images(context.get_current_parameters().get("images"))
 
 
 class Article(Base):
@@ -39,6 +55,21 @@ class Article(Base):
     summary = Column(Text, nullable=True, comment="文章摘要")
     cover_url = Column(String(500), nullable=True, comment="封面图片URL")
     publish_time = Column(DateTime, nullable=False, comment="发布时间")
+    publish_timestamp = Column(
+        BigInteger,
+        nullable=True,
+        default=_default_publish_timestamp,
+        comment="发布时间戳（写入时由publish_time计算）"
+    )
+    images = Column(JSON, nullable=True, comment="图片URL列表")
+    image_count = Column(
+        Integer,
+        nullable=False,
+        default=_default_image_count,
+        server_default="0",
+        index=True,
+        comment="图片数量（写入时随images维护，读取时无需解析JSON）"
+    )
     details = Column(JSON, nullable=True, comment="平台特定详细信息")
     platform = Column(String(50), nullable=False, comment="平台类型")
     
@@ -46,6 +77,23 @@ class Article(Base):
     account = relationship("Account", back_populates="articles", foreign_keys=[account_id], primaryjoin="Article.account_id == Account.account_id")
     push_records = relationship("PushRecord", back_populates="article", cascade="all, delete-orphan")
     
+    def __init__(self, **kwargs):
+        # 未传入images时image_count为0，未flush的对象也可直接读取
+        kwargs.setdefault("image_count", self.count_images(kwargs.get("images")))
+        super().__init__(**kwargs)
+    
+    @validates("images")
+    def _sync_image_count(self, key, images):
+        """赋值images时同步image_count"""
+        self.image_count = self.count_images(images)
+        return images
+    
+    @validates("publish_time")
+    def _sync_publish_timestamp(self, key, publish_time):
+        """赋值publish_time时同步publish_timestamp，两者不会不一致"""
+        self.publish_timestamp = to_publish_timestamp(publish_time)
+        return publish_time
+    
     def __repr__(self):
         return f"<Article(id={self.id}, title={self.title[:50]}, account_id={self.account_id})>"
     
@@ -56,17 +104,15 @@ class Article(Base):
             for column in self.__table__.columns
         }
     
-    @property
-    def image_count(self) -> int:
-        """图片数量"""
-        if not self.images:
-            return 0
-        return len(self.images) if isinstance(self.images, list) else 0
+    @staticmethod
+    def count_images(images) -> int:
+        """计算images对应的image_count"""
+        return len(images) if isinstance(images, list) else 0
     
     @property
     def has_images(self) -> bool:
         """是否包含图片"""
-        return self.image_count > 0
+        return (self.image_count or 0) > 0
     
     def get_thumbnail_url(self) -> str:
         """获取缩略图URL"""
@@ -0,0 +1,25 @@
+"""
+用户内容统计物化表
+"""
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func
+from app.db.database import Base
+
+
+class UserPlatformStats(Base):
+    """用户按平台的订阅内容统计（定时任务预先计算，内容统计接口按主键读取）"""
+    __tablename__ = "user_platform_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True, comment="用户ID")
+    platform = Column(String(50), primary_key=True, comment="平台类型")
+    total = Column(Integer, nullable=False, default=0, comment="文章总数")
+    today_cnt = Column(Integer, nullable=False, default=0, comment="今日文章数")
+    week_cnt = Column(Integer, nullable=False, default=0, comment="本周文章数")
+    updated_at = Column(
+        DateTime,
+        default=func.now(),
+        nullable=False,
+        comment="统计时间"
+    )
+
+    def __repr__(self):
+        return f"<UserPlatformStats(user_id={self.user_id}, platform={self.platform}, total={self.total})>"
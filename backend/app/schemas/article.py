@@ -96,10 +96,18 @@ class ArticleList(BaseModel):
         return v
 
 
+class RelatedArticle(BaseModel):
+    """相关文章摘要模型（不含正文）"""
+    id: str = Field(description="文章ID")
+    account_id: str = Field(description="账号ID")
+    title: str = Field(description="文章标题")
+    publish_timestamp: int = Field(description="发布时间戳")
+
+
 class ArticleDetail(ArticleWithAccount):
     """文章详情模型"""
     is_subscribed: bool = Field(description="当前用户是否已订阅该账号")
-    related_articles: List[ArticleResponse] = Field(default=[], description="相关文章")
+    related_articles: List[RelatedArticle] = Field(default=[], description="相关文章")
 
 
 class ArticleFeed(BaseModel):
@@ -23,21 +23,42 @@ class DataResponse(BaseResponse, Generic[T]):
 class PaginatedResponse(BaseResponse, Generic[T]):
     """分页响应模型"""
     data: List[T] = Field(description="数据列表")
-    total: int = Field(description="总数量")
+    total: Optional[int] = Field(default=None, description="总数量（未统计时为空）")
     page: int = Field(description="当前页码")
     page_size: int = Field(description="每页大小")
-    total_pages: int = Field(description="总页数")
+    total_pages: Optional[int] = Field(default=None, description="总页数（未统计时为空）")
+    has_more: bool = Field(default=False, description="是否还有下一页")
+    next_cursor: Optional[str] = Field(default=None, description="下一页游标（键集分页）")
     
     @classmethod
-    def create(cls, data: List[T], total: int, page: int, page_size: int):
-        """创建分页响应"""
-        total_pages = (total + page_size - 1) // page_size
+    def create(
+        cls,
+        data: List[T],
+        total: Optional[int],
+        page: int,
+        page_size: int,
+        next_cursor: Optional[str] = None,
+        has_more: Optional[bool] = None
+    ):
+        """
+        创建分页响应
+        
+        total为None表示未统计总数，此时total_pages同样为空，
+        has_more未显式给出时按总数推算，没有总数则看是否有下一页游标
+        """
+        total_pages = None
+        if total is not None:
+            total_pages = (total + page_size - 1) // page_size
+        if has_more is None:
+            has_more = page * page_size < total if total is not None else next_cursor is not None
         return cls(
             data=data,
             total=total,
             page=page,
             page_size=page_size,
-            total_pages=total_pages
+            total_pages=total_pages,
+            has_more=has_more,
+            next_cursor=next_cursor
         )
 
 
@@ -1,20 +1,26 @@
 """
 内容获取服务
 """
-from typing import List, Optional, Dict, Any, Tuple
+from typing import AsyncIterator, List, Optional, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, desc, func, text
+from sqlalchemy import select, and_, or_, desc, func, text, case, exists, lambda_stmt, bindparam, delete, tuple_
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 from sqlalchemy.orm import selectinload
 from app.models.article import Article
 from app.models.account import Account
 from app.models.subscription import Subscription
-from app.schemas.article import ArticleResponse, ArticleWithAccount, ArticleDetail, ArticleFeed, ArticleStats
+from app.models.user_platform_stats import UserPlatformStats
+from app.schemas.article import ArticleResponse, ArticleWithAccount, ArticleDetail, ArticleFeed, ArticleStats, RelatedArticle
 from app.schemas.common import PaginatedResponse
 from app.db.redis import get_redis
-from app.core.exceptions import BusinessException
+from app.core.exceptions import BusinessException, NotFoundException, ValidationException
 from app.services.image import image_service
 from app.services.platform import platform_service
 from app.services.search import search_service
+from app.celery_app import celery_app
+import base64
 import json
 import traceback
 from app.core.logging import get_logger
@@ -22,6 +28,14 @@ from datetime import datetime, timedelta
 
 logger = get_logger(__name__)
 
+# 平台显示名称
+_PLATFORM_DISPLAY = {
+    "wechat": "微信公众号",
+    "weibo": "微博",
+    "twitter": "推特",
+    "mock": "测试平台"
+}
+
 
 class ContentService:
     """内容获取服务"""
@@ -29,7 +43,19 @@ class ContentService:
     def __init__(self):
         self.cache_prefix = "content:"
         self.feed_cache_ttl = 300  # 5分钟
+        self.feed_json_cache_ttl = 30  # 首页序列化结果缓存30秒
         self.detail_cache_ttl = 600  # 10分钟
+        self.feed_count_cache_ttl = 60  # 1分钟
+        self.feed_count_limit = 10000  # 动态流总数统计上限
+        self.feed_count_prefix = "feed:count:"
+        self.feed_index_prefix = "feed:u:"
+        self.feed_index_size = 500  # 每个用户索引的最新文章数
+        # 微信文章来自外部数据库，新文章发布时没有失效通知，索引与文章缓存的有效期与动态流缓存一致
+        self.feed_index_ttl = self.feed_cache_ttl
+        self.feed_index_rebuild_lock_ttl = 60  # 同一用户1分钟内只提交一次后台重建
+        self.feed_stream_batch_size = 100  # 流式重建索引时每批读取/写入的条数
+        self.platform_stats_max_age = timedelta(hours=1)  # 物化统计超过该时长视为过期
+        self.platform_stats_batch_size = 1000  # 物化统计每批写入的行数
     
     async def get_user_feed(
         self, 
@@ -37,7 +63,9 @@ class ContentService:
         user_id: int, 
         page: int = 1, 
         page_size: int = 20,
-        refresh: bool = False
+        refresh: bool = False,
+        cursor: Optional[str] = None,
+        include_total: bool = False
     ) -> PaginatedResponse[ArticleWithAccount]:
         """
         获取用户动态流
@@ -48,13 +76,15 @@ class ContentService:
             page: 页码
             page_size: 每页大小
             refresh: 是否刷新缓存
+            cursor: 键集分页游标（上一页返回的next_cursor），提供时忽略page
+            include_total: 是否统计总数，默认只返回has_more以省去每页的计数
         
         Returns:
             分页的文章列表
         """
         try:
             # 构建缓存键
-            cache_key = f"{self.cache_prefix}feed:{user_id}:{page}:{page_size}"
+            cache_key = f"{self.cache_prefix}feed:{user_id}:{cursor or page}:{page_size}:{int(include_total)}"
             
             # 如果不是刷新请求，先尝试从缓存获取
             if not refresh:
@@ -64,10 +94,7 @@ class ContentService:
                     return cached_result
             
             # 获取用户订阅的账号ID列表
-            subscribed_accounts_query = select(Subscription.account_id, Subscription.platform).where(
-                Subscription.user_id == user_id
-            )
-            subscribed_accounts_result = await db.execute(subscribed_accounts_query)
+            subscribed_accounts_result = await db.execute(self._subscribed_accounts_stmt(user_id))
             # 同时获取account_id和platform
             subscribed_accounts = [(row[0], row[1]) for row in subscribed_accounts_result.fetchall()]
             subscribed_account_ids = [account[0] for account in subscribed_accounts]
@@ -81,24 +108,44 @@ class ContentService:
                     page_size=page_size
                 )
 
-            articles = []
-            for account_id, platform in subscribed_accounts:
-                account_articles = await search_service.get_articles_by_account(db=db, platform=platform, account_id=account_id, page=page, page_size=page_size)                
-                if account_articles:
-                    articles.extend(account_articles)
-                else:
-                    logger.error(f"获取账号 {account_id} 的文章列表失败")
+            before = self.decode_cursor(cursor) if cursor else None
+            offset = 0 if before else (page - 1) * page_size
+            # 每个账号只需取到当前页末尾再多1篇，即可在合并后判断是否还有下一页
+            limit = offset + page_size + 1
+
+            articles = None
+            if not refresh:
+                articles = await self._get_indexed_feed(user_id, offset, page_size, before)
             
-            # 根据文章发布时间降序排序
+            if articles is not None:
+                # 索引返回的窗口已从当前页起始位置开始
+                page_articles = articles[:page_size]
+                has_next = len(articles) > page_size
+            else:
+                # 本次请求只取到当前页所需的篇数，索引由后台任务按完整容量重建
+                articles = await self._fetch_feed_articles(
+                    db, subscribed_accounts, page, page_size, limit, before
+                )
+                if before is None:
+                    await self._schedule_feed_index_rebuild(user_id)
+                page_articles = articles[offset:offset + page_size]
+                has_next = len(articles) > offset + page_size
+            
+            next_cursor = None
+            if has_next:
+                next_cursor = self.encode_cursor(*self._article_sort_key(page_articles[-1]))
 
-            articles = sorted(articles, key=lambda x: x.publish_timestamp, reverse=True)
-            total = len(articles)
+            total = None
+            if include_total:
+                total = await self._get_feed_total(user_id, subscribed_accounts, refresh)
 
             result = PaginatedResponse.create(
-                data=articles,
+                data=page_articles,
                 total=total,
                 page=page,
-                page_size=page_size
+                page_size=page_size,
+                next_cursor=next_cursor,
+                has_more=next_cursor is not None
             )
             
             # 缓存结果
@@ -107,10 +154,56 @@ class ContentService:
             logger.info(f"获取用户 {user_id} 的动态流，页码: {page}，总数: {total}")
             return result
             
+        except BusinessException:
+            raise
         except Exception as e:
             logger.error(f"获取用户动态流失败: {str(e)}")
             raise BusinessException(message="获取动态流失败")
     
+    async def get_user_feed_json(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        page: int = 1,
+        page_size: int = 20,
+        refresh: bool = False,
+        cursor: Optional[str] = None,
+        include_total: bool = False
+    ) -> str:
+        """
+        获取序列化后的用户动态流JSON
+        
+        首页（无游标、不统计总数）的序列化结果按(user_id, page_size)短时缓存，
+        命中时跳过查询、模型重建和响应序列化；缓存内容不含响应时间，每次请求单独补上
+        """
+        first_page = page == 1 and cursor is None and not include_total
+        if first_page and not refresh:
+            cached_json = await self._get_cached_feed_json(user_id, page_size)
+            if cached_json is not None:
+                logger.info(f"从缓存获取用户 {user_id} 的动态流首页JSON")
+                return self._with_response_timestamp(cached_json)
+        
+        result = await self.get_user_feed(
+            db=db,
+            user_id=user_id,
+            page=page,
+            page_size=page_size,
+            refresh=refresh,
+            cursor=cursor,
+            include_total=include_total
+        )
+        content = result.model_dump_json(exclude={"timestamp"})
+        
+        if first_page:
+            await self._cache_feed_json(user_id, page_size, content)
+        return self._with_response_timestamp(content)
+    
+    @staticmethod
+    def _with_response_timestamp(content: str) -> str:
+        """在不含timestamp的响应JSON对象前补上当前响应时间"""
+        timestamp = json.dumps(datetime.now().isoformat())
+        return f'{{"timestamp":{timestamp},{content[1:]}'
+    
     async def get_article_detail(
         self, 
         db: AsyncSession, 
@@ -130,67 +223,17 @@ class ContentService:
             文章详情
         """
         try:
-            # 构建缓存键
-            cache_key = f"{self.cache_prefix}detail:{article_id}:{user_id or 0}"
-            
-            # 尝试从缓存获取
-            cached_result = await self._get_cached_detail(cache_key)
-            if cached_result:
-                logger.info(f"从缓存获取文章详情: {article_id}")
-                return cached_result
-
-            article = await search_service.get_article_detail(article_id, platform)
+            # 文章正文与相关文章与用户无关，按文章缓存；只有订阅状态需要按用户查询
+            article_detail = await self._get_article_body(db, article_id, platform)
             
-            if not article:
-                raise BusinessException(message="文章不存在", error_code=404)
-            
-            account = await search_service.get_account_by_platform_id(platform, article.account_id)
-            
-            # 检查用户是否已订阅该账号
             is_subscribed = False
             if user_id:
-                subscription_query = select(Subscription).where(
-                    and_(
-                        Subscription.user_id == user_id,
-                        Subscription.account_id == article.account_id
-                    )
+                is_subscribed = await self._is_subscribed(
+                    db, user_id, article_detail.account_id, article_detail.account_platform
                 )
-                subscription_result = await db.execute(subscription_query)
-                is_subscribed = subscription_result.first() is not None
-            
-            # 获取相关文章（同一账号的其他文章）
-            # related_articles = await self._get_related_articles(db, article.account_id, article.id)
-            
-            # 构建详情响应
-            article_detail = ArticleDetail(
-                id=article.id,
-                account_id=article.account_id,
-                title=article.title,
-                url=article.url,
-                content=article.content,
-                summary=article.summary,
-                publish_time=article.publish_time,
-                publish_timestamp=article.publish_timestamp,
-                images=article.images or [],
-                details=article.details or {},
-                created_at=article.created_at,
-                updated_at=article.updated_at,
-                image_count=article.image_count,
-                has_images=article.has_images,
-                thumbnail_url=article.thumbnail_url,
-                account_name=account.name,
-                account_platform=account.platform,
-                account_avatar_url=account.avatar_url,
-                platform_display_name=platform_service.get_platform_display_name(account.platform),
-                is_subscribed=is_subscribed,
-                related_articles=[]
-            )
-            
-            # 缓存结果
-            await self._cache_detail(cache_key, article_detail)
             
             logger.info(f"获取文章详情: {article_id}")
-            return article_detail
+            return article_detail.model_copy(update={"is_subscribed": is_subscribed})
             
         except BusinessException:
             raise
@@ -198,6 +241,74 @@ class ContentService:
             logger.error(f"获取文章详情失败: {str(e)}")
             traceback.print_exc()
             raise BusinessException(message="获取文章详情失败")
+    
+    async def _get_article_body(
+        self,
+        db: AsyncSession,
+        article_id: str,
+        platform: Optional[str] = None
+    ) -> ArticleDetail:
+        """获取与用户无关的文章详情（含相关文章），按文章缓存"""
+        cache_key = f"{self.cache_prefix}detail:{platform}:{article_id}"
+        
+        cached_result = await self._get_cached_detail(cache_key)
+        if cached_result:
+            logger.info(f"从缓存获取文章详情: {article_id}")
+            return cached_result
+        
+        article = await search_service.get_article_detail(article_id, platform)
+        
+        if not article:
+            raise NotFoundException("文章不存在")
+        
+        account = await search_service.get_account_by_platform_id(platform, article.account_id)
+        
+        # 获取相关文章（同一账号的其他文章）
+        related_articles = await self._get_related_articles(db, article.account_id, account.platform, article.id)
+        
+        article_detail = ArticleDetail(
+            id=article.id,
+            account_id=article.account_id,
+            title=article.title,
+            url=article.url,
+            content=article.content,
+            summary=article.summary,
+            publish_time=article.publish_time,
+            publish_timestamp=article.publish_timestamp,
+            images=article.images or [],
+            details=article.details or {},
+            created_at=article.created_at,
+            updated_at=article.updated_at,
+            image_count=article.image_count,
+            has_images=article.has_images,
+            thumbnail_url=article.thumbnail_url,
+            account_name=account.name,
+            account_platform=account.platform,
+            account_avatar_url=account.avatar_url,
+            platform_display_name=platform_service.get_platform_display_name(account.platform),
+            is_subscribed=False,
+            related_articles=related_articles
+        )
+        
+        await self._cache_detail(cache_key, article_detail)
+        return article_detail
+    
+    async def _is_subscribed(self, db: AsyncSession, user_id: int, account_id: str, platform: str) -> bool:
+        """判断用户是否已订阅指定平台的账号"""
+        subscribed = await db.scalar(
+            lambda_stmt(
+                lambda: select(
+                    exists().where(
+                        and_(
+                            Subscription.user_id == user_id,
+                            Subscription.account_id == account_id,
+                            Subscription.platform == platform
+                        )
+                    )
+                )
+            )
+        )
+        return bool(subscribed)
             
     
     async def get_articles_by_account(
@@ -206,35 +317,65 @@ class ContentService:
         account_id: str,
         platform: str,
         page: int = 1,
-        page_size: int = 20
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        include_total: bool = False
     ) -> PaginatedResponse[ArticleWithAccount]:
         """
         获取指定账号的文章列表
         
+        按页码翻页需要从第一篇取到当前页末尾，连续翻页应使用cursor
+        
         Args:
             db: 数据库会话
             account_id: 账号ID
+            platform: 平台标识
             page: 页码
             page_size: 每页大小
+            cursor: 键集分页游标（上一页返回的next_cursor），提供时忽略page
+            include_total: 是否统计总数，默认只返回has_more以省去每页的计数
         
         Returns:
             分页的文章列表
         """
         try:
+            before = self.decode_cursor(cursor) if cursor else None
+            offset = 0 if before else (page - 1) * page_size
+
+            articles = await search_service.get_articles_by_account(
+                db=db,
+                platform=platform,
+                account_id=account_id,
+                page=page,
+                page_size=page_size,
+                limit=offset + page_size + 1,
+                before=before
+            ) or []
+            logger.info(f"已获取账号 {account_id} 的文章列表，页码: {page}，数量: {len(articles)}")
+
+            page_articles = articles[offset:offset + page_size]
+            next_cursor = None
+            if len(articles) > offset + page_size:
+                next_cursor = self.encode_cursor(*self._article_sort_key(page_articles[-1]))
+
+            total = None
+            if include_total:
+                total = await self._count_articles([(account_id, platform)])
 
-            articles = await search_service.get_articles_by_account(db=db, platform=platform, account_id=account_id, page=page, page_size=page_size)
-            logger.info(f"已获取账号 {account_id} 的文章列表，页码: {page}，总数: {len(articles)}")
-            logger.info(f"组装 PaginatedResponse")
             result = PaginatedResponse.create(
-                data=articles,
-                total=len(articles),
+                data=page_articles,
+                total=total,
                 page=page,
-                page_size=page_size
+                page_size=page_size,
+                next_cursor=next_cursor,
+                has_more=next_cursor is not None
             )
             
-            logger.info(f"获取账号 {account_id} 的文章列表，页码: {page}，总数: {len(articles)}")
+            logger.info(f"获取账号 {account_id} 的文章列表，页码: {page}，总数: {total}")
             return result
             
+        except BusinessException:
+            raise
         except Exception as e:
             logger.error(f"获取账号文章列表失败: {str(e)}")
             raise BusinessException(message="获取文章列表失败")
@@ -251,66 +392,51 @@ class ContentService:
             内容统计信息
         """
         try:
-            # 获取用户订阅的账号ID列表
-            subscribed_accounts_query = select(Subscription.account_id).where(
-                Subscription.user_id == user_id
-            )
-            subscribed_accounts_result = await db.execute(subscribed_accounts_query)
-            subscribed_account_ids = [row[0] for row in subscribed_accounts_result.fetchall()]
-            
-            if not subscribed_account_ids:
-                return ArticleStats(
-                    total_articles=0,
-                    today_articles=0,
-                    week_articles=0,
-                    platform_stats={}
-                )
-            
             # 计算时间范围
             now = datetime.now()
             today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
             week_start = today_start - timedelta(days=7)
             
-            # 查询总文章数
-            total_query = select(func.count(Article.id)).where(
-                Article.account_id.in_(subscribed_account_ids)
+            # 优先读取定时任务预先计算的统计，过期或缺失时回退到实时统计
+            stats = await self._get_materialized_stats(
+                db, user_id, max(now - self.platform_stats_max_age, today_start)
             )
-            total_result = await db.execute(total_query)
-            total_articles = total_result.scalar() or 0
-            
-            # 查询今日文章数
-            today_query = select(func.count(Article.id)).where(
-                and_(
-                    Article.account_id.in_(subscribed_account_ids),
-                    Article.publish_time >= today_start
+            if stats is not None:
+                logger.info(f"从物化表获取用户 {user_id} 的内容统计")
+                return stats
+            
+            # 单条分组查询，通过条件聚合同时统计总数、今日和本周文章数
+            stats_query = lambda_stmt(
+                lambda: select(
+                    Account.platform,
+                    func.count(Article.id).label("total"),
+                    func.sum(case((Article.publish_time >= today_start, 1), else_=0)).label("today"),
+                    func.sum(case((Article.publish_time >= week_start, 1), else_=0)).label("week")
                 )
-            )
-            today_result = await db.execute(today_query)
-            today_articles = today_result.scalar() or 0
-            
-            # 查询本周文章数
-            week_query = select(func.count(Article.id)).where(
-                and_(
-                    Article.account_id.in_(subscribed_account_ids),
-                    Article.publish_time >= week_start
+                .join(Article, and_(
+                    Account.account_id == Article.account_id,
+                    Account.platform == Article.platform
+                ))
+                .where(
+                    tuple_(Article.account_id, Article.platform).in_(
+                        select(Subscription.account_id, Subscription.platform).where(
+                            Subscription.user_id == user_id
+                        )
+                    )
                 )
-            )
-            week_result = await db.execute(week_query)
-            week_articles = week_result.scalar() or 0
-            
-            # 查询各平台文章统计
-            platform_query = (
-                select(Account.platform, func.count(Article.id))
-                .join(Article, Account.id == Article.account_id)
-                .where(Article.account_id.in_(subscribed_account_ids))
                 .group_by(Account.platform)
             )
-            platform_result = await db.execute(platform_query)
-            platform_data = platform_result.fetchall()
+            stats_result = await db.execute(stats_query)
             
+            total_articles = 0
+            today_articles = 0
+            week_articles = 0
             platform_stats = {}
-            for platform, count in platform_data:
-                platform_stats[platform] = count
+            for platform, total, today, week in stats_result.fetchall():
+                platform_stats[platform] = total
+                total_articles += total
+                today_articles += today or 0
+                week_articles += week or 0
             
             stats = ArticleStats(
                 total_articles=total_articles,
@@ -326,12 +452,487 @@ class ContentService:
             logger.error(f"获取内容统计失败: {str(e)}")
             raise BusinessException(message="获取内容统计失败")
     
-    async def refresh_user_feed_cache(self, user_id: int) -> bool:
+    async def _get_materialized_stats(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        fresh_after: datetime
+    ) -> Optional[ArticleStats]:
+        """
+        读取用户的物化内容统计
+        
+        没有统计行，或任一行的统计时间早于fresh_after（包括跨天后今日数量已失效）时返回None
+        """
+        result = await db.execute(
+            lambda_stmt(
+                lambda: select(
+                    UserPlatformStats.platform,
+                    UserPlatformStats.total,
+                    UserPlatformStats.today_cnt,
+                    UserPlatformStats.week_cnt,
+                    UserPlatformStats.updated_at
+                ).where(UserPlatformStats.user_id == user_id)
+            )
+        )
+        rows = result.fetchall()
+        if not rows or min(row.updated_at for row in rows) < fresh_after:
+            return None
+        
+        return ArticleStats(
+            total_articles=sum(row.total for row in rows),
+            today_articles=sum(row.today_cnt for row in rows),
+            week_articles=sum(row.week_cnt for row in rows),
+            platform_stats={row.platform: row.total for row in rows}
+        )
+    
+    async def refresh_platform_stats(self, db: AsyncSession) -> int:
+        """
+        重新计算所有用户按平台的内容统计并写入物化表
+        
+        统计口径与get_content_stats的实时查询一致。开始前已存在、本次未写入且未被其他刷新更新过的
+        旧统计行（如已取消订阅的平台）会按主键删除，开始后新写入的行不受影响
+        
+        Returns:
+            写入的统计行数
+        """
+        now = datetime.now()
+        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        week_start = today_start - timedelta(days=7)
+        
+        existing_result = await db.execute(select(UserPlatformStats.user_id, UserPlatformStats.platform))
+        existing_keys = set(existing_result.fetchall())
+        
+        stats_result = await db.execute(
+            select(
+                Subscription.user_id,
+                Account.platform,
+                func.count(Article.id).label("total"),
+                func.sum(case((Article.publish_time >= today_start, 1), else_=0)).label("today"),
+                func.sum(case((Article.publish_time >= week_start, 1), else_=0)).label("week")
+            )
+            .select_from(Subscription)
+            .join(Article, and_(
+                Article.account_id == Subscription.account_id,
+                Article.platform == Subscription.platform
+            ))
+            .join(Account, and_(
+                Account.account_id == Article.account_id,
+                Account.platform == Article.platform
+            ))
+            .group_by(Subscription.user_id, Account.platform)
+        )
+        rows = [
+            {
+                "user_id": user_id,
+                "platform": platform,
+                "total": total,
+                "today_cnt": today or 0,
+                "week_cnt": week or 0,
+                "updated_at": now
+            }
+            for user_id, platform, total, today, week in stats_result.fetchall()
+        ]
+        
+        dialect_name = db.get_bind().dialect.name
+        for start in range(0, len(rows), self.platform_stats_batch_size):
+            batch = rows[start:start + self.platform_stats_batch_size]
+            await db.execute(self._upsert_platform_stats_stmt(dialect_name, batch))
+        
+        stale_keys = list(existing_keys - {(row["user_id"], row["platform"]) for row in rows})
+        for start in range(0, len(stale_keys), self.platform_stats_batch_size):
+            batch = stale_keys[start:start + self.platform_stats_batch_size]
+            await db.execute(
+                delete(UserPlatformStats).where(
+                    tuple_(UserPlatformStats.user_id, UserPlatformStats.platform).in_(batch),
+                    UserPlatformStats.updated_at < now
+                )
+            )
+        await db.commit()
+        
+        logger.info(f"刷新用户内容统计完成，共 {len(rows)} 行")
+        return len(rows)
+    
+    @staticmethod
+    def _upsert_platform_stats_stmt(dialect_name: str, rows: List[Dict[str, Any]]):
+        """按数据库方言构造物化统计的批量UPSERT语句（生产MySQL，测试SQLite）"""
+        if dialect_name in ("mysql", "mariadb"):
+            stmt = mysql_insert(UserPlatformStats).values(rows)
+            return stmt.on_duplicate_key_update(
+                total=stmt.inserted.total,
+                today_cnt=stmt.inserted.today_cnt,
+                week_cnt=stmt.inserted.week_cnt,
+                updated_at=stmt.inserted.updated_at
+            )
+        
+        stmt = sqlite_insert(UserPlatformStats).values(rows)
+        return stmt.on_conflict_do_update(
+            index_elements=[UserPlatformStats.user_id, UserPlatformStats.platform],
+            set_={
+                "total": stmt.excluded.total,
+                "today_cnt": stmt.excluded.today_cnt,
+                "week_cnt": stmt.excluded.week_cnt,
+                "updated_at": stmt.excluded.updated_at
+            }
+        )
+    
+    @staticmethod
+    def _subscribed_accounts_stmt(user_id: int) -> StatementLambdaElement:
+        """用户订阅账号查询，编译结果按语句结构缓存，user_id作为绑定参数传入"""
+        return lambda_stmt(
+            lambda: select(Subscription.account_id, Subscription.platform).where(
+                Subscription.user_id == user_id
+            )
+        )
+    
+    @staticmethod
+    def _get_platform_display_name(platform: str) -> str:
+        """获取平台显示名称，未知平台原样返回"""
+        return _PLATFORM_DISPLAY.get(platform, platform)
+    
+    @staticmethod
+    def _article_sort_key(article) -> Tuple[int, str]:
+        """动态流排序键：(发布时间戳, 文章ID)"""
+        return (article.publish_timestamp, str(article.id))
+    
+    @staticmethod
+    def encode_cursor(publish_timestamp: int, article_id: str) -> str:
+        """编码键集分页游标"""
+        raw = f"{publish_timestamp}:{article_id}".encode()
+        return base64.urlsafe_b64encode(raw).decode()
+    
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[int, str]:
+        """解码键集分页游标"""
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+            publish_timestamp, article_id = raw.split(":", 1)
+            return int(publish_timestamp), article_id
+        except Exception:
+            raise ValidationException(message="无效的分页游标")
+    
+    async def _fetch_feed_articles(
+        self,
+        db: AsyncSession,
+        accounts: List[Tuple[str, str]],
+        page: int,
+        page_size: int,
+        limit: int,
+        before: Optional[Tuple[int, str]] = None
+    ) -> List[ArticleWithAccount]:
+        """逐个账号获取文章并按(发布时间, ID)降序合并，获取失败的账号跳过"""
+        articles = []
+        for account_id, platform in accounts:
+            account_articles = await search_service.get_articles_by_account(
+                db=db,
+                platform=platform,
+                account_id=account_id,
+                page=page,
+                page_size=page_size,
+                limit=limit,
+                before=before
+            )
+            if account_articles:
+                articles.extend(account_articles)
+            elif account_articles is None:
+                logger.error(f"获取账号 {account_id} 的文章列表失败")
+        
+        articles.sort(key=self._article_sort_key, reverse=True)
+        return articles
+    
+    def _feed_json_key(self, user_id: int) -> str:
+        """用户动态流首页JSON缓存键（HASH，field为page_size），匹配feed缓存的清理模式"""
+        return f"{self.cache_prefix}feed:{user_id}:json"
+    
+    async def _get_cached_feed_json(self, user_id: int, page_size: int) -> Optional[str]:
+        """从缓存获取动态流首页JSON"""
+        try:
+            redis = await get_redis()
+            if not redis:
+                return None
+            return await redis.hget(self._feed_json_key(user_id), str(page_size))
+        except Exception as e:
+            logger.error(f"获取缓存动态流JSON失败: {str(e)}")
+            return None
+    
+    async def _cache_feed_json(self, user_id: int, page_size: int, content: str) -> None:
+        """缓存动态流首页JSON"""
+        try:
+            redis = await get_redis()
+            if not redis:
+                return
+            key = self._feed_json_key(user_id)
+            pipe = redis.pipeline(transaction=True)
+            pipe.hset(key, str(page_size), content)
+            pipe.expire(key, self.feed_json_cache_ttl)
+            await pipe.execute()
+        except Exception as e:
+            logger.error(f"缓存动态流JSON失败: {str(e)}")
+    
+    def _feed_index_key(self, user_id: int) -> str:
+        """用户动态流索引键（ZSET，score为发布时间戳）"""
+        return f"{self.feed_index_prefix}{user_id}"
+    
+    def _feed_article_key(self, platform: str, article_id: str) -> str:
+        """动态流文章缓存键（STRING），同一文章在所有订阅用户的索引间共享"""
+        return f"{self.cache_prefix}feed_article:{platform}:{article_id}"
+    
+    @staticmethod
+    def _encode_feed_member(article: ArticleWithAccount) -> str:
+        """
+        编码索引成员，只保存文章ID和平台，文章内容存放在共享的文章缓存中
+        
+        以文章ID加制表符作为前缀，使同一时间戳下ZSET的字典序与(发布时间, ID)排序一致
+        """
+        return f"{article.id}\t{article.account_platform}"
+    
+    @staticmethod
+    def _decode_feed_member(member: str) -> Tuple[str, str]:
+        """解码索引成员，返回(文章ID, 平台)"""
+        article_id, platform = member.split("\t", 1)
+        return article_id, platform
+    
+    def _queue_feed_articles(self, pipe, articles: List[ArticleWithAccount]) -> None:
+        """在管道中写入动态流文章缓存，过期时间与索引一致"""
+        for article in articles:
+            pipe.set(
+                self._feed_article_key(article.account_platform, article.id),
+                json.dumps(article.dict(), default=str),
+                ex=self.feed_index_ttl
+            )
+    
+    async def _load_feed_articles(self, redis, members: List[str]) -> Optional[List[ArticleWithAccount]]:
+        """按索引成员批量读取文章缓存，任一文章缓存缺失时返回None"""
+        if not members:
+            return []
+        keys = [self._feed_article_key(platform, article_id)
+                for article_id, platform in map(self._decode_feed_member, members)]
+        values = await redis.mget(keys)
+        if any(value is None for value in values):
+            return None
+        return [ArticleWithAccount(**json.loads(value)) for value in values]
+    
+    async def _get_indexed_feed(
+        self,
+        user_id: int,
+        offset: int,
+        page_size: int,
+        before: Optional[Tuple[int, str]] = None
+    ) -> Optional[List[ArticleWithAccount]]:
+        """
+        从用户动态流索引读取当前页及其后1篇文章
+        
+        索引不存在，或索引已截断且请求窗口超出索引范围时返回None，由调用方回退到实时获取
+        """
+        try:
+            redis = await get_redis()
+            if not redis:
+                return None
+            
+            key = self._feed_index_key(user_id)
+            size = await redis.zcard(key)
+            if not size:
+                return None
+            
+            if before:
+                # 同一时间戳的文章可能排在游标之前，多取这部分后再按游标过滤
+                publish_timestamp = before[0]
+                ties = await redis.zcount(key, publish_timestamp, publish_timestamp)
+                scored = await redis.zrevrangebyscore(
+                    key, publish_timestamp, "-inf", start=0, num=page_size + 1 + ties, withscores=True
+                )
+                members = [
+                    member for member, score in scored
+                    if (int(score), self._decode_feed_member(member)[0]) < before
+                ][:page_size + 1]
+            else:
+                members = await redis.zrevrange(key, offset, offset + page_size)
+            
+            if len(members) <= page_size and size >= self.feed_index_size:
+                return None
+            
+            articles = await self._load_feed_articles(redis, members)
+            if articles is None:
+                return None
+            
+            logger.info(f"从动态流索引获取用户 {user_id} 的文章")
+            return articles
+            
+        except Exception as e:
+            logger.error(f"读取动态流索引失败: {str(e)}")
+            return None
+    
+    async def _schedule_feed_index_rebuild(self, user_id: int) -> None:
+        """
+        提交后台任务重建用户动态流索引
+        
+        Redis不可用时索引无处写入，直接跳过；同一用户在feed_index_rebuild_lock_ttl内只提交一次
+        """
+        try:
+            redis = await get_redis()
+            if not redis:
+                return
+            
+            lock_key = f"{self._feed_index_key(user_id)}:rebuilding"
+            if not await redis.set(lock_key, 1, ex=self.feed_index_rebuild_lock_ttl, nx=True):
+                return
+            celery_app.send_task("app.tasks.content.rebuild_user_feed_index", args=[user_id])
+            
+        except Exception as e:
+            logger.error(f"提交动态流索引重建任务失败: {str(e)}")
+    
+    async def iter_user_feed(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        limit: int = 500
+    ) -> AsyncIterator[ArticleWithAccount]:
+        """
+        逐篇产出用户订阅账号的最新文章，供缓存预热等内部批处理使用
+        
+        订阅列表一次读完后再逐个账号按键集分批获取文章（每批feed_stream_batch_size篇，每个账号最多limit篇），
+        不在获取文章期间占用数据库游标；只保证账号内按发布时间降序，不做跨账号合并排序。
+        任一账号获取失败时抛出BusinessException，避免调用方写入不完整的数据。
+        """
+        result = await db.execute(self._subscribed_accounts_stmt(user_id))
+        for account_id, platform in result.all():
+            remaining = limit
+            before = None
+            while remaining > 0:
+                batch_size = min(self.feed_stream_batch_size, remaining)
+                articles = await search_service.get_articles_by_account(
+                    db=db,
+                    platform=platform,
+                    account_id=account_id,
+                    page=1,
+                    page_size=batch_size,
+                    limit=batch_size,
+                    before=before
+                )
+                if articles is None:
+                    raise BusinessException(message=f"获取账号 {account_id} 的文章列表失败")
+                for article in articles:
+                    yield article
+                if len(articles) < batch_size:
+                    break
+                remaining -= len(articles)
+                before = self._article_sort_key(articles[-1])
+    
+    async def rebuild_user_feed_index(self, db: AsyncSession, user_id: int) -> None:
+        """
+        按用户当前订阅流式重建动态流索引
+        
+        文章分批写入临时键并随时截断到feed_index_size篇，全部账号获取成功后再替换正式索引
+        """
+        try:
+            redis = await get_redis()
+            if not redis:
+                return
+            
+            key = self._feed_index_key(user_id)
+            building_key = f"{key}:building"
+            await redis.delete(building_key)
+            
+            written = 0
+            batch = []
+            try:
+                async for article in self.iter_user_feed(db, user_id, limit=self.feed_index_size):
+                    batch.append(article)
+                    if len(batch) >= self.feed_stream_batch_size:
+                        await self._append_feed_index(redis, building_key, batch)
+                        written += len(batch)
+                        batch = []
+                if batch:
+                    await self._append_feed_index(redis, building_key, batch)
+                    written += len(batch)
+            except BusinessException as e:
+                # 数据不完整时不写入索引，下次获取首页时再按实时结果重建
+                await redis.delete(building_key)
+                logger.warning(f"重建用户 {user_id} 的动态流索引中止: {e.message}")
+                return
+            
+            pipe = redis.pipeline(transaction=True)
+            pipe.delete(key)
+            if written:
+                pipe.rename(building_key, key)
+                pipe.expire(key, self.feed_index_ttl)
+            await pipe.execute()
+            
+        except Exception as e:
+            logger.error(f"重建动态流索引失败: {str(e)}")
+    
+    async def _append_feed_index(self, redis, key: str, articles: List[ArticleWithAccount]) -> None:
+        """追加一批索引成员及其文章缓存，并截断到feed_index_size篇"""
+        pipe = redis.pipeline(transaction=True)
+        self._queue_feed_articles(pipe, articles)
+        pipe.zadd(key, {
+            self._encode_feed_member(article): article.publish_timestamp
+            for article in articles
+        })
+        pipe.zremrangebyrank(key, 0, -(self.feed_index_size + 1))
+        pipe.expire(key, self.feed_index_ttl)
+        await pipe.execute()
+    
+    async def invalidate_feed_index(self, user_ids: List[int]) -> None:
+        """删除用户动态流索引及首页JSON缓存，下次获取首页时重建"""
+        if not user_ids:
+            return
+        try:
+            redis = await get_redis()
+            if not redis:
+                return
+            await redis.delete(
+                *(self._feed_index_key(user_id) for user_id in user_ids),
+                *(self._feed_json_key(user_id) for user_id in user_ids)
+            )
+        except Exception as e:
+            logger.error(f"删除动态流索引失败: {str(e)}")
+    
+    async def _count_articles(self, accounts: List[Tuple[str, str]], limit: Optional[int] = None) -> int:
+        """汇总各账号的文章总数，给定limit时达到上限即停止统计"""
+        total = 0
+        for account_id, platform in accounts:
+            stats = await search_service.get_account_article_stats(account_id, platform)
+            if stats:
+                total += stats.get("article_count", 0)
+            if limit is not None and total >= limit:
+                return limit
+        return total
+    
+    async def _get_feed_total(
+        self,
+        user_id: int,
+        accounts: List[Tuple[str, str]],
+        refresh: bool = False
+    ) -> int:
+        """获取动态流总数（带上限），结果按用户短时缓存"""
+        count_key = f"{self.feed_count_prefix}{user_id}"
+        redis = None
+        try:
+            redis = await get_redis()
+            if redis and not refresh:
+                cached_count = await redis.get(count_key)
+                if cached_count is not None:
+                    return int(cached_count)
+        except Exception as e:
+            logger.error(f"获取缓存动态流总数失败: {str(e)}")
+        
+        total = await self._count_articles(accounts, limit=self.feed_count_limit)
+        
+        try:
+            if redis:
+                await redis.setex(count_key, self.feed_count_cache_ttl, total)
+        except Exception as e:
+            logger.error(f"缓存动态流总数失败: {str(e)}")
+        
+        return total
+    
+    async def refresh_user_feed_cache(self, user_id: int, db: Optional[AsyncSession] = None) -> bool:
         """
         刷新用户动态流缓存
         
         Args:
             user_id: 用户ID
+            db: 数据库会话（可选，提供时同时重建动态流索引）
         
         Returns:
             是否成功
@@ -344,8 +945,10 @@ class ContentService:
             # 删除用户相关的缓存
             pattern = f"{self.cache_prefix}feed:{user_id}:*"
             keys = await redis.keys(pattern)
-            if keys:
-                await redis.delete(*keys)
+            await redis.delete(*keys, f"{self.feed_count_prefix}{user_id}", self._feed_index_key(user_id))
+            
+            if db is not None:
+                await self.rebuild_user_feed_index(db, user_id)
             
             logger.info(f"刷新用户 {user_id} 的动态流缓存")
             return True
@@ -357,17 +960,19 @@ class ContentService:
     async def _get_related_articles(
         self, 
         db: AsyncSession, 
-        account_id: int, 
-        exclude_id: int, 
+        account_id: str, 
+        platform: str,
+        exclude_id: str, 
         limit: int = 5
-    ) -> List[ArticleResponse]:
-        """获取相关文章"""
+    ) -> List[RelatedArticle]:
+        """获取相关文章（同一平台同一账号，只查询摘要列，不读取正文）"""
         try:
-            query = (
-                select(Article)
+            query = lambda_stmt(
+                lambda: select(Article.id, Article.account_id, Article.title, Article.publish_timestamp)
                 .where(
                     and_(
                         Article.account_id == account_id,
+                        Article.platform == platform,
                         Article.id != exclude_id
                     )
                 )
@@ -376,30 +981,16 @@ class ContentService:
             )
             
             result = await db.execute(query)
-            articles_data = result.fetchall()
             
-            articles = []
-            for (article,) in articles_data:
-                article_response = ArticleResponse(
-                    id=article.id,
-                    account_id=article.account_id,
-                    title=article.title,
-                    url=article.url,
-                    content=article.content,
-                    summary=article.summary,
-                    publish_time=article.publish_time,
-                    publish_timestamp=article.publish_timestamp,
-                    images=article.images or [],
-                    details=article.details or {},
-                    created_at=article.created_at,
-                    updated_at=article.updated_at,
-                    image_count=article.image_count,
-                    has_images=article.has_images,
-                    thumbnail_url=article.get_thumbnail_url()
+            return [
+                RelatedArticle(
+                    id=str(row.id),
+                    account_id=row.account_id,
+                    title=row.title,
+                    publish_timestamp=row.publish_timestamp
                 )
-                articles.append(article_response)
-            
-            return articles
+                for row in result.fetchall()
+            ]
             
         except Exception as e:
             logger.error(f"获取相关文章失败: {str(e)}")
@@ -423,7 +1014,9 @@ class ContentService:
                     data=items,
                     total=data['total'],
                     page=data['page'],
-                    page_size=data['page_size']
+                    page_size=data['page_size'],
+                    next_cursor=data.get('next_cursor'),
+                    has_more=data.get('has_more')
                 )
             
             return None
@@ -446,7 +1039,9 @@ class ContentService:
                 'total': result.total,
                 'page': result.page,
                 'page_size': result.page_size,
-                'total_pages': result.total_pages
+                'total_pages': result.total_pages,
+                'has_more': result.has_more,
+                'next_cursor': result.next_cursor
             }
             
             await redis.setex(
@@ -627,8 +1222,11 @@ class ContentService:
         try:
             offset = (page - 1) * page_size
             
-            # 构建基础查询
-            base_query = select(Article, Account).join(Account, Article.account_id == Account.id)
+            # 构建基础查询（只取文章ID，用于统计总数和定位当前页）
+            base_query = select(Article.id).join(Account, and_(
+                Article.account_id == Account.account_id,
+                Article.platform == Account.platform
+            ))
             
             # 添加关键词搜索条件
             search_conditions = [
@@ -637,7 +1235,7 @@ class ContentService:
                 Article.summary.contains(keyword)
             ]
             base_query = base_query.where(
-                func.or_(*search_conditions)
+                or_(*search_conditions)
             )
             
             # 添加平台筛选
@@ -645,15 +1243,19 @@ class ContentService:
                 base_query = base_query.where(Account.platform == platform)
             
             # 如果提供了用户ID，只搜索用户订阅的内容
+            params = {}
             if user_id:
-                subscribed_accounts_query = select(Subscription.account_id).where(
-                    Subscription.user_id == user_id
-                )
-                subscribed_accounts_result = await db.execute(subscribed_accounts_query)
-                subscribed_account_ids = [row[0] for row in subscribed_accounts_result.fetchall()]
+                subscribed_accounts_result = await db.execute(self._subscribed_accounts_stmt(user_id))
+                subscribed_accounts = [tuple(row) for row in subscribed_accounts_result.fetchall()]
                 
-                if subscribed_account_ids:
-                    base_query = base_query.where(Article.account_id.in_(subscribed_account_ids))
+                if subscribed_accounts:
+                    # 展开式绑定参数，订阅数量不同的查询共用同一份编译缓存
+                    base_query = base_query.where(
+                        tuple_(Article.account_id, Article.platform).in_(
+                            bindparam("account_keys", expanding=True)
+                        )
+                    )
+                    params["account_keys"] = subscribed_accounts
                 else:
                     # 用户没有订阅任何账号
                     return PaginatedResponse.create(
@@ -665,25 +1267,35 @@ class ContentService:
             
             # 查询总数
             count_query = select(func.count()).select_from(base_query.subquery())
-            total_result = await db.execute(count_query)
+            total_result = await db.execute(count_query, params)
             total = total_result.scalar() or 0
             
-            # 查询文章列表
-            articles_query = (
+            # 延迟回表：先在索引上按OFFSET定位当前页的文章ID，再只对这一页关联读取完整行
+            page_ids = (
                 base_query
-                .order_by(desc(Article.publish_timestamp))
+                .order_by(desc(Article.publish_timestamp), desc(Article.id))
                 .offset(offset)
                 .limit(page_size)
+                .subquery()
+            )
+            articles_query = (
+                select(Article, Account)
+                .join(page_ids, Article.id == page_ids.c.id)
+                .join(Account, and_(
+                    Article.account_id == Account.account_id,
+                    Article.platform == Account.platform
+                ))
+                .order_by(desc(Article.publish_timestamp), desc(Article.id))
             )
             
-            articles_result = await db.execute(articles_query)
+            articles_result = await db.execute(articles_query, params)
             articles_data = articles_result.fetchall()
             
             # 转换为响应模型
             articles = []
             for article, account in articles_data:
                 article_with_account = ArticleWithAccount(
-                    id=article.id,
+                    id=str(article.id),
                     account_id=article.account_id,
                     title=article.title,
                     url=article.url,
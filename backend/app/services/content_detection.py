@@ -28,6 +28,8 @@ class ContentDetectionService:
         self.cache_prefix = "content_detection:"
         self.last_check_key = "last_content_check"
         self.new_articles_queue_key = "new_articles_queue"
+        # 单次pipeline提交的最大命令数，避免超大批量阻塞Redis
+        self.pipeline_batch_size = 10000
         
     async def detect_new_content(self, db: AsyncSession) -> List[Dict[str, Any]]:
         """
@@ -61,11 +63,8 @@ class ContentDetectionService:
                 # 为每篇新文章创建推送队列记录
                 push_queue_items = await self._create_push_queue_items(db, new_articles)
                 
-                # 将推送任务添加到队列
-                await self._add_to_push_queue(push_queue_items)
-                
-                # 更新最后检查时间
-                await self._update_last_check_time(current_time)
+                # 将推送任务添加到队列并更新最后检查时间（同一pipeline提交）
+                await self._add_to_push_queue(push_queue_items, current_time)
                 
                 return [self._article_to_dict(article) for article in new_articles]
             else:
@@ -281,10 +280,19 @@ class ContentDetectionService:
             logger.error(f"创建推送队列项目失败: {str(e)}")
             return []
     
-    async def _add_to_push_queue(self, queue_items: List[Dict[str, Any]]) -> bool:
-        """将项目添加到推送队列"""
+    async def _add_to_push_queue(
+        self,
+        queue_items: List[Dict[str, Any]],
+        check_time: Optional[datetime] = None
+    ) -> bool:
+        """
+        将项目添加到推送队列
+        
+        所有LPUSH命令通过pipeline批量提交，如果提供了check_time，
+        最后检查时间的SET也会随最后一批一起提交，只需一次往返。
+        """
         try:
-            if not queue_items:
+            if not queue_items and check_time is None:
                 return True
             
             redis = await get_redis()
@@ -292,12 +300,28 @@ class ContentDetectionService:
                 logger.warning("Redis不可用，无法添加到推送队列")
                 return False
             
-            # 将队列项目添加到Redis列表
+            pipe = redis.pipeline(transaction=False)
+            pending = 0
             for item in queue_items:
-                await redis.lpush(
+                pipe.lpush(
                     self.new_articles_queue_key,
                     json.dumps(item, default=str)
                 )
+                pending += 1
+                if pending >= self.pipeline_batch_size:
+                    await pipe.execute()
+                    pending = 0
+            
+            if check_time is not None:
+                pipe.set(
+                    f"{self.cache_prefix}{self.last_check_key}",
+                    check_time.isoformat(),
+                    ex=86400  # 24小时过期
+                )
+                pending += 1
+            
+            if pending:
+                await pipe.execute()
             
             logger.info(f"添加 {len(queue_items)} 个项目到推送队列")
             return True
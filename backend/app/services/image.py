@@ -8,6 +8,11 @@ from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# 预编译的URL解析正则
+THUMBNAIL_URL_PATTERN = re.compile(r'(.*?)/(.*?)\.jpg')
+ALT_SEPARATOR_PATTERN = re.compile(r'[_-]')
+ALT_DIGITS_PATTERN = re.compile(r'\d+')
+
 
 class ImageService:
     """图片处理服务"""
@@ -19,17 +24,17 @@ class ImageService:
         # 平台特定的缩略图规则
         self.thumbnail_rules = {
             'weibo': {
-                'pattern': r'(.*?)/(.*?)\.jpg',
+                'pattern': THUMBNAIL_URL_PATTERN,
                 'thumbnail_suffix': '_thumbnail',
                 'sizes': ['small', 'medium', 'large']
             },
             'wechat': {
-                'pattern': r'(.*?)/(.*?)\.jpg',
+                'pattern': THUMBNAIL_URL_PATTERN,
                 'thumbnail_suffix': '_s',
                 'sizes': ['s', 'm', 'l']
             },
             'twitter': {
-                'pattern': r'(.*?)/(.*?)\.jpg',
+                'pattern': THUMBNAIL_URL_PATTERN,
                 'thumbnail_suffix': '_small',
                 'sizes': ['small', 'medium', 'large']
             }
@@ -181,7 +186,7 @@ class ImageService:
             return self._generate_default_thumbnail(url, size)
         
         try:
-            match = re.match(pattern, url)
+            match = pattern.match(url)
             if match:
                 base_url, filename = match.groups()
                 name, ext = filename.rsplit('.', 1)
@@ -213,8 +218,8 @@ class ImageService:
             if '.' in filename:
                 name = filename.rsplit('.', 1)[0]
                 # 清理文件名作为alt文本
-                alt = re.sub(r'[_-]', ' ', name)
-                alt = re.sub(r'\d+', '', alt).strip()
+                alt = ALT_SEPARATOR_PATTERN.sub(' ', name)
+                alt = ALT_DIGITS_PATTERN.sub('', alt).strip()
                 return alt if alt else '图片'
             return '图片'
             
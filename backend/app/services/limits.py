@@ -52,9 +52,9 @@ class LimitsService:
             if not user:
                 raise NotFoundException("用户不存在")
             
-            # 获取有效会员等级和限制
-            membership_info = await membership_service.get_membership_info(user_id, db)
-            effective_level = MembershipLevel(membership_info["effective_level"])
+            # 由已加载的用户计算有效会员等级和限制，不再通过get_membership_info重复查询用户
+            is_active = membership_service.is_membership_active(user)
+            effective_level = membership_service.get_effective_level(user)
             subscription_limit = MembershipConfig.get_subscription_limit(effective_level)
             
             # 获取当前订阅数量
@@ -67,7 +67,7 @@ class LimitsService:
                 "user_id": user_id,
                 "membership_level": user.membership_level.value,
                 "effective_level": effective_level.value,
-                "is_membership_active": membership_info["is_active"],
+                "is_membership_active": is_active,
                 "subscription_limit": subscription_limit,
                 "subscription_used": current_count,
                 "subscription_remaining": -1 if subscription_limit == -1 else max(0, subscription_limit - current_count),
@@ -130,13 +130,14 @@ class LimitsService:
             if not user:
                 raise NotFoundException("用户不存在")
             
-            # 获取有效会员等级和限制
-            membership_info = await membership_service.get_membership_info(user_id, db)
-            effective_level = MembershipLevel(membership_info["effective_level"])
+            # 由已加载的用户计算有效会员等级和限制，不再通过get_membership_info重复查询用户
+            is_active = membership_service.is_membership_active(user)
+            effective_level = membership_service.get_effective_level(user)
             daily_push_limit = MembershipConfig.get_daily_push_limit(effective_level)
             
-            # 获取今日推送数量
-            today_count = await self._get_daily_push_count(db, user_id)
+            # 获取今日推送数量（统计区间和重置时间共用同一个"今天"）
+            today = datetime.utcnow().date()
+            today_count = await self._get_daily_push_count(db, user_id, today)
             
             # 检查是否可以继续推送
             can_push = (daily_push_limit == -1) or (today_count < daily_push_limit)
@@ -145,14 +146,14 @@ class LimitsService:
                 "user_id": user_id,
                 "membership_level": user.membership_level.value,
                 "effective_level": effective_level.value,
-                "is_membership_active": membership_info["is_active"],
+                "is_membership_active": is_active,
                 "daily_push_limit": daily_push_limit,
                 "daily_push_used": today_count,
                 "daily_push_remaining": -1 if daily_push_limit == -1 else max(0, daily_push_limit - today_count),
                 "can_receive_push": can_push,
                 "limit_reached": not can_push,
                 "upgrade_required": not can_push and effective_level == MembershipLevel.FREE,
-                "reset_time": self._get_next_reset_time()
+                "reset_time": self._get_next_reset_time(today)
             }
             
             # 如果需要抛出异常且已达限制
@@ -242,7 +243,7 @@ class LimitsService:
                 message="获取用户限制信息失败"
             )
     
-    async def get_membership_benefits_display(self, level: MembershipLevel) -> Dict[str, Any]:
+    def get_membership_benefits_display(self, level: MembershipLevel) -> Dict[str, Any]:
         """
         获取会员权益展示信息
         
@@ -274,7 +275,7 @@ class LimitsService:
                 message="获取会员权益信息失败"
             )
     
-    async def get_all_membership_benefits(self) -> Dict[str, Any]:
+    def get_all_membership_benefits(self) -> Dict[str, Any]:
         """
         获取所有会员等级的权益对比信息
         
@@ -284,8 +285,9 @@ class LimitsService:
         try:
             all_benefits = {}
             
-            for level in MembershipLevel:
-                all_benefits[level.value] = await self.get_membership_benefits_display(level)
+            # 只展示已配置的会员等级，兼容旧值（basic/premium）不参与对比
+            for level in MembershipConfig.MEMBERSHIP_LIMITS:
+                all_benefits[level.value] = self.get_membership_benefits_display(level)
             
             # 添加对比表格
             comparison_table = self._generate_comparison_table()
@@ -478,9 +480,9 @@ class LimitsService:
          
         return suggestions
     
-    def _get_next_reset_time(self) -> datetime:
+    def _get_next_reset_time(self, today: date) -> datetime:
         """获取下次重置时间（明天0点）"""
-        tomorrow = date.today() + timedelta(days=1)
+        tomorrow = today + timedelta(days=1)
         return datetime.combine(tomorrow, datetime.min.time())
     
     async def _get_user_by_id(self, db: AsyncSession, user_id: int) -> Optional[User]:
@@ -495,9 +497,8 @@ class LimitsService:
         result = await db.execute(stmt)
         return result.scalar() or 0
     
-    async def _get_daily_push_count(self, db: AsyncSession, user_id: int) -> int:
+    async def _get_daily_push_count(self, db: AsyncSession, user_id: int, today: date) -> int:
         """获取用户今日推送数量"""
-        today = datetime.utcnow().date()
         tomorrow = today + timedelta(days=1)
         
         stmt = (
@@ -2,7 +2,7 @@
 会员等级管理服务
 """
 from app.core.logging import get_logger
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, func
@@ -26,81 +26,81 @@ logger = get_logger(__name__)
 class MembershipConfig:
     """会员等级配置"""
     
-    # 会员等级权限配置
+    # 会员等级权限配置（功能列表和权益描述使用元组，get_*直接返回共享配置，调用方无法就地修改）
     MEMBERSHIP_LIMITS = {
         MembershipLevel.FREE: {
             "subscription_limit": 10,
             "daily_push_limit": 5,
-            "features": ["basic_aggregation"]
+            "features": ("basic_aggregation",)
         },
         MembershipLevel.V1: {
             "subscription_limit": 20,
             "daily_push_limit": 10,
-            "features": ["basic_aggregation"]
+            "features": ("basic_aggregation",)
         },
         MembershipLevel.V2: {
             "subscription_limit": 50,
             "daily_push_limit": 20,
-            "features": ["basic_aggregation", "advanced_search", "priority_support"]
+            "features": ("basic_aggregation", "advanced_search", "priority_support")
         },
         MembershipLevel.V3: {
             "subscription_limit": 100,
             "daily_push_limit": 50,
-            "features": ["basic_aggregation", "advanced_search", "priority_support"]
+            "features": ("basic_aggregation", "advanced_search", "priority_support")
         },
         MembershipLevel.V4: {
             "subscription_limit": 300,
             "daily_push_limit": 200,
-            "features": ["basic_aggregation", "advanced_search", "priority_support", "data_export"]
+            "features": ("basic_aggregation", "advanced_search", "priority_support", "data_export")
         },
         MembershipLevel.V5: {
             "subscription_limit": -1,
             "daily_push_limit": -1,
-            "features": [
+            "features": (
                 "basic_aggregation",
                 "advanced_search",
                 "priority_support",
                 "exclusive_features",
                 "data_export"
-            ]
+            )
         }
     }
     
     # 会员等级权益描述
     MEMBERSHIP_BENEFITS = {
-        MembershipLevel.FREE: [
+        MembershipLevel.FREE: (
             "订阅10个博主",
             "每日5次推送通知",
             "基础内容聚合"
-        ],
-        MembershipLevel.V1: [
+        ),
+        MembershipLevel.V1: (
             "订阅20个博主",
             "每日10次推送通知",
             "基础内容聚合"
-        ],
-        MembershipLevel.V2: [
+        ),
+        MembershipLevel.V2: (
             "订阅50个博主",
             "每日20次推送通知",
             "高级内容聚合",
             "高级搜索功能",
             "优先客服支持"
-        ],
-        MembershipLevel.V3: [
+        ),
+        MembershipLevel.V3: (
             "订阅100个博主",
             "每日50次推送通知",
             "高级内容聚合",
             "高级搜索功能",
             "优先客服支持"
-        ],
-        MembershipLevel.V4: [
+        ),
+        MembershipLevel.V4: (
             "订阅300个博主",
             "每日200次推送通知",
             "高级内容聚合",
             "高级搜索功能",
             "优先客服支持",
             "数据导出功能"
-        ],
-        MembershipLevel.V5: [
+        ),
+        MembershipLevel.V5: (
             "无限订阅博主",
             "无限推送通知",
             "高级内容聚合",
@@ -108,7 +108,7 @@ class MembershipConfig:
             "优先客服支持",
             "专属功能体验",
             "数据导出功能"
-        ]
+        )
     }
     
     @classmethod
@@ -122,14 +122,14 @@ class MembershipConfig:
         return cls.MEMBERSHIP_LIMITS.get(level, {}).get("daily_push_limit", 5)
     
     @classmethod
-    def get_features(cls, level: MembershipLevel) -> List[str]:
+    def get_features(cls, level: MembershipLevel) -> Tuple[str, ...]:
         """获取会员功能列表"""
-        return cls.MEMBERSHIP_LIMITS.get(level, {}).get("features", [])
+        return cls.MEMBERSHIP_LIMITS.get(level, {}).get("features", ())
     
     @classmethod
-    def get_benefits(cls, level: MembershipLevel) -> List[str]:
+    def get_benefits(cls, level: MembershipLevel) -> Tuple[str, ...]:
         """获取会员权益描述"""
-        return cls.MEMBERSHIP_BENEFITS.get(level, [])
+        return cls.MEMBERSHIP_BENEFITS.get(level, ())
 
 
 class MembershipService:
@@ -290,7 +290,7 @@ class MembershipService:
                 raise NotFoundException("用户不存在")
             
             # 检查会员是否有效
-            is_active = self._is_membership_active(user)
+            is_active = self.is_membership_active(user)
             effective_level = user.membership_level if is_active else MembershipLevel.FREE
             
             membership_info = {
@@ -333,7 +333,7 @@ class MembershipService:
                 raise NotFoundException("用户不存在")
             
             # 获取有效会员等级
-            effective_level = self._get_effective_membership_level(user)
+            effective_level = self.get_effective_level(user)
             subscription_limit = MembershipConfig.get_subscription_limit(effective_level)
             
             # 无限制的情况
@@ -376,7 +376,7 @@ class MembershipService:
                 raise NotFoundException("用户不存在")
             
             # 获取有效会员等级
-            effective_level = self._get_effective_membership_level(user)
+            effective_level = self.get_effective_level(user)
             push_limit = MembershipConfig.get_daily_push_limit(effective_level)
             
             # 无限制的情况
@@ -419,7 +419,7 @@ class MembershipService:
                 raise NotFoundException("用户不存在")
             
             # 获取有效会员等级
-            effective_level = self._get_effective_membership_level(user)
+            effective_level = self.get_effective_level(user)
             
             # 获取限制配置
             subscription_limit = MembershipConfig.get_subscription_limit(effective_level)
@@ -432,7 +432,7 @@ class MembershipService:
             limits = {
                 "membership_level": user.membership_level.value,
                 "effective_level": effective_level.value,
-                "is_membership_active": self._is_membership_active(user),
+                "is_membership_active": self.is_membership_active(user),
                 "subscription_limit": subscription_limit,
                 "subscription_used": subscription_used,
                 "daily_push_limit": daily_push_limit,
@@ -454,17 +454,17 @@ class MembershipService:
                 message="获取用户限制信息失败"
             )
     
-    def _is_membership_active(self, user: User) -> bool:
-        """检查会员是否有效"""
+    def is_membership_active(self, user: User) -> bool:
+        """检查已加载用户的会员是否有效，免费用户始终有效"""
         if user.membership_level == MembershipLevel.FREE:
             return True
         if user.membership_expire_at is None:
             return False
         return user.membership_expire_at > datetime.utcnow()
     
-    def _get_effective_membership_level(self, user: User) -> MembershipLevel:
-        """获取有效的会员等级"""
-        if self._is_membership_active(user):
+    def get_effective_level(self, user: User) -> MembershipLevel:
+        """获取已加载用户的有效会员等级，会员过期时按免费用户计算"""
+        if self.is_membership_active(user):
             return user.membership_level
         return MembershipLevel.FREE
     
@@ -3,10 +3,15 @@
 """
 from typing import Dict, Any, Optional, List
 from enum import Enum
+import re
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# 预编译的内容解析正则
+HASHTAG_PATTERN = re.compile(r'#([^#\s]+)#?')
+MENTION_PATTERN = re.compile(r'@([^\s@]+)')
+
 
 class PlatformDisplayService:
     """平台展示服务"""
@@ -89,9 +94,9 @@ class PlatformDisplayService:
         return config.copy()
     
     def get_platform_display_name(self, platform: str) -> str:
-        """获取平台显示名称"""
-        config = self.get_platform_info(platform)
-        return config['display_name']
+        """获取平台显示名称（逐行调用，直接查配置而不复制整份平台信息）"""
+        config = self.platform_configs.get(platform.lower())
+        return config['display_name'] if config else platform.title()
     
     def get_platform_short_name(self, platform: str) -> str:
         """获取平台简短名称"""
@@ -276,16 +281,12 @@ class PlatformDisplayService:
     
     def _extract_hashtags(self, content: str) -> List[str]:
         """提取话题标签"""
-        import re
-        hashtag_pattern = r'#([^#\s]+)#?'
-        matches = re.findall(hashtag_pattern, content)
+        matches = HASHTAG_PATTERN.findall(content)
         return list(set(matches))  # 去重
     
     def _extract_mentions(self, content: str) -> List[str]:
         """提取@提及"""
-        import re
-        mention_pattern = r'@([^\s@]+)'
-        matches = re.findall(mention_pattern, content)
+        matches = MENTION_PATTERN.findall(content)
         return list(set(matches))  # 去重
     
     def _contains_sensitive_words(self, content: str) -> bool:
@@ -3,7 +3,7 @@
 """
 from app.core.logging import get_logger
 from typing import List, Dict, Any, Optional
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, func
 
@@ -44,8 +44,9 @@ class PushNotificationService:
                 user_id, db, raise_exception=False
             )
             
-            if not limit_check["can_push"]:
+            if not limit_check["can_receive_push"]:
                 logger.info(f"用户 {user_id} 达到推送限制，跳过推送")
+                limit_message = f"今日推送次数已达上限({limit_check['daily_push_limit']}次)"
                 
                 # 创建跳过的推送记录
                 push_record = PushRecord(
@@ -53,7 +54,7 @@ class PushNotificationService:
                     article_id=article_id,
                     push_time=datetime.now(),
                     status=PushStatus.SKIPPED.value,
-                    error_message=limit_check["message"]
+                    error_message=limit_message
                 )
                 db.add(push_record)
                 await db.commit()
@@ -62,7 +63,7 @@ class PushNotificationService:
                     "success": False,
                     "skipped": True,
                     "reason": "push_limit_reached",
-                    "message": limit_check["message"],
+                    "message": limit_message,
                     "push_record_id": push_record.id
                 }
             
@@ -81,7 +82,10 @@ class PushNotificationService:
             # 获取文章和账号信息
             article_query = (
                 select(Article, Account)
-                .join(Account, Article.account_id == Account.id)
+                .join(Account, and_(
+                    Article.account_id == Account.account_id,
+                    Article.platform == Account.platform
+                ))
                 .where(Article.id == article_id)
             )
             article_result = await db.execute(article_query)
@@ -125,9 +129,7 @@ class PushNotificationService:
                 push_record.status = PushStatus.SUCCESS.value
                 logger.info(f"推送成功 - 用户: {user_id}, 文章: {article_id}")
                 
-                # 更新用户推送统计
-                await limits_service.increment_push_count(user_id, db)
-                
+                # 今日推送次数按成功的推送记录统计，记录状态更新即计入限制
                 result = {
                     "success": True,
                     "message": "推送成功",
@@ -252,6 +254,7 @@ class PushNotificationService:
         """
         try:
             today = date.today()
+            tomorrow = today + timedelta(days=1)
             
             # 获取总推送统计
             total_query = (
@@ -273,13 +276,14 @@ class PushNotificationService:
             total_result = await db.execute(total_query)
             total_stats = total_result.first()
             
-            # 获取今日推送统计
+            # 获取今日推送统计（push_time使用半开区间，可走(user_id, push_time)索引范围扫描）
             today_query = (
                 select(func.count(PushRecord.id))
                 .where(
                     and_(
                         PushRecord.user_id == user_id,
-                        func.date(PushRecord.push_time) == today,
+                        PushRecord.push_time >= today,
+                        PushRecord.push_time < tomorrow,
                         PushRecord.status == PushStatus.SUCCESS.value
                     )
                 )
@@ -370,7 +374,10 @@ class PushNotificationService:
                 select(PushRecord, User, Article, Account)
                 .join(User, PushRecord.user_id == User.id)
                 .join(Article, PushRecord.article_id == Article.id)
-                .join(Account, Article.account_id == Account.id)
+                .join(Account, and_(
+                    Article.account_id == Account.account_id,
+                    Article.platform == Account.platform
+                ))
                 .order_by(PushRecord.push_time.desc())
                 .offset((page - 1) * page_size)
                 .limit(page_size)
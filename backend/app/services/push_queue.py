@@ -90,7 +90,7 @@ class PushQueueService:
                         user_id, db, raise_exception=False
                     )
                     
-                    if not can_push["can_push"]:
+                    if not can_push["can_receive_push"]:
                         # 创建跳过的推送记录
                         push_record = PushRecord(
                             user_id=user_id,
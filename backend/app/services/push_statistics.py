@@ -211,7 +211,10 @@ class PushStatisticsService:
                     ).label("failed")
                 )
                 .join(Article, PushRecord.article_id == Article.id)
-                .join(Account, Article.account_id == Account.id)
+                .join(Account, and_(
+                    Article.account_id == Account.account_id,
+                    Article.platform == Account.platform
+                ))
                 .where(
                     and_(
                         PushRecord.push_time >= start_date,
@@ -10,6 +10,7 @@ from app.models.account import Account
 from app.models.subscription import Subscription
 from app.db.redis import get_redis
 from app.core.exceptions import BusinessException
+from app.services.content import content_service
 import json
 from app.core.logging import get_logger
 
@@ -133,7 +134,6 @@ class ContentRefreshService:
                     content=article_data.get('content'),
                     summary=article_data.get('summary'),
                     publish_time=article_data['publish_time'],
-                    publish_timestamp=int(article_data['publish_time'].timestamp()),
                     images=article_data.get('images'),
                     details=article_data.get('details', {})
                 )
@@ -144,6 +144,13 @@ class ContentRefreshService:
             
             # 清除相关缓存
             await self._clear_account_caches(account_id)
+            if saved_count:
+                subscribers_result = await db.execute(
+                    select(Subscription.user_id).where(Subscription.account_id == account.account_id)
+                )
+                await content_service.invalidate_feed_index(
+                    [row[0] for row in subscribers_result.fetchall()]
+                )
             
             return {
                 'success': True,
@@ -426,16 +433,13 @@ class ContentRefreshService:
                 return
             
             # 清除动态流缓存
-            feed_pattern = f"content:feed:{user_id}:*"
+            feed_pattern = f"{content_service.cache_prefix}feed:{user_id}:*"
             feed_keys = await redis.keys(feed_pattern)
             if feed_keys:
                 await redis.delete(*feed_keys)
             
-            # 清除文章详情缓存
-            detail_pattern = f"content:detail:*:{user_id}"
-            detail_keys = await redis.keys(detail_pattern)
-            if detail_keys:
-                await redis.delete(*detail_keys)
+            # 清除动态流索引
+            await content_service.invalidate_feed_index([user_id])
             
             logger.info(f"清除用户 {user_id} 的缓存")
             
@@ -450,7 +454,7 @@ class ContentRefreshService:
                 return
             
             # 清除账号文章缓存
-            account_pattern = f"content:account:{account_id}:*"
+            account_pattern = f"{content_service.cache_prefix}account:{account_id}:*"
             account_keys = await redis.keys(account_pattern)
             if account_keys:
                 await redis.delete(*account_keys)
@@ -3,7 +3,7 @@
 """
 from datetime import datetime
 from re import A
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from app.services.search.base import PlatformAdapter, PlatformSearchResult
 from app.models.account import Platform
 from app.services.search.adapters.wechat_api import WeChatRSSAPI
@@ -154,30 +154,31 @@ class WeChatAdapter(PlatformAdapter):
 
 
 
+    def _to_article_response(self, article: Dict[str, Any]) -> ArticleResponse:
+        """将数据库文章行转换为ArticleResponse"""
+        return ArticleResponse(
+            id=article["id"],
+            account_id=article["mp_id"],
+            title=article["title"][:100],
+            url=article["url"],
+            content=article["content"],
+            summary=article.get("summary", ""),
+            publish_time=article["publish_time"],
+            publish_timestamp=article["publish_time"],
+            images=[article["pic_url"]] if article["pic_url"] else [],
+            details={},
+            created_at=article["created_at"],
+            updated_at=article["updated_at"],
+            image_count=1,
+            has_images=True,
+            thumbnail_url=article["pic_url"]
+        )
+
     async def get_all_articles_by_account_id(self, account_id: str):
-        result = []
         ret = self.wechat_db.get_all_articles(account_id)
         logger.info(f"""获取所有微信公众号文章返回： {ret['success']}""")
         if ret["success"]:
-            for article in ret["data"]:
-                article_response = ArticleResponse(
-                    id=article["id"],
-                    account_id=article["mp_id"],
-                    title=article["title"][:100],
-                    url=article["url"],
-                    content=article["content"],
-                    summary=article.get("summary", ""),
-                    publish_time=article["publish_time"],
-                    publish_timestamp=article["publish_time"],
-                    images=[article["pic_url"]] if article["pic_url"] else [],
-                    details={},
-                    created_at=article["created_at"],
-                    updated_at=article["updated_at"],
-                    image_count=1,
-                    has_images=True,
-                    thumbnail_url=article["pic_url"]
-                )
-                result.append(article_response)
+            result = [self._to_article_response(article) for article in ret["data"]]
             logger.info("组装返回结果完成")
             
             return result
@@ -185,6 +186,29 @@ class WeChatAdapter(PlatformAdapter):
             logger.error(f"获取所有微信公众号文章API返回值异常: {ret}")
             return []
 
+    async def get_articles_by_account_id(
+        self,
+        account_id: str,
+        limit: int,
+        before: Optional[Tuple[int, str]] = None
+    ):
+        """
+        键集分页获取微信公众号文章，直接在数据库完成过滤和LIMIT
+        
+        查询失败时返回None，与账号确实没有文章时的空列表区分，避免调用方把不完整的结果写入缓存
+        """
+        before_time, before_id = before if before else (None, None)
+        ret = self.wechat_db.get_articles_before(
+            account_id,
+            before_time=before_time,
+            before_id=before_id,
+            limit=limit
+        )
+        if ret["success"]:
+            return [self._to_article_response(article) for article in ret["data"]]
+        logger.error(f"分页获取微信公众号文章API返回值异常: {ret}")
+        return None
+
 
     async def get_article_detail(self, article_id: str) -> Optional[Dict[str, Any]]:
         """
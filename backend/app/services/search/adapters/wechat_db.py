@@ -103,6 +103,34 @@ class WechatMySQLDB:
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    def get_articles_before(self, mp_id: str, before_time: Optional[int] = None,
+                            before_id: Optional[str] = None, limit: int = 20) -> Dict[str, Any]:
+        """
+        基于游标(publish_time, id)的键集分页查询，不使用OFFSET
+        
+        Args:
+            mp_id: 公众号ID
+            before_time: 游标发布时间，返回早于该位置的文章
+            before_id: 游标文章ID，用于同一发布时间内的排序
+            limit: 返回数量
+        """
+        params = {"mp_id": mp_id, "limit": limit}
+        where_sql = " WHERE mp_id = :mp_id"
+        if before_time is not None:
+            where_sql += (
+                " AND (publish_time < :before_time"
+                " OR (publish_time = :before_time AND id < :before_id))"
+            )
+            params["before_time"] = before_time
+            params["before_id"] = before_id or ""
+
+        try:
+            query = f"SELECT * FROM articles {where_sql} ORDER BY publish_time DESC, id DESC LIMIT :limit"
+            articles = self.execute_query(query, params)
+            return {"success": True, "data": articles}
+        except Exception as e:
+            return {"success": False, "error": str(e), "data": []}
+
     def get_all_articles(self, mp_id: Optional[str] = None, status: Optional[int] = None, 
                          search: Optional[str] = None) -> Dict[str, Any]:
         params = {}
@@ -2,7 +2,7 @@
 搜索服务基础抽象类和接口定义
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from pydantic import BaseModel
 from app.models.account import Platform
 from app.schemas.account import AccountResponse
@@ -100,6 +100,38 @@ class PlatformAdapter(ABC):
         """
         pass
 
+    async def get_articles_by_account_id(
+        self,
+        account_id: str,
+        limit: int,
+        before: Optional[Tuple[int, str]] = None
+    ) -> Optional[List[Any]]:
+        """
+        按(publish_timestamp, id)倒序获取账号的一页文章
+        
+        默认实现基于 get_all_articles_by_account_id 在内存中过滤，
+        支持键集分页的适配器应覆盖此方法直接在数据源完成查询。
+        
+        Args:
+            account_id: 账号ID
+            limit: 返回数量
+            before: 游标(publish_timestamp, id)，只返回早于该位置的文章
+        
+        Returns:
+            文章列表；数据源查询失败时返回None
+        """
+        articles = await self.get_all_articles_by_account_id(account_id)
+        if articles is None:
+            return None
+        articles = sorted(
+            articles,
+            key=lambda a: (a.publish_timestamp, str(a.id)),
+            reverse=True
+        )
+        if before is not None:
+            articles = [a for a in articles if (a.publish_timestamp, str(a.id)) < before]
+        return articles[:limit]
+
     @abstractmethod
     async def get_article_detail(self, article_id: str) -> Optional[Dict[str, Any]]:
         """
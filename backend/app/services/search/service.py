@@ -3,7 +3,7 @@
 """
 import asyncio
 from app.core.logging import get_logger
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, or_
 from app.services.search.base import SearchServiceBase, SearchResult, PlatformSearchResult
@@ -754,49 +754,60 @@ class SearchService(SearchServiceBase):
         return self._adapters[platform].platform_name
 
 
-    async def get_articles_by_platform_id(self, platform: str, account_id: str):
+    async def get_articles_by_platform_id(
+        self,
+        platform: str,
+        account_id: str,
+        limit: Optional[int] = None,
+        before: Optional[Tuple[int, str]] = None
+    ):
+        """
+        获取账号文章
+        
+        指定limit时按(publish_timestamp, id)键集分页，只返回游标before之后的limit篇文章；
+        否则返回全部文章。
+        """
         adapter = self.get_adapter(platform)
         if adapter and adapter.is_enabled:
             try:
+                if limit is not None:
+                    return await adapter.get_articles_by_account_id(account_id, limit, before)
                 articles = await adapter.get_all_articles_by_account_id(account_id)
                 return articles
             except Exception as e:
                 logger.error(f"从平台获取账号信息失败: {e}")
                 return None
 
-    async def get_articles_by_account(self, db: AsyncSession, account_id: str, platform: str, page: int, page_size: int):
+    async def get_articles_by_account(
+        self,
+        db: AsyncSession,
+        account_id: str,
+        platform: str,
+        page: int,
+        page_size: int,
+        limit: Optional[int] = None,
+        before: Optional[Tuple[int, str]] = None
+    ):
 
         # 获取账号信息
         account = await self.get_account_by_platform_id(platform, account_id)
         if account:
-            articles = await self.get_articles_by_platform_id(platform, account_id)
+            articles = await self.get_articles_by_platform_id(platform, account_id, limit=limit, before=before)
             if articles:
-                result = []  # 创建新列表存储结果
-                for article in articles:
-                    article_response = ArticleWithAccount(
-                        id=article.id,
-                        account_id=article.account_id,
-                        title=article.title,
-                        url=article.url,
-                        content=article.content,
-                        summary=article.summary,
-                        publish_time=article.publish_time,
-                        publish_timestamp=article.publish_timestamp,
-                        images=article.images,
-                        details=article.details,
-                        created_at=article.created_at,
-                        updated_at=article.updated_at,
-                        image_count=article.image_count,
-                        has_images=article.has_images,
-                        thumbnail_url=article.thumbnail_url,
-                        account_name=account.name,
-                        account_platform=account.platform,
-                        account_avatar_url=account.avatar_url,
-                        platform_display_name=account.platform_display_name
-                    )
-                    result.append(article_response)  # 添加到新列表
+                # 适配器返回的ArticleResponse已校验过，账号字段每个账号只取一次，
+                # 用model_construct直接组装，避免逐篇重复校验
+                account_fields = {
+                    "account_name": account.name,
+                    "account_platform": account.platform,
+                    "account_avatar_url": account.avatar_url,
+                    "platform_display_name": account.platform_display_name
+                }
+                result = [
+                    ArticleWithAccount.model_construct(**dict(article), **account_fields)
+                    for article in articles
+                ]
                 logger.info(f"""组装ArticleWithAccount返回结果完成""")
-                return result  # 返回新列表
+                return result
             return articles
         else:
             logger.error(f"获取账号信息失败: {account_id}")
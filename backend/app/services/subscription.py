@@ -7,6 +7,7 @@ from datetime import datetime
 import time
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, or_, desc, asc, delete
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload, joinedload
 
 from app.models.user import User, MembershipLevel
@@ -29,6 +30,7 @@ from app.core.exceptions import (
 import traceback
 from app.db.redis import cache_service
 from app.services.search.service import search_service
+from app.services.content import content_service
 
 logger = get_logger(__name__)
 
@@ -103,7 +105,12 @@ class SubscriptionService:
             )
             
             db.add(subscription)
-            await db.commit()
+            try:
+                await db.commit()
+            except IntegrityError:
+                # 并发请求可能同时通过上面的重复检查，由唯一约束uq_user_account_subscription兜底
+                await db.rollback()
+                raise DuplicateException("已经订阅该账号")
             await db.refresh(subscription)
             
             # 清除相关缓存
@@ -368,7 +375,7 @@ class SubscriptionService:
             for subscription in recent_subscriptions_raw:
                 account = subscription.account
                 latest_article_time, article_count = await self._get_account_article_stats(
-                    db, account.id
+                    db, subscription.platform, subscription.account_id
                 )
                 
                 recent_subscription = SubscriptionWithAccount(
@@ -381,7 +388,7 @@ class SubscriptionService:
                     account_platform=account.platform,
                     account_avatar_url=account.avatar_url,
                     account_description=account.description,
-                    account_follower_count=account.follower_count,
+                    account_follower_count=0,  # 本地账号表不保存粉丝数
                     platform_display_name=self._get_platform_display_name(subscription.platform),
                     latest_article_time=latest_article_time,
                     article_count=article_count
@@ -727,6 +734,9 @@ class SubscriptionService:
             
             for key in cache_keys:
                 await cache_service.delete(key)
+            
+            # 订阅变化后动态流索引失效，下次获取首页时重建
+            await content_service.invalidate_feed_index([user_id])
                 
         except Exception as e:
             logger.warning(f"清除缓存失败: {str(e)}")
@@ -4,7 +4,9 @@ Celery任务模块
 from app.tasks.content import (
     fetch_new_content,
     get_content_change_notifications,
-    get_push_queue_status
+    get_push_queue_status,
+    refresh_user_platform_stats,
+    rebuild_user_feed_index
 )
 from app.tasks.push import (
     send_pending_notifications,
@@ -16,6 +18,8 @@ __all__ = [
     "fetch_new_content",
     "get_content_change_notifications", 
     "get_push_queue_status",
+    "refresh_user_platform_stats",
+    "rebuild_user_feed_index",
     "send_pending_notifications",
     "get_push_queue_statistics",
     "retry_failed_push_items"
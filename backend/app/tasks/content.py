@@ -4,6 +4,7 @@
 from celery import shared_task
 from app.tasks.base import BaseTask
 from app.services.content_detection import content_detection_service
+from app.services.content import content_service
 from app.db.database import AsyncSessionLocal
 from app.core.logging import get_logger
 import asyncio
@@ -64,6 +65,56 @@ def fetch_new_content(self):
         raise self.retry(exc=exc, countdown=60, max_retries=3)
 
 
+async def _refresh_platform_stats_async():
+    """异步刷新用户内容统计物化表"""
+    async with AsyncSessionLocal() as db:
+        return await content_service.refresh_platform_stats(db)
+
+
+@shared_task(base=BaseTask, bind=True)
+def refresh_user_platform_stats(self):
+    """刷新用户内容统计物化表任务"""
+    try:
+        logger.info("开始刷新用户内容统计...")
+        
+        row_count = asyncio.run(_refresh_platform_stats_async())
+        
+        logger.info(f"用户内容统计刷新完成，共 {row_count} 行")
+        return {
+            "status": "success",
+            "message": f"刷新完成，共 {row_count} 行",
+            "row_count": row_count
+        }
+        
+    except Exception as exc:
+        logger.error(f"刷新用户内容统计任务失败: {str(exc)}", exc_info=True)
+        raise self.retry(exc=exc, countdown=60, max_retries=3)
+
+
+async def _rebuild_user_feed_index_async(user_id: int):
+    """异步重建用户动态流索引"""
+    async with AsyncSessionLocal() as db:
+        await content_service.rebuild_user_feed_index(db, user_id)
+
+
+@shared_task(base=BaseTask, bind=True)
+def rebuild_user_feed_index(self, user_id: int):
+    """重建用户动态流索引任务（动态流首页未命中索引时提交）"""
+    try:
+        logger.info(f"开始重建用户 {user_id} 的动态流索引...")
+        
+        asyncio.run(_rebuild_user_feed_index_async(user_id))
+        
+        return {
+            "status": "success",
+            "message": f"用户 {user_id} 的动态流索引重建完成"
+        }
+        
+    except Exception as exc:
+        logger.error(f"重建动态流索引任务失败: {str(exc)}", exc_info=True)
+        raise self.retry(exc=exc, countdown=30, max_retries=2)
+
+
 async def _get_notifications_async(user_id: int):
     """异步获取通知"""
     try:
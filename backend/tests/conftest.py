@@ -1,34 +1,75 @@
 """
 测试配置文件
 """
+import os
 import pytest
 import asyncio
-from httpx import AsyncClient
+from httpx import AsyncClient, ASGITransport, Limits
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
 
 from app.main import app
 from app.db.database import get_db, Base
 from app.core.config import settings
 
-# 测试数据库URL
-TEST_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
+# 测试数据库URL：默认使用内存SQLite，提交时没有磁盘写入；
+# pytest-xdist 的每个 worker 是独立进程，各自持有独立的内存数据库。
+# 需要保留数据库文件排查问题时，可通过 TEST_DATABASE_URL 指定文件路径
+XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER", "master")
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", "sqlite+aiosqlite:///:memory:")
 
-# 创建测试数据库引擎
+_IS_SQLITE = TEST_DATABASE_URL.startswith("sqlite")
+
+if ":memory:" in TEST_DATABASE_URL:
+    # 内存数据库只存在于单个连接中，StaticPool使所有会话共用同一连接
+    _pool_options = {"poolclass": StaticPool}
+else:
+    # 数据库文件或外部数据库使用连接池，整个测试会话复用已建立的连接
+    _pool_options = {
+        "poolclass": AsyncAdaptedQueuePool,
+        "pool_size": 10,
+        "max_overflow": 5,
+        "pool_pre_ping": True
+    }
+
+# 创建测试数据库引擎（整个测试会话只创建一次）
 test_engine = create_async_engine(
     TEST_DATABASE_URL,
-    poolclass=StaticPool,
-    connect_args={"check_same_thread": False},
-    echo=False
+    connect_args={"check_same_thread": False} if _IS_SQLITE else {},
+    echo=False,
+    **_pool_options
 )
 
+# 会话绑定到外层事务所在的连接，会话内的commit只释放SAVEPOINT；
+# expire_on_commit=False使提交后主键和已赋值的属性仍可直接读取，新建对象后无需refresh
 TestSessionLocal = async_sessionmaker(
-    test_engine,
     class_=AsyncSession,
-    expire_on_commit=False
+    expire_on_commit=False,
+    join_transaction_mode="create_savepoint"
 )
 
 
+def _disable_pysqlite_transaction(dbapi_connection, connection_record):
+    """关闭驱动自带的事务管理，否则SQLite下SAVEPOINT无法正常工作"""
+    dbapi_connection.isolation_level = None
+
+
+def _emit_begin(conn):
+    """由SQLAlchemy显式发出BEGIN"""
+    conn.exec_driver_sql("BEGIN")
+
+
+def _emit_begin_immediate(conn):
+    """开始事务即获取写锁：多个连接并发写入时在busy timeout内排队，避免读锁升级写锁时直接报database is locked"""
+    conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+if _IS_SQLITE:
+    event.listen(test_engine.sync_engine, "connect", _disable_pysqlite_transaction)
+    event.listen(test_engine.sync_engine, "begin", _emit_begin)
+
+
 @pytest.fixture(scope="session")
 def event_loop():
     """创建事件循环"""
@@ -37,34 +78,222 @@ def event_loop():
     loop.close()
 
 
-@pytest.fixture(scope="function")
-async def db_session():
-    """创建测试数据库会话"""
-    async with test_engine.begin() as conn:
+@pytest.fixture(scope="session", autouse=True)
+def redis_key_namespace():
+    """xdist下各worker的数据库相互独立、用户ID会重复，为内容服务的Redis键加上worker前缀避免相互覆盖"""
+    from app.services.content import content_service
+    
+    prefixes = ("cache_prefix", "feed_count_prefix", "feed_index_prefix")
+    originals = {name: getattr(content_service, name) for name in prefixes}
+    for name, value in originals.items():
+        setattr(content_service, name, f"test:{XDIST_WORKER}:{value}")
+    
+    yield
+    
+    for name, value in originals.items():
+        setattr(content_service, name, value)
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """整个测试会话共用的数据库引擎，各测试复用其连接池"""
+    return test_engine
+
+
+@pytest.fixture(scope="session", autouse=True)
+async def prewarm_pool(engine):
+    """预先建立pool_size个连接：连接池按需建连且没有最小连接数参数，否则首批测试要承担建连耗时"""
+    if not isinstance(engine.pool, AsyncAdaptedQueuePool):
+        return
+    
+    conns = [await engine.connect() for _ in range(engine.pool.size())]
+    for conn in conns:
+        await conn.close()
+
+
+@pytest.fixture(scope="session")
+async def test_database(engine):
+    """创建测试数据库表结构（每个测试会话只执行一次DDL）"""
+    async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     
-    session = TestSessionLocal()
+    yield engine
+    
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+@pytest.fixture(scope="session")
+async def concurrent_engine(test_database, tmp_path_factory):
+    """
+    供并发任务使用的引擎，每个任务可从中取得独立连接
+    
+    内存数据库只有一个共享连接，无法承载多个并发事务，此时改用worker独立的临时文件数据库
+    """
+    if ":memory:" not in TEST_DATABASE_URL:
+        yield test_database
+        return
+    
+    db_path = tmp_path_factory.mktemp("concurrent") / f"test_{XDIST_WORKER}.db"
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{db_path}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+        echo=False
+    )
+    event.listen(engine.sync_engine, "connect", _disable_pysqlite_transaction)
+    event.listen(engine.sync_engine, "begin", _emit_begin_immediate)
+    
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    
+    yield engine
+    
+    await engine.dispose()
+
+
+@pytest.fixture(scope="function")
+async def db_session(test_database):
+    """创建测试数据库会话（从连接池取连接，测试结束后回滚外层事务，代替清表）"""
+    async with test_database.connect() as conn:
+        transaction = await conn.begin()
+        session = TestSessionLocal(bind=conn)
+        try:
+            yield session
+        finally:
+            await session.close()
+            await transaction.rollback()
+
+
+@pytest.fixture(scope="module")
+async def module_db_connection(test_database):
+    """模块级共享连接，模块内预置数据只写入一次，模块结束后整体回滚"""
+    async with test_database.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            yield conn
+        finally:
+            await transaction.rollback()
+
+
+@pytest.fixture(scope="module")
+async def module_db_session(module_db_connection):
+    """模块级数据库会话，用于写入模块内共享的预置数据"""
+    session = TestSessionLocal(bind=module_db_connection)
     try:
         yield session
     finally:
         await session.close()
-    
-    async with test_engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
 
 
 @pytest.fixture(scope="function")
-async def client(db_session):
-    """创建测试客户端"""
+async def module_savepoint_db_session(module_db_connection):
+    """在模块级事务内为每个测试开启SAVEPOINT，测试结束后回滚，保留模块内预置数据"""
+    savepoint = await module_db_connection.begin_nested()
+    session = TestSessionLocal(bind=module_db_connection)
+    try:
+        yield session
+    finally:
+        await session.close()
+        await savepoint.rollback()
+
+
+@pytest.fixture(scope="class")
+async def class_db_connection(test_database):
+    """类级共享连接，类内预置数据只写入一次，类结束后整体回滚"""
+    async with test_database.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            yield conn
+        finally:
+            await transaction.rollback()
+
+
+@pytest.fixture(scope="class")
+async def class_db_session(class_db_connection):
+    """类级数据库会话，用于写入类内共享的预置数据"""
+    session = TestSessionLocal(bind=class_db_connection)
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+@pytest.fixture(scope="function")
+async def savepoint_db_session(class_db_connection):
+    """在类级事务内为每个测试开启SAVEPOINT，测试结束后回滚，保留类内预置数据"""
+    savepoint = await class_db_connection.begin_nested()
+    session = TestSessionLocal(bind=class_db_connection)
+    try:
+        yield session
+    finally:
+        await session.close()
+        await savepoint.rollback()
+
+
+@pytest.fixture(scope="session")
+async def http_client():
+    """整个测试会话共用的ASGI测试客户端，避免每个测试重新构造传输层和连接池"""
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test",
+        limits=Limits(max_keepalive_connections=20, max_connections=100)
+    ) as ac:
+        yield ac
+
+
+@pytest.fixture(scope="function")
+async def client(http_client, db_session):
+    """测试客户端：复用会话级客户端，按测试把数据库依赖替换为当前测试的会话"""
     def override_get_db():
         yield db_session
     
     app.dependency_overrides[get_db] = override_get_db
+    try:
+        yield http_client
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.fixture(scope="function")
+async def concurrent_client(http_client, concurrent_engine):
+    """
+    每个请求使用独立会话的测试客户端（与生产环境的get_db一致），并发请求在数据库层面真正竞争
     
-    async with AsyncClient(app=app, base_url="http://test") as ac:
-        yield ac
+    数据会实际提交到concurrent_engine，使用该客户端的测试需自行清理
+    """
+    session_factory = async_sessionmaker(concurrent_engine, class_=AsyncSession, expire_on_commit=False)
+    
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
     
-    app.dependency_overrides.clear()
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        yield http_client
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.fixture(scope="function")
+def make_user(db_session):
+    """创建用户的工厂，按需覆盖字段（默认免费用户，openid唯一）"""
+    from app.models.user import User, MembershipLevel
+    from uuid import uuid4
+    
+    async def _make_user(**overrides):
+        fields = {
+            "openid": f"user_{uuid4().hex}",
+            "nickname": "测试用户",
+            "membership_level": MembershipLevel.FREE,
+            **overrides
+        }
+        user = User(**fields)
+        db_session.add(user)
+        await db_session.flush()
+        return user
+    
+    return _make_user
 
 
 @pytest.fixture(scope="function")
@@ -83,7 +312,6 @@ async def test_user(db_session):
     
     db_session.add(user)
     await db_session.commit()
-    await db_session.refresh(user)
     
     return user
 
@@ -105,7 +333,6 @@ async def test_account(db_session):
     
     db_session.add(account)
     await db_session.commit()
-    await db_session.refresh(account)
     
     return account
 
@@ -119,4 +346,30 @@ async def auth_headers(test_user):
     token_data = {"sub": str(test_user.id)}
     access_token = jwt_manager.create_access_token(token_data)
     
-    return {"Authorization": f"Bearer {access_token}"}
\ No newline at end of file
+    return {"Authorization": f"Bearer {access_token}"}
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    未显式指定xdist_group的测试按测试类分组（模块级测试按模块），仅在CI以 -n auto --dist=loadgroup 并行运行时生效
+    
+    同一类的测试分配到同一worker，类级夹具和预置数据只创建一次；显式的xdist_group可把多个模块合并到同一worker
+    """
+    for item in items:
+        if item.get_closest_marker("xdist_group"):
+            continue
+        item.add_marker(pytest.mark.xdist_group(name=item.nodeid.rsplit("::", 1)[0]))
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """汇总端到端测试结果，直接读取本次会话的测试报告，不重复执行测试"""
+    passed = [r for r in terminalreporter.stats.get("passed", []) if "::TestE2E" in r.nodeid]
+    failed = [r for r in terminalreporter.stats.get("failed", []) if "::TestE2E" in r.nodeid]
+    if not passed and not failed:
+        return
+    
+    terminalreporter.section("端到端测试总结")
+    terminalreporter.write_line(f"✅ 通过: {len(passed)} 个测试")
+    terminalreporter.write_line(f"❌ 失败: {len(failed)} 个测试")
+    for report in failed:
+        terminalreporter.write_line(f"  - {report.nodeid}")
@@ -92,19 +92,18 @@ class TestWeChatService:
         }
         
         # Mock WeChat configuration
-        with patch.object(wechat_service, 'app_id', 'test_app_id'):
-            with patch.object(wechat_service, 'app_secret', 'test_app_secret'):
-                with patch('httpx.AsyncClient') as mock_client:
-                    mock_response_obj = MagicMock()
-                    mock_response_obj.json.return_value = mock_response
-                    mock_response_obj.raise_for_status.return_value = None
-                    
-                    mock_client.return_value.__aenter__.return_value.get.return_value = mock_response_obj
-                    
-                    result = await wechat_service.code_to_session("test_code")
-                    
-                    assert result["openid"] == "test_openid"
-                    assert result["session_key"] == "test_session_key"
+        with patch.multiple(wechat_service, app_id='test_app_id', app_secret='test_app_secret'), \
+                patch('httpx.AsyncClient') as mock_client:
+            mock_response_obj = MagicMock()
+            mock_response_obj.json.return_value = mock_response
+            mock_response_obj.raise_for_status.return_value = None
+            
+            mock_client.return_value.__aenter__.return_value.get.return_value = mock_response_obj
+            
+            result = await wechat_service.code_to_session("test_code")
+            
+            assert result["openid"] == "test_openid"
+            assert result["session_key"] == "test_session_key"
     
     @pytest.mark.asyncio
     async def test_code_to_session_error(self):
@@ -3,7 +3,7 @@
 """
 import pytest
 from datetime import datetime, timedelta
-from unittest.mock import AsyncMock, patch, MagicMock
+from unittest.mock import AsyncMock, MagicMock
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.services.content_detection import content_detection_service
@@ -12,6 +12,29 @@ from app.models.account import Account, Platform
 from app.models.subscription import Subscription
 from app.models.user import User, MembershipLevel
 
+# 测试之间无共享可变状态；共用自动Redis夹具的测试分到同一个xdist分组
+pytestmark = pytest.mark.xdist_group(name="content")
+
+# 固定的示例时间，模块级夹具共享同一时间戳
+_NOW = datetime(2024, 1, 1)
+_TS = int(_NOW.timestamp())
+
+
+class _Result:
+    """轻量的查询结果桩，代替 MagicMock 结果对象"""
+    
+    def __init__(self, rows):
+        self._rows = list(rows)
+    
+    def scalars(self):
+        return self
+    
+    def all(self):
+        return self._rows
+    
+    def fetchall(self):
+        return self._rows
+
 
 @pytest.fixture
 def mock_db():
@@ -19,20 +42,36 @@ def mock_db():
     return AsyncMock(spec=AsyncSession)
 
 
-@pytest.fixture
+@pytest.fixture(autouse=True)
+def mock_redis_client(monkeypatch):
+    """模拟Redis客户端，每个测试统一替换 get_redis"""
+    client = AsyncMock()
+    # redis.pipeline() 是同步方法，排队命令后只有 execute() 需要 await
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[])
+    client.pipeline = MagicMock(return_value=pipe)
+    monkeypatch.setattr(
+        'app.services.content_detection.get_redis',
+        AsyncMock(return_value=client)
+    )
+    return client
+
+
+@pytest.fixture(scope="module")
 def sample_articles():
-    """示例文章数据"""
-    return [
+    """示例文章数据（模块内共享，只读）"""
+    return (
         Article(
             id=1,
             account_id=1,
             title="测试文章1",
             url="https://example.com/article1",
             summary="这是测试文章1的摘要",
-            publish_time=datetime.now(),
-            publish_timestamp=int(datetime.now().timestamp()),
+            publish_time=_NOW,
+            publish_timestamp=_TS,
             images=["https://example.com/image1.jpg"],
-            created_at=datetime.now()
+            image_count=1,
+            created_at=_NOW
         ),
         Article(
             id=2,
@@ -40,93 +79,89 @@ def sample_articles():
             title="测试文章2",
             url="https://example.com/article2",
             summary="这是测试文章2的摘要",
-            publish_time=datetime.now(),
-            publish_timestamp=int(datetime.now().timestamp()),
+            publish_time=_NOW,
+            publish_timestamp=_TS,
             images=[],
-            created_at=datetime.now()
+            image_count=0,
+            created_at=_NOW
         )
-    ]
+    )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_subscriptions():
-    """示例订阅数据"""
-    return [
+    """示例订阅数据（模块内共享，只读）"""
+    return (
         (1,),  # user_id = 1 订阅了 account_id = 1
         (2,),  # user_id = 2 订阅了 account_id = 1
-    ]
+    )
 
 
 class TestContentDetectionService:
     """新内容检测服务测试类"""
     
-    @pytest.mark.asyncio
-    async def test_detect_new_content_success(self, mock_db, sample_articles):
+    async def test_detect_new_content_success(self, mock_db, mock_redis_client, sample_articles):
         """测试成功检测新内容"""
-        # 模拟数据库查询返回新文章
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = sample_articles
-        mock_db.execute.return_value = mock_result
-        
-        # 模拟Redis操作
-        with patch('app.services.content_detection.get_redis') as mock_redis:
-            mock_redis_client = AsyncMock()
-            mock_redis.return_value = mock_redis_client
-            
-            # 模拟获取上次检查时间
-            mock_redis_client.get.return_value = None
-            
-            # 模拟订阅查询
-            subscription_result = MagicMock()
-            subscription_result.fetchall.return_value = [(1,), (2,)]
-            mock_db.execute.side_effect = [mock_result, subscription_result, subscription_result]
-            
-            # 执行测试
-            result = await content_detection_service.detect_new_content(mock_db)
-            
-            # 验证结果
-            assert len(result) == 2
-            assert result[0]["id"] == 1
-            assert result[0]["title"] == "测试文章1"
-            assert result[1]["id"] == 2
-            assert result[1]["title"] == "测试文章2"
-            
-            # 验证Redis操作被调用
-            mock_redis_client.lpush.assert_called()
-            mock_redis_client.set.assert_called()
+        # 模拟获取上次检查时间
+        mock_redis_client.get.return_value = None
+        
+        # 模拟新文章查询及每篇文章的订阅查询
+        mock_db.execute.side_effect = [
+            _Result(sample_articles),
+            _Result([(1,), (2,)]),
+            _Result([(1,), (2,)])
+        ]
+        
+        # 执行测试
+        result = await content_detection_service.detect_new_content(mock_db)
+        
+        # 验证结果
+        assert len(result) == 2
+        assert result[0]["id"] == 1
+        assert result[0]["title"] == "测试文章1"
+        assert result[1]["id"] == 2
+        assert result[1]["title"] == "测试文章2"
+        
+        # 验证推送队列和检查时间通过同一个pipeline一次提交
+        pipe = mock_redis_client.pipeline.return_value
+        assert pipe.lpush.call_count == len(sample_articles)
+        pipe.set.assert_called_once()
+        assert pipe.execute.call_count == 1
+        mock_redis_client.lpush.assert_not_called()
     
-    @pytest.mark.asyncio
-    async def test_detect_new_content_no_articles(self, mock_db):
+    async def test_add_to_push_queue_batches_pipeline(self, mock_redis_client, monkeypatch):
+        """测试推送队列按批次提交pipeline"""
+        monkeypatch.setattr(content_detection_service, "pipeline_batch_size", 2)
+        queue_items = [{"article_id": i, "user_ids": [1]} for i in range(3)]
+        
+        result = await content_detection_service._add_to_push_queue(queue_items, _NOW)
+        
+        assert result is True
+        pipe = mock_redis_client.pipeline.return_value
+        assert pipe.lpush.call_count == 3
+        pipe.set.assert_called_once()
+        # 第一批2条LPUSH，第二批1条LPUSH + SET
+        assert pipe.execute.call_count == 2
+    
+    async def test_detect_new_content_no_articles(self, mock_db, mock_redis_client):
         """测试没有新文章的情况"""
         # 模拟数据库查询返回空结果
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = []
-        mock_db.execute.return_value = mock_result
-        
-        # 模拟Redis操作
-        with patch('app.services.content_detection.get_redis') as mock_redis:
-            mock_redis_client = AsyncMock()
-            mock_redis.return_value = mock_redis_client
-            mock_redis_client.get.return_value = None
-            
-            # 执行测试
-            result = await content_detection_service.detect_new_content(mock_db)
-            
-            # 验证结果
-            assert len(result) == 0
-            
-            # 验证仍然更新了检查时间
-            mock_redis_client.set.assert_called()
+        mock_db.execute.return_value = _Result([])
+        
+        mock_redis_client.get.return_value = None
+        
+        # 执行测试
+        result = await content_detection_service.detect_new_content(mock_db)
+        
+        # 验证结果
+        assert len(result) == 0
+        
+        # 验证仍然更新了检查时间
+        mock_redis_client.set.assert_called()
     
-    @pytest.mark.asyncio
     async def test_get_content_change_notifications(self, mock_db):
         """测试获取内容变更通知"""
-        # 模拟订阅查询
-        subscription_result = MagicMock()
-        subscription_result.fetchall.return_value = [(1,), (2,)]
-        
         # 模拟文章查询
-        article_result = MagicMock()
         article_data = [
             (
                 Article(
@@ -147,9 +182,8 @@ class TestContentDetectionService:
                 )
             )
         ]
-        article_result.fetchall.return_value = article_data
-        
-        mock_db.execute.side_effect = [subscription_result, article_result]
+        # 先返回订阅查询，再返回文章查询
+        mock_db.execute.side_effect = [_Result([(1,), (2,)]), _Result(article_data)]
         
         # 执行测试
         result = await content_detection_service.get_content_change_notifications(mock_db, 1)
@@ -160,13 +194,10 @@ class TestContentDetectionService:
         assert result[0]["account_name"] == "测试账号1"
         assert result[0]["title"] == "通知文章1"
     
-    @pytest.mark.asyncio
     async def test_get_content_change_notifications_no_subscriptions(self, mock_db):
         """测试用户没有订阅时的通知获取"""
         # 模拟空订阅查询
-        subscription_result = MagicMock()
-        subscription_result.fetchall.return_value = []
-        mock_db.execute.return_value = subscription_result
+        mock_db.execute.return_value = _Result([])
         
         # 执行测试
         result = await content_detection_service.get_content_change_notifications(mock_db, 1)
@@ -174,63 +205,55 @@ class TestContentDetectionService:
         # 验证结果
         assert len(result) == 0
     
-    @pytest.mark.asyncio
-    async def test_get_push_queue_status(self):
+    async def test_get_push_queue_status(self, mock_redis_client):
         """测试获取推送队列状态"""
-        with patch('app.services.content_detection.get_redis') as mock_redis:
-            mock_redis_client = AsyncMock()
-            mock_redis.return_value = mock_redis_client
-            
-            # 模拟队列长度
-            mock_redis_client.llen.return_value = 5
-            mock_redis_client.lrange.return_value = [
-                '{"article_id": 1, "user_ids": [1, 2], "created_at": "2024-01-01T10:00:00"}'
-            ]
-            
-            # 执行测试
-            result = await content_detection_service.get_push_queue_status()
-            
-            # 验证结果
-            assert result["queue_length"] == 5
-            assert result["status"] == "active"
-            assert len(result["recent_items"]) == 1
-            assert result["recent_items"][0]["article_id"] == 1
+        # 模拟队列长度
+        mock_redis_client.llen.return_value = 5
+        mock_redis_client.lrange.return_value = [
+            '{"article_id": 1, "user_ids": [1, 2], "created_at": "2024-01-01T10:00:00"}'
+        ]
+        
+        # 执行测试
+        result = await content_detection_service.get_push_queue_status()
+        
+        # 验证结果
+        assert result["queue_length"] == 5
+        assert result["status"] == "active"
+        assert len(result["recent_items"]) == 1
+        assert result["recent_items"][0]["article_id"] == 1
     
-    @pytest.mark.asyncio
-    async def test_get_push_queue_status_redis_unavailable(self):
+    async def test_get_push_queue_status_redis_unavailable(self, monkeypatch):
         """测试Redis不可用时的队列状态获取"""
-        with patch('app.services.content_detection.get_redis') as mock_redis:
-            mock_redis.return_value = None
-            
-            # 执行测试
-            result = await content_detection_service.get_push_queue_status()
-            
-            # 验证结果
-            assert result["queue_length"] == 0
-            assert result["status"] == "redis_unavailable"
+        monkeypatch.setattr(
+            'app.services.content_detection.get_redis',
+            AsyncMock(return_value=None)
+        )
+        
+        # 执行测试
+        result = await content_detection_service.get_push_queue_status()
+        
+        # 验证结果
+        assert result["queue_length"] == 0
+        assert result["status"] == "redis_unavailable"
     
-    @pytest.mark.asyncio
-    async def test_clear_push_queue(self):
+    async def test_clear_push_queue(self, mock_redis_client):
         """测试清空推送队列"""
-        with patch('app.services.content_detection.get_redis') as mock_redis:
-            mock_redis_client = AsyncMock()
-            mock_redis.return_value = mock_redis_client
-            
-            # 执行测试
-            result = await content_detection_service.clear_push_queue()
-            
-            # 验证结果
-            assert result is True
-            mock_redis_client.delete.assert_called_once()
+        # 执行测试
+        result = await content_detection_service.clear_push_queue()
+        
+        # 验证结果
+        assert result is True
+        mock_redis_client.delete.assert_called_once()
     
-    @pytest.mark.asyncio
-    async def test_clear_push_queue_redis_unavailable(self):
+    async def test_clear_push_queue_redis_unavailable(self, monkeypatch):
         """测试Redis不可用时的队列清空"""
-        with patch('app.services.content_detection.get_redis') as mock_redis:
-            mock_redis.return_value = None
-            
-            # 执行测试
-            result = await content_detection_service.clear_push_queue()
-            
-            # 验证结果
-            assert result is False
\ No newline at end of file
+        monkeypatch.setattr(
+            'app.services.content_detection.get_redis',
+            AsyncMock(return_value=None)
+        )
+        
+        # 执行测试
+        result = await content_detection_service.clear_push_queue()
+        
+        # 验证结果
+        assert result is False
\ No newline at end of file
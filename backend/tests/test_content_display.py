@@ -126,29 +126,31 @@ class TestPlatformService:
         assert unknown_info['display_name'] == "Unknown"
         assert unknown_info['icon'] == "📄"
     
-    def test_get_platform_display_name(self):
+    @pytest.mark.parametrize("platform,display_name", [
+        ("wechat", "微信公众号"),
+        ("weibo", "新浪微博"),
+        ("twitter", "Twitter"),
+        ("unknown", "Unknown"),
+    ])
+    def test_get_platform_display_name(self, platform, display_name):
         """测试获取平台显示名称"""
-        assert platform_service.get_platform_display_name("wechat") == "微信公众号"
-        assert platform_service.get_platform_display_name("weibo") == "新浪微博"
-        assert platform_service.get_platform_display_name("twitter") == "Twitter"
-        assert platform_service.get_platform_display_name("unknown") == "Unknown"
+        assert platform_service.get_platform_display_name(platform) == display_name
     
-    def test_get_platform_badge(self):
-        """测试获取平台徽章"""
+    @pytest.mark.parametrize("style,expected,absent", [
         # 默认样式
-        default_badge = platform_service.get_platform_badge("wechat")
-        assert default_badge['text'] == "微信"
-        assert default_badge['icon'] == "🔥"
-        assert default_badge['color'] == "#07C160"
-        
+        ("default", {"text": "微信", "icon": "🔥", "color": "#07C160"}, None),
         # 紧凑样式
-        compact_badge = platform_service.get_platform_badge("wechat", "compact")
-        assert compact_badge['text'] == "🔥"
-        
+        ("compact", {"text": "🔥"}, None),
         # 简约样式
-        minimal_badge = platform_service.get_platform_badge("wechat", "minimal")
-        assert 'background_color' not in minimal_badge
-        assert minimal_badge['text'] == "微信"
+        ("minimal", {"text": "微信"}, "background_color"),
+    ])
+    def test_get_platform_badge(self, style, expected, absent):
+        """测试获取平台徽章"""
+        badge = platform_service.get_platform_badge("wechat", style)
+        for key, value in expected.items():
+            assert badge[key] == value
+        if absent:
+            assert absent not in badge
     
     def test_format_content_for_platform(self):
         """测试平台内容格式化"""
@@ -336,24 +338,22 @@ class TestContentDisplayIntegration:
         assert optimized_images[0]['loading'] == 'eager'
         assert optimized_images[1]['loading'] == 'lazy'
     
-    def test_platform_specific_features(self):
+    @pytest.mark.parametrize("platform", ['wechat', 'weibo', 'twitter'])
+    def test_platform_specific_features(self, platform):
         """测试平台特定功能"""
-        platforms = ['wechat', 'weibo', 'twitter']
-        
-        for platform in platforms:
-            # 获取平台信息
-            info = platform_service.get_platform_info(platform)
-            assert info['display_name'] is not None
-            assert info['color'] is not None
-            assert info['icon'] is not None
-            
-            # 测试图片处理
-            test_image = "https://example.com/test.jpg"
-            thumbnail = image_service.generate_thumbnail_url(test_image, platform)
-            assert thumbnail is not None
-            
-            # 测试内容格式化
-            test_content = "测试内容"
-            formatted = platform_service.format_content_for_platform(test_content, platform)
-            assert formatted['display_content'] == test_content
-            assert formatted['is_truncated'] is False
\ No newline at end of file
+        # 获取平台信息
+        info = platform_service.get_platform_info(platform)
+        assert info['display_name'] is not None
+        assert info['color'] is not None
+        assert info['icon'] is not None
+        
+        # 测试图片处理
+        test_image = "https://example.com/test.jpg"
+        thumbnail = image_service.generate_thumbnail_url(test_image, platform)
+        assert thumbnail is not None
+        
+        # 测试内容格式化
+        test_content = "测试内容"
+        formatted = platform_service.format_content_for_platform(test_content, platform)
+        assert formatted['display_content'] == test_content
+        assert formatted['is_truncated'] is False
\ No newline at end of file
@@ -1,24 +1,536 @@
 """
 内容服务测试
 """
+import fnmatch
+import json
 import pytest
 from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy import event, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.services.content import content_service
 from app.models.user import User, MembershipLevel
 from app.models.account import Account, Platform
 from app.models.article import Article
 from app.models.subscription import Subscription
+from app.models.user_platform_stats import UserPlatformStats
 from app.schemas.article import ArticleWithAccount, ArticleDetail, ArticleStats
 from app.schemas.common import PaginatedResponse
-from app.core.exceptions import BusinessException
+from app.core.exceptions import BusinessException, ValidationException
+
+
+# 内容服务测试使用的固定当前时间
+FROZEN_NOW = datetime(2024, 1, 15, 12, 0, 0)
+
+
+class _FrozenDatetime(datetime):
+    """now()固定为FROZEN_NOW的datetime"""
+    
+    @classmethod
+    def now(cls, tz=None):
+        return FROZEN_NOW
+
+
+def _make_feed_article(account_id: str, index: int, publish_timestamp: int) -> ArticleWithAccount:
+    """构造动态流文章"""
+    publish_time = datetime.fromtimestamp(publish_timestamp)
+    return ArticleWithAccount(
+        id=f"{account_id}_{index}",
+        account_id=account_id,
+        title=f"文章 {account_id} - {index}",
+        url=f"https://example.com/{account_id}/{index}",
+        publish_time=publish_time,
+        publish_timestamp=publish_timestamp,
+        images=[],
+        details={},
+        created_at=publish_time,
+        updated_at=publish_time,
+        image_count=0,
+        has_images=False,
+        thumbnail_url="",
+        account_name=f"账号 {account_id}",
+        account_platform="wechat",
+        platform_display_name="微信公众号"
+    )
+
+
+class _FakeSearchService:
+    """按账号保存文章的搜索服务桩，实现limit/before键集分页语义"""
+    
+    def __init__(self, articles_by_account, accounts=None):
+        self.articles_by_account = articles_by_account
+        self.accounts = accounts or {}
+    
+    async def get_article_detail(self, article_id, platform):
+        for articles in self.articles_by_account.values():
+            for article in articles:
+                if article.id == str(article_id):
+                    return article
+        return None
+    
+    async def get_account_by_platform_id(self, platform, account_id):
+        return self.accounts.get(account_id)
+    
+    async def get_articles_by_account(self, db, account_id, platform, page, page_size, limit=None, before=None):
+        articles = sorted(
+            self.articles_by_account.get(account_id, []),
+            key=lambda a: (a.publish_timestamp, str(a.id)),
+            reverse=True
+        )
+        if before is not None:
+            articles = [a for a in articles if (a.publish_timestamp, str(a.id)) < before]
+        return articles[:limit] if limit is not None else articles
+    
+    async def get_account_article_stats(self, account_id, platform):
+        return {"article_count": len(self.articles_by_account.get(account_id, []))}
+
+
+class _FakePipeline:
+    """按顺序回放命令的管道桩"""
+    
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+    
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((getattr(self.redis, name), args, kwargs))
+            return self
+        return queue
+    
+    async def execute(self):
+        results = [await command(*args, **kwargs) for command, args, kwargs in self.commands]
+        self.commands = []
+        return results
+
+
+class _FakeRedis:
+    """内存Redis桩，只实现动态流缓存与索引用到的命令"""
+    
+    def __init__(self):
+        self.values = {}
+        self.zsets = {}
+        self.ttls = {}
+    
+    def expire_all(self):
+        """模拟所有设置了过期时间的键到期"""
+        for key in list(self.ttls):
+            self.values.pop(key, None)
+            self.zsets.pop(key, None)
+        self.ttls.clear()
+    
+    async def get(self, key):
+        return self.values.get(key)
+    
+    async def setex(self, key, ttl, value):
+        self.values[key] = str(value)
+        self.ttls[key] = ttl
+    
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.values:
+            return None
+        self.values[key] = str(value)
+        if ex is not None:
+            self.ttls[key] = ex
+        return True
+    
+    async def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+    
+    async def keys(self, pattern):
+        return [key for key in [*self.values, *self.zsets] if fnmatch.fnmatchcase(key, pattern)]
+    
+    async def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+            self.zsets.pop(key, None)
+            self.ttls.pop(key, None)
+    
+    async def expire(self, key, ttl):
+        self.ttls[key] = ttl
+        return True
+    
+    async def hget(self, key, field):
+        return self.values.get(key, {}).get(field)
+    
+    async def hset(self, key, field, value):
+        self.values.setdefault(key, {})[field] = value
+    
+    async def rename(self, src, dst):
+        self.zsets[dst] = self.zsets.pop(src)
+        self.ttls.pop(src, None)
+    
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+    
+    def _descending(self, key):
+        return sorted(self.zsets.get(key, {}).items(), key=lambda item: (item[1], item[0]), reverse=True)
+    
+    async def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+    
+    async def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+    
+    async def zcount(self, key, min, max):
+        return sum(1 for score in self.zsets.get(key, {}).values() if min <= score <= max)
+    
+    async def zrevrange(self, key, start, end):
+        return [member for member, _ in self._descending(key)[start:end + 1]]
+    
+    async def zrevrangebyscore(self, key, max, min, start=0, num=None, withscores=False):
+        members = [(member, score) for member, score in self._descending(key) if score <= max]
+        members = members[start:start + num]
+        return members if withscores else [member for member, _ in members]
+    
+    async def zremrangebyrank(self, key, start, end):
+        ascending = list(reversed(self._descending(key)))
+        end = len(ascending) + end if end < 0 else end
+        for member, _ in ascending[start:end + 1]:
+            del self.zsets[key][member]
+
+
+@pytest.fixture
+def fake_redis():
+    fake = _FakeRedis()
+    with patch('app.services.content.get_redis', AsyncMock(return_value=fake)):
+        yield fake
+
+
+@pytest.fixture(autouse=True)
+def send_task():
+    """替换后台任务提交，测试中不连接Celery broker"""
+    with patch('app.services.content.celery_app.send_task') as mock_send_task:
+        yield mock_send_task
+
+
+class TestContentFeedPagination:
+    """动态流键集分页测试"""
+    
+    @pytest.fixture
+    def fake_search_service(self):
+        base = 1_700_000_000
+        articles_by_account = {
+            "wechat_a": [_make_feed_article("wechat_a", i, base - i * 120) for i in range(6)],
+            # 与wechat_a部分发布时间相同，验证同一时间戳下按ID排序
+            "wechat_b": [_make_feed_article("wechat_b", i, base - i * 240) for i in range(5)],
+        }
+        fake = _FakeSearchService(articles_by_account)
+        with patch('app.services.content.search_service', fake):
+            yield fake
+    
+    @pytest.fixture
+    async def feed_user(self, db_session: AsyncSession):
+        """创建订阅了两个账号的用户"""
+        user = User(openid="test_openid_feed_cursor", membership_level=MembershipLevel.FREE)
+        db_session.add(user)
+        await db_session.flush()
+        db_session.add_all([
+            Subscription(user_id=user.id, account_id="wechat_a", platform="wechat"),
+            Subscription(user_id=user.id, account_id="wechat_b", platform="wechat"),
+        ])
+        await db_session.commit()
+        return user
+    
+    async def test_cursor_traversal_matches_page_numbers(self, db_session, fake_search_service, feed_user):
+        """测试游标遍历与页码遍历结果一致"""
+        page_ids = []
+        for page in range(1, 5):
+            result = await content_service.get_user_feed(
+                db=db_session, user_id=feed_user.id, page=page, page_size=3, refresh=True
+            )
+            page_ids.extend(article.id for article in result.data)
+        
+        cursor_ids = []
+        cursor = None
+        while True:
+            result = await content_service.get_user_feed(
+                db=db_session, user_id=feed_user.id, page_size=3, refresh=True, cursor=cursor
+            )
+            cursor_ids.extend(article.id for article in result.data)
+            cursor = result.next_cursor
+            if cursor is None:
+                break
+        
+        assert len(cursor_ids) == 11
+        assert cursor_ids == page_ids
+        assert len(set(cursor_ids)) == len(cursor_ids)
+    
+    async def test_feed_skips_total_by_default(self, db_session, fake_search_service, feed_user):
+        """测试默认不统计总数，仅返回has_more"""
+        with patch.object(fake_search_service, 'get_account_article_stats') as mock_stats:
+            result = await content_service.get_user_feed(
+                db=db_session, user_id=feed_user.id, page=1, page_size=3, refresh=True
+            )
+        
+        mock_stats.assert_not_called()
+        assert len(result.data) == 3
+        assert result.total is None
+        assert result.total_pages is None
+        assert result.has_more is True
+    
+    async def test_feed_total_when_requested(self, db_session, fake_search_service, feed_user):
+        """测试按需统计总数"""
+        result = await content_service.get_user_feed(
+            db=db_session, user_id=feed_user.id, page=4, page_size=3, refresh=True, include_total=True
+        )
+        
+        assert len(result.data) == 2
+        assert result.total == 11
+        assert result.total_pages == 4
+        assert result.has_more is False
+    
+    async def test_feed_served_from_index(self, db_session, fake_search_service, fake_redis, feed_user, send_task):
+        """测试首页未命中索引时提交后台重建，重建后翻页直接读取索引"""
+        first = await content_service.get_user_feed(
+            db=db_session, user_id=feed_user.id, page=1, page_size=3
+        )
+        send_task.assert_called_once_with("app.tasks.content.rebuild_user_feed_index", args=[feed_user.id])
+        assert await fake_redis.zcard(content_service._feed_index_key(feed_user.id)) == 0
+        
+        # 模拟后台任务执行
+        await content_service.rebuild_user_feed_index(db_session, feed_user.id)
+        assert await fake_redis.zcard(content_service._feed_index_key(feed_user.id)) == 11
+        
+        with patch.object(fake_search_service, 'get_articles_by_account') as mock_fetch:
+            second = await content_service.get_user_feed(
+                db=db_session, user_id=feed_user.id, page=2, page_size=3
+            )
+            by_cursor = await content_service.get_user_feed(
+                db=db_session, user_id=feed_user.id, page_size=3, cursor=first.next_cursor
+            )
+        mock_fetch.assert_not_called()
+        
+        expected = await content_service.get_user_feed(
+            db=db_session, user_id=feed_user.id, page=2, page_size=3, refresh=True
+        )
+        expected_ids = [article.id for article in expected.data]
+        assert [article.id for article in second.data] == expected_ids
+        assert [article.id for article in by_cursor.data] == expected_ids
+        assert second.next_cursor == expected.next_cursor
+    
+    async def test_feed_miss_fetches_only_current_page(self, db_session, fake_search_service, fake_redis, feed_user, send_task):
+        """测试未命中索引时每个账号只获取到当前页所需篇数，重复未命中只提交一次重建"""
+        with patch.object(
+            fake_search_service, 'get_articles_by_account', wraps=fake_search_service.get_articles_by_account
+        ) as mock_fetch:
+            for _ in range(2):
+                await content_service.get_user_feed(
+                    db=db_session, user_id=feed_user.id, page=1, page_size=3, refresh=True
+                )
+        
+        assert {call.kwargs["limit"] for call in mock_fetch.call_args_list} == {4}
+        send_task.assert_called_once()
+    
+    async def test_feed_miss_without_redis_skips_rebuild(self, db_session, fake_search_service, feed_user, send_task):
+        """测试Redis不可用时不提交索引重建"""
+        with patch('app.services.content.get_redis', AsyncMock(return_value=None)):
+            result = await content_service.get_user_feed(
+                db=db_session, user_id=feed_user.id, page=1, page_size=3
+            )
+        
+        assert len(result.data) == 3
+        send_task.assert_not_called()
+    
+    async def test_feed_index_expires_with_feed_cache(self, db_session, fake_search_service, fake_redis, feed_user):
+        """测试索引与文章缓存随动态流缓存过期，过期重建后包含外部新发布的文章"""
+        await content_service.rebuild_user_feed_index(db_session, feed_user.id)
+        assert fake_redis.ttls
+        assert all(ttl <= content_service.feed_cache_ttl for ttl in fake_redis.ttls.values())
+        
+        # 外部数据源发布新文章，不会通知本服务失效索引
+        new_article = _make_feed_article("wechat_a", 99, 1_700_000_000 + 60)
+        fake_search_service.articles_by_account["wechat_a"].append(new_article)
+        fake_redis.expire_all()
+        
+        await content_service.rebuild_user_feed_index(db_session, feed_user.id)
+        key = content_service._feed_index_key(feed_user.id)
+        assert f"{new_article.id}\twechat" in fake_redis.zsets[key]
+        
+        with patch.object(fake_search_service, 'get_articles_by_account') as mock_fetch:
+            result = await content_service.get_user_feed(
+                db=db_session, user_id=feed_user.id, page=1, page_size=3
+            )
+        mock_fetch.assert_not_called()
+        assert result.data[0].id == new_article.id
+    
+    async def test_feed_index_stores_only_ids(self, db_session, fake_search_service, fake_redis, feed_user):
+        """测试索引成员只保存文章ID，文章缓存缺失时回退实时获取"""
+        await content_service.rebuild_user_feed_index(db_session, feed_user.id)
+        key = content_service._feed_index_key(feed_user.id)
+        assert sorted(fake_redis.zsets[key]) == sorted(
+            [f"wechat_a_{i}\twechat" for i in range(6)] + [f"wechat_b_{i}\twechat" for i in range(5)]
+        )
+        
+        await fake_redis.delete(content_service._feed_article_key("wechat", "wechat_a_1"))
+        with patch.object(
+            fake_search_service, 'get_articles_by_account', wraps=fake_search_service.get_articles_by_account
+        ) as mock_fetch:
+            result = await content_service.get_user_feed(
+                db=db_session, user_id=feed_user.id, page=1, page_size=3
+            )
+        mock_fetch.assert_called()
+        assert "wechat_a_1" in [article.id for article in result.data]
+    
+    async def test_refresh_rebuilds_feed_index(self, db_session, fake_search_service, fake_redis, feed_user):
+        """测试强制刷新后重建动态流索引"""
+        result = await content_service.refresh_user_feed_cache(feed_user.id, db=db_session)
+        
+        assert result is True
+        assert await fake_redis.zcard(content_service._feed_index_key(feed_user.id)) == 11
+    
+    async def test_iter_user_feed(self, db_session, fake_search_service, feed_user):
+        """测试逐篇产出订阅账号的文章"""
+        article_ids = [
+            article.id async for article in content_service.iter_user_feed(db_session, feed_user.id, limit=4)
+        ]
+        
+        assert sorted(article_ids) == sorted(
+            [f"wechat_a_{i}" for i in range(4)] + [f"wechat_b_{i}" for i in range(4)]
+        )
+
+    async def test_iter_user_feed_fetches_in_batches(self, db_session, fake_search_service, feed_user):
+        """测试每个账号的文章按键集分批获取，不重复也不超过limit"""
+        calls = []
+        get_articles = fake_search_service.get_articles_by_account
+
+        async def record_get_articles(db, account_id, **kwargs):
+            calls.append((account_id, kwargs["limit"], kwargs["before"]))
+            return await get_articles(db, account_id, **kwargs)
+
+        with patch.object(content_service, 'feed_stream_batch_size', 2), \
+             patch.object(fake_search_service, 'get_articles_by_account', record_get_articles):
+            article_ids = [
+                article.id async for article in content_service.iter_user_feed(db_session, feed_user.id, limit=5)
+            ]
+
+        assert sorted(article_ids) == sorted(
+            [f"wechat_a_{i}" for i in range(5)] + [f"wechat_b_{i}" for i in range(5)]
+        )
+        assert [limit for account_id, limit, _ in calls if account_id == "wechat_a"] == [2, 2, 1]
+        assert calls[0][2] is None
+    
+    async def test_rebuild_feed_index_skips_incomplete(self, db_session, fake_search_service, fake_redis, feed_user):
+        """测试有账号获取失败时不写入动态流索引"""
+        original = fake_search_service.get_articles_by_account
+        
+        async def fail_wechat_b(db, account_id, **kwargs):
+            if account_id == "wechat_b":
+                return None
+            return await original(db, account_id, **kwargs)
+        
+        with patch.object(fake_search_service, 'get_articles_by_account', fail_wechat_b):
+            await content_service.rebuild_user_feed_index(db_session, feed_user.id)
+        
+        assert await fake_redis.keys("*") == []
+    
+    async def test_feed_json_first_page_cached(self, db_session, fake_search_service, fake_redis, feed_user):
+        """测试首页JSON命中缓存时不查询数据库，响应时间按请求生成"""
+        first = await content_service.get_user_feed_json(
+            db=db_session, user_id=feed_user.id, page=1, page_size=3
+        )
+        
+        statements = []
+        
+        def record_statement(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        sync_engine = db_session.bind.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", record_statement)
+        try:
+            second = await content_service.get_user_feed_json(
+                db=db_session, user_id=feed_user.id, page=1, page_size=3
+            )
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", record_statement)
+        
+        first_page = PaginatedResponse[ArticleWithAccount].model_validate_json(first)
+        second_page = PaginatedResponse[ArticleWithAccount].model_validate_json(second)
+        assert second_page.model_dump(exclude={"timestamp"}) == first_page.model_dump(exclude={"timestamp"})
+        assert second_page.timestamp >= first_page.timestamp
+        assert statements == []
+        assert first_page.has_more is True
+        
+        cached = await fake_redis.hget(content_service._feed_json_key(feed_user.id), "3")
+        assert "timestamp" not in json.loads(cached)
+        
+        await content_service.invalidate_feed_index([feed_user.id])
+        assert await fake_redis.hget(content_service._feed_json_key(feed_user.id), "3") is None
+    
+    async def test_invalid_cursor(self, db_session, fake_search_service, feed_user):
+        """测试无效游标"""
+        with pytest.raises(ValidationException):
+            await content_service.get_user_feed(
+                db=db_session, user_id=feed_user.id, page_size=3, refresh=True, cursor="!!!"
+            )
+
+
+class TestArticleDetailCache:
+    """文章详情缓存测试"""
+    
+    @pytest.fixture
+    def detail_search_service(self):
+        fake = MagicMock()
+        fake.get_article_detail = AsyncMock(
+            return_value=_make_feed_article("wechat_a", 0, 1_700_000_000)
+        )
+        fake.get_account_by_platform_id = AsyncMock(
+            return_value=SimpleNamespace(name="账号 wechat_a", platform="wechat", avatar_url=None)
+        )
+        with patch('app.services.content.search_service', fake):
+            yield fake
+    
+    async def test_detail_body_shared_across_users(self, db_session, fake_redis, detail_search_service):
+        """测试文章详情按文章缓存，其他用户访问只查询订阅状态"""
+        subscriber = User(openid="test_openid_detail_subscriber", membership_level=MembershipLevel.FREE)
+        visitor = User(openid="test_openid_detail_visitor", membership_level=MembershipLevel.FREE)
+        db_session.add_all([subscriber, visitor])
+        await db_session.flush()
+        db_session.add(Subscription(user_id=subscriber.id, account_id="wechat_a", platform="wechat"))
+        await db_session.commit()
+        
+        first = await content_service.get_article_detail(
+            db=db_session, article_id="wechat_a_0", user_id=subscriber.id, platform="wechat"
+        )
+        
+        statements = []
+        
+        def record_statement(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        sync_engine = db_session.bind.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", record_statement)
+        try:
+            second = await content_service.get_article_detail(
+                db=db_session, article_id="wechat_a_0", user_id=visitor.id, platform="wechat"
+            )
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", record_statement)
+        
+        detail_search_service.get_article_detail.assert_awaited_once()
+        assert not any("FROM articles" in statement for statement in statements)
+        assert first.id == second.id
+        assert first.is_subscribed is True
+        assert second.is_subscribed is False
 
 
 class TestContentService:
-    """内容服务测试类"""
+    """内容服务测试类（预置数据按类共享，各测试在SAVEPOINT内执行并回滚）"""
+    
+    @pytest.fixture(scope="class", autouse=True)
+    def frozen_time(self):
+        """冻结服务内的当前时间，使时间区间统计与预置数据一致"""
+        with patch('app.services.content.datetime', _FrozenDatetime):
+            yield FROZEN_NOW
     
     @pytest.fixture
-    async def sample_user(self, db_session: AsyncSession):
+    def db_session(self, savepoint_db_session):
+        """类内测试使用类级事务中的SAVEPOINT会话"""
+        return savepoint_db_session
+    
+    @pytest.fixture(scope="class")
+    async def sample_user(self, class_db_session: AsyncSession):
         """创建测试用户"""
         user = User(
             openid="test_openid_content",
@@ -26,91 +538,125 @@ class TestContentService:
             avatar_url="https://example.com/avatar.jpg",
             membership_level=MembershipLevel.FREE
         )
+        class_db_session.add(user)
+        await class_db_session.commit()
+        return user
+    
+    @pytest.fixture
+    async def fresh_user(self, db_session: AsyncSession):
+        """创建没有任何订阅的测试用户"""
+        user = User(
+            openid="test_openid_content_fresh",
+            nickname="新用户",
+            avatar_url="https://example.com/avatar.jpg",
+            membership_level=MembershipLevel.FREE
+        )
         db_session.add(user)
         await db_session.commit()
-        await db_session.refresh(user)
         return user
     
-    @pytest.fixture
-    async def sample_accounts(self, db_session: AsyncSession):
+    @pytest.fixture(scope="class")
+    async def sample_accounts(self, class_db_session: AsyncSession):
         """创建测试账号"""
         accounts = []
         
         # 微博账号
         weibo_account = Account(
             name="测试微博博主",
-            platform=Platform.WEIBO,
+            platform=Platform.WEIBO.value,
             account_id="weibo_123",
             avatar_url="https://example.com/weibo_avatar.jpg",
-            description="测试微博账号",
-            follower_count=10000
+            description="测试微博账号"
         )
-        db_session.add(weibo_account)
+        class_db_session.add(weibo_account)
         accounts.append(weibo_account)
         
         # 微信公众号
         wechat_account = Account(
             name="测试公众号",
-            platform=Platform.WECHAT,
+            platform=Platform.WECHAT.value,
             account_id="wechat_123",
             avatar_url="https://example.com/wechat_avatar.jpg",
-            description="测试微信公众号",
-            follower_count=5000
+            description="测试微信公众号"
         )
-        db_session.add(wechat_account)
+        class_db_session.add(wechat_account)
         accounts.append(wechat_account)
         
-        await db_session.commit()
-        for account in accounts:
-            await db_session.refresh(account)
+        await class_db_session.commit()
         
         return accounts
     
-    @pytest.fixture
-    async def sample_articles(self, db_session: AsyncSession, sample_accounts):
-        """创建测试文章"""
-        articles = []
-        now = datetime.now()
+    @pytest.fixture(scope="class")
+    async def sample_articles(self, class_db_session: AsyncSession, sample_accounts):
+        """创建测试文章（单条多行INSERT批量写入）"""
+        values = []
         
         for i, account in enumerate(sample_accounts):
-            for j in range(5):  # 每个账号创建5篇文章
-                publish_time = now - timedelta(hours=i*5 + j)
-                article = Article(
-                    account_id=account.id,
+            for j in range(5):  # 每个账号创建5篇文章，按天递减
+                publish_time = FROZEN_NOW - timedelta(days=i*5 + j)
+                images = [f"https://example.com/image_{j+1}.jpg"] if j % 2 == 0 else None
+                values.append(dict(
+                    account_id=account.account_id,
+                    platform=account.platform,
                     title=f"测试文章 {account.name} - {j+1}",
                     url=f"https://example.com/article_{account.id}_{j+1}",
                     content=f"这是来自 {account.name} 的测试文章内容 {j+1}",
                     summary=f"文章摘要 {j+1}",
                     publish_time=publish_time,
-                    publish_timestamp=int(publish_time.timestamp()),
-                    images=[f"https://example.com/image_{j+1}.jpg"] if j % 2 == 0 else None,
+                    images=images,
+                    image_count=Article.count_images(images),
                     details={"platform_specific": f"data_{j+1}"}
-                )
-                db_session.add(article)
-                articles.append(article)
+                ))
         
-        await db_session.commit()
-        for article in articles:
-            await db_session.refresh(article)
+        result = await class_db_session.scalars(insert(Article).returning(Article), values)
+        articles = result.all()
+        await class_db_session.commit()
         
         return articles
     
     @pytest.fixture
-    async def sample_subscriptions(self, db_session: AsyncSession, sample_user, sample_accounts):
-        """创建测试订阅关系"""
-        subscriptions = []
-        
-        for account in sample_accounts:
-            subscription = Subscription(
-                user_id=sample_user.id,
-                account_id=account.id
-            )
-            db_session.add(subscription)
-            subscriptions.append(subscription)
+    def db_search_service(self, sample_accounts, sample_articles):
+        """用测试数据库中的账号和文章替换搜索服务"""
+        accounts = {account.account_id: account for account in sample_accounts}
+        articles_by_account = {}
+        for article in sample_articles:
+            account = accounts[article.account_id]
+            articles_by_account.setdefault(article.account_id, []).append(ArticleWithAccount(
+                id=str(article.id),
+                account_id=article.account_id,
+                title=article.title,
+                url=article.url,
+                content=article.content,
+                summary=article.summary,
+                publish_time=article.publish_time,
+                publish_timestamp=article.publish_timestamp,
+                images=article.images or [],
+                details=article.details or {},
+                created_at=article.created_at,
+                updated_at=article.updated_at,
+                image_count=article.image_count,
+                has_images=article.has_images,
+                thumbnail_url=article.get_thumbnail_url(),
+                account_name=account.name,
+                account_platform=account.platform,
+                account_avatar_url=account.avatar_url,
+                platform_display_name=content_service._get_platform_display_name(account.platform)
+            ))
+        fake = _FakeSearchService(articles_by_account, accounts)
+        with patch('app.services.content.search_service', fake):
+            yield fake
+    
+    @pytest.fixture(scope="class")
+    async def sample_subscriptions(self, class_db_session: AsyncSession, sample_user, sample_accounts):
+        """创建测试订阅关系（单条多行INSERT批量写入）"""
+        values = [
+            dict(user_id=sample_user.id, account_id=account.account_id, platform=account.platform)
+            for account in sample_accounts
+        ]
         
-        await db_session.commit()
-        for subscription in subscriptions:
-            await db_session.refresh(subscription)
+        result = await class_db_session.scalars(insert(Subscription).returning(Subscription), values)
+        subscriptions = result.all()
+        await class_db_session.commit()
         
         return subscriptions
     
@@ -120,14 +666,17 @@ class TestContentService:
         sample_user, 
         sample_accounts, 
         sample_articles, 
-        sample_subscriptions
+        sample_subscriptions,
+        db_search_service,
+        fake_redis
     ):
         """测试获取用户动态流成功"""
         result = await content_service.get_user_feed(
             db=db_session,
             user_id=sample_user.id,
             page=1,
-            page_size=5
+            page_size=5,
+            include_total=True
         )
         
         assert isinstance(result, PaginatedResponse)
@@ -148,11 +697,11 @@ class TestContentService:
         assert first_article.account_platform is not None
         assert first_article.platform_display_name is not None
     
-    async def test_get_user_feed_no_subscriptions(self, db_session: AsyncSession, sample_user):
+    async def test_get_user_feed_no_subscriptions(self, db_session: AsyncSession, fresh_user):
         """测试用户没有订阅时获取动态流"""
         result = await content_service.get_user_feed(
             db=db_session,
-            user_id=sample_user.id,
+            user_id=fresh_user.id,
             page=1,
             page_size=10
         )
@@ -168,7 +717,9 @@ class TestContentService:
         sample_user, 
         sample_accounts, 
         sample_articles, 
-        sample_subscriptions
+        sample_subscriptions,
+        db_search_service,
+        fake_redis
     ):
         """测试动态流分页"""
         # 第一页
@@ -181,7 +732,7 @@ class TestContentService:
         
         assert len(page1.data) == 3
         assert page1.page == 1
-        assert page1.total_pages == 4  # 10篇文章，每页3篇，共4页
+        assert page1.has_more is True  # 10篇文章，每页3篇，还有下一页
         
         # 第二页
         page2 = await content_service.get_user_feed(
@@ -198,6 +749,16 @@ class TestContentService:
         page1_ids = {article.id for article in page1.data}
         page2_ids = {article.id for article in page2.data}
         assert page1_ids.isdisjoint(page2_ids)
+        
+        # 使用游标翻页应得到与页码分页相同的第二页
+        assert page1.next_cursor is not None
+        cursor_page2 = await content_service.get_user_feed(
+            db=db_session,
+            user_id=sample_user.id,
+            page_size=3,
+            cursor=page1.next_cursor
+        )
+        assert [article.id for article in cursor_page2.data] == [article.id for article in page2.data]
     
     async def test_get_article_detail_success(
         self, 
@@ -205,7 +766,9 @@ class TestContentService:
         sample_user, 
         sample_accounts, 
         sample_articles, 
-        sample_subscriptions
+        sample_subscriptions,
+        db_search_service,
+        fake_redis
     ):
         """测试获取文章详情成功"""
         article = sample_articles[0]
@@ -213,18 +776,21 @@ class TestContentService:
         result = await content_service.get_article_detail(
             db=db_session,
             article_id=article.id,
-            user_id=sample_user.id
+            user_id=sample_user.id,
+            platform=article.platform
         )
         
         assert isinstance(result, ArticleDetail)
-        assert result.id == article.id
+        assert result.id == str(article.id)
         assert result.title == article.title
         assert result.account_name is not None
         assert result.account_platform is not None
         assert result.is_subscribed is True  # 用户已订阅该账号
         assert isinstance(result.related_articles, list)
     
-    async def test_get_article_detail_not_found(self, db_session: AsyncSession, sample_user):
+    async def test_get_article_detail_not_found(
+        self, db_session: AsyncSession, sample_user, db_search_service, fake_redis
+    ):
         """测试获取不存在的文章详情"""
         with pytest.raises(BusinessException) as exc_info:
             await content_service.get_article_detail(
@@ -240,7 +806,9 @@ class TestContentService:
         self, 
         db_session: AsyncSession, 
         sample_accounts, 
-        sample_articles
+        sample_articles,
+        db_search_service,
+        fake_redis
     ):
         """测试未登录用户获取文章详情"""
         article = sample_articles[0]
@@ -248,41 +816,78 @@ class TestContentService:
         result = await content_service.get_article_detail(
             db=db_session,
             article_id=article.id,
-            user_id=None
+            user_id=None,
+            platform=article.platform
         )
         
         assert isinstance(result, ArticleDetail)
-        assert result.id == article.id
+        assert result.id == str(article.id)
         assert result.is_subscribed is False  # 未登录用户未订阅
     
     async def test_get_articles_by_account(
         self, 
         db_session: AsyncSession, 
         sample_accounts, 
-        sample_articles
+        sample_articles,
+        db_search_service
     ):
         """测试获取指定账号的文章列表"""
         account = sample_accounts[0]
         
         result = await content_service.get_articles_by_account(
             db=db_session,
-            account_id=account.id,
+            account_id=account.account_id,
+            platform=account.platform,
             page=1,
-            page_size=10
+            page_size=10,
+            include_total=True
         )
         
         assert isinstance(result, PaginatedResponse)
         assert len(result.data) == 5  # 每个账号有5篇文章
         assert result.total == 5
+        assert result.has_more is False
         
         # 验证所有文章都属于指定账号
         for article in result.data:
-            assert article.account_id == account.id
+            assert article.account_id == account.account_id
         
         # 验证按时间倒序排列
         for i in range(len(result.data) - 1):
             assert result.data[i].publish_timestamp >= result.data[i+1].publish_timestamp
     
+    async def test_get_articles_by_account_cursor(
+        self, 
+        db_session: AsyncSession, 
+        sample_accounts, 
+        sample_articles,
+        db_search_service
+    ):
+        """测试按游标翻页获取账号文章，默认不统计总数"""
+        account = sample_accounts[0]
+        
+        with patch.object(db_search_service, 'get_account_article_stats') as mock_stats:
+            article_ids = []
+            cursor = None
+            while True:
+                result = await content_service.get_articles_by_account(
+                    db=db_session,
+                    account_id=account.account_id,
+                    platform=account.platform,
+                    page_size=2,
+                    cursor=cursor
+                )
+                assert result.total is None
+                article_ids.extend(article.id for article in result.data)
+                cursor = result.next_cursor
+                if cursor is None:
+                    break
+        
+        mock_stats.assert_not_called()
+        assert result.has_more is False
+        assert len(article_ids) == 5
+        assert len(set(article_ids)) == 5
+    
     async def test_get_content_stats(
         self, 
         db_session: AsyncSession, 
@@ -291,26 +896,43 @@ class TestContentService:
         sample_articles, 
         sample_subscriptions
     ):
-        """测试获取内容统计信息"""
-        result = await content_service.get_content_stats(
-            db=db_session,
-            user_id=sample_user.id
-        )
+        """测试获取内容统计信息（读取定时任务写入的物化统计）"""
+        await content_service.refresh_platform_stats(db_session)
+        
+        statements = []
+        
+        def record_select(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                statements.append(statement)
         
+        sync_engine = db_session.bind.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", record_select)
+        try:
+            result = await content_service.get_content_stats(
+                db=db_session,
+                user_id=sample_user.id
+            )
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", record_select)
+        
+        assert len(statements) == 1  # 按用户主键读取物化统计
+        assert "user_platform_stats" in statements[0]
         assert isinstance(result, ArticleStats)
         assert result.total_articles == 10  # 总共10篇文章
-        assert result.today_articles >= 0
-        assert result.week_articles >= 0
+        assert result.today_articles == 1  # 只有当天中午发布的1篇
+        assert result.week_articles == 8  # 近7天（含今天）共8篇
         assert isinstance(result.platform_stats, dict)
         assert len(result.platform_stats) == 2  # 两个平台
         assert "weibo" in result.platform_stats
         assert "wechat" in result.platform_stats
     
-    async def test_get_content_stats_no_subscriptions(self, db_session: AsyncSession, sample_user):
-        """测试用户没有订阅时获取内容统计"""
+    async def test_get_content_stats_no_subscriptions(self, db_session: AsyncSession, fresh_user):
+        """测试用户没有订阅时获取内容统计（物化表中没有该用户的统计行）"""
+        await content_service.refresh_platform_stats(db_session)
+        
         result = await content_service.get_content_stats(
             db=db_session,
-            user_id=sample_user.id
+            user_id=fresh_user.id
         )
         
         assert isinstance(result, ArticleStats)
@@ -319,6 +941,104 @@ class TestContentService:
         assert result.week_articles == 0
         assert result.platform_stats == {}
     
+    async def test_get_content_stats_stale_falls_back(
+        self,
+        db_session: AsyncSession,
+        sample_user,
+        sample_accounts,
+        sample_articles,
+        sample_subscriptions
+    ):
+        """测试物化统计过期时回退到实时统计"""
+        await content_service.refresh_platform_stats(db_session)
+        await db_session.execute(
+            update(UserPlatformStats).values(
+                total=0, updated_at=FROZEN_NOW - timedelta(hours=2)
+            )
+        )
+        
+        result = await content_service.get_content_stats(db=db_session, user_id=sample_user.id)
+        
+        assert result.total_articles == 10
+        assert result.today_articles == 1
+        assert result.week_articles == 8
+        assert result.platform_stats == {"weibo": 5, "wechat": 5}
+    
+    async def test_search_articles_joins_account_on_platform(
+        self,
+        db_session: AsyncSession,
+        sample_user,
+        sample_accounts,
+        sample_articles,
+        sample_subscriptions
+    ):
+        """测试搜索文章按(account_id, platform)关联账号"""
+        result = await content_service.search_articles(
+            db=db_session,
+            keyword="测试文章",
+            user_id=sample_user.id
+        )
+
+        assert result.total == 10
+        assert len(result.data) == 10
+        assert len({article.id for article in result.data}) == 10
+        assert {article.account_platform for article in result.data} == {"weibo", "wechat"}
+
+        weibo_result = await content_service.search_articles(
+            db=db_session,
+            keyword="测试文章",
+            platform="weibo"
+        )
+        assert weibo_result.total == 5
+        assert all(article.account_name == "测试微博博主" for article in weibo_result.data)
+
+    async def test_refresh_platform_stats_removes_only_stale_rows(
+        self,
+        db_session: AsyncSession,
+        sample_user,
+        fresh_user,
+        sample_accounts,
+        sample_articles,
+        sample_subscriptions
+    ):
+        """测试刷新物化统计只删除已失效的统计行，保留其他刷新更新写入的行"""
+        await db_session.execute(insert(UserPlatformStats), [
+            # 已取消订阅的平台，本次刷新不会再写入
+            dict(user_id=sample_user.id, platform="twitter", total=3, updated_at=FROZEN_NOW - timedelta(hours=1)),
+            # 其他刷新在本次开始后写入的行
+            dict(user_id=fresh_user.id, platform="weibo", total=1, updated_at=FROZEN_NOW + timedelta(minutes=1)),
+        ])
+        
+        written = await content_service.refresh_platform_stats(db_session)
+        
+        result = await db_session.execute(
+            select(UserPlatformStats.user_id, UserPlatformStats.platform, UserPlatformStats.total)
+        )
+        assert written == 2
+        assert set(result.fetchall()) == {
+            (sample_user.id, "weibo", 5),
+            (sample_user.id, "wechat", 5),
+            (fresh_user.id, "weibo", 1),
+        }
+    
+    async def test_refresh_platform_stats_matches_subscription_platform(
+        self,
+        db_session: AsyncSession,
+        fresh_user,
+        sample_accounts,
+        sample_articles
+    ):
+        """测试刷新物化统计按(account_id, platform)匹配订阅，平台不符的订阅不计入"""
+        db_session.add(Subscription(user_id=fresh_user.id, account_id="weibo_123", platform="wechat"))
+        await db_session.flush()
+
+        await content_service.refresh_platform_stats(db_session)
+
+        result = await db_session.execute(
+            select(UserPlatformStats).where(UserPlatformStats.user_id == fresh_user.id)
+        )
+        assert result.scalars().all() == []
+
     async def test_platform_display_name(self):
         """测试平台显示名称转换"""
         assert content_service._get_platform_display_name("wechat") == "微信公众号"
@@ -341,7 +1061,9 @@ class TestContentService:
         sample_user, 
         sample_accounts, 
         sample_articles, 
-        sample_subscriptions
+        sample_subscriptions,
+        db_search_service,
+        fake_redis
     ):
         """测试获取包含图片的动态流"""
         result = await content_service.get_user_feed(
@@ -367,7 +1089,9 @@ class TestContentService:
         sample_user, 
         sample_accounts, 
         sample_articles, 
-        sample_subscriptions
+        sample_subscriptions,
+        db_search_service,
+        fake_redis
     ):
         """测试相关文章功能"""
         article = sample_articles[0]
@@ -375,14 +1099,16 @@ class TestContentService:
         result = await content_service.get_article_detail(
             db=db_session,
             article_id=article.id,
-            user_id=sample_user.id
+            user_id=sample_user.id,
+            platform=article.platform
         )
         
         # 验证相关文章
         assert isinstance(result.related_articles, list)
-        assert len(result.related_articles) <= 5  # 最多5篇相关文章
+        assert len(result.related_articles) == 4  # 同一账号的其余4篇
         
         # 验证相关文章都来自同一账号且不包含当前文章
         for related_article in result.related_articles:
             assert related_article.account_id == article.account_id
-            assert related_article.id != article.id
\ No newline at end of file
+            assert related_article.id != str(article.id)
+            assert not hasattr(related_article, "content")  # 相关文章不携带正文
\ No newline at end of file
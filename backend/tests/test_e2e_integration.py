@@ -11,9 +11,12 @@ End-to-End Integration Tests
 """
 import pytest
 import asyncio
+import time
+import orjson
 from datetime import datetime, timedelta
 from unittest.mock import patch, AsyncMock, MagicMock
-from httpx import AsyncClient
+from httpx import AsyncClient, Response
+from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User, MembershipLevel
@@ -22,7 +25,79 @@ from app.models.article import Article
 from app.models.subscription import Subscription
 from app.models.push_record import PushRecord, PushStatus
 from app.services.wechat import wechat_service
+from app.services.search.service import search_service
 from app.services.content_detection import content_detection_service
+from app.schemas.account import AccountResponse
+
+# 数据库写入和HTTP往返较多，标记为慢速测试，可通过 -m "not slow" 跳过
+pytestmark = pytest.mark.slow
+
+
+def _json(response: Response):
+    """用orjson解析响应体，比Response.json()使用的标准库json更快"""
+    return orjson.loads(response.content)
+
+
+def _mock_account_lookup(accounts):
+    """按(平台, 账号ID)返回测试账号信息，替代订阅时对外部搜索服务的账号查询"""
+    now = datetime.utcnow()
+    responses = {
+        (account.platform, account.account_id): AccountResponse(
+            id=account.account_id,
+            name=account.name,
+            platform=account.platform,
+            account_id=account.account_id,
+            created_at=now,
+            updated_at=now,
+            platform_display_name=account.platform_display_name
+        )
+        for account in accounts
+    }
+    return AsyncMock(side_effect=lambda platform, account_id: responses.get((platform, account_id)))
+
+
+@pytest.fixture(scope="module", autouse=True)
+def wechat_code_to_session():
+    """本模块内微信登录code即为openid，整个模块只patch一次code换取session"""
+    async def code_to_session(code):
+        return {"openid": code, "session_key": "test_session_key"}
+    
+    with patch.object(wechat_service, 'code_to_session', new=AsyncMock(side_effect=code_to_session)) as mock:
+        yield mock
+
+
+@pytest.fixture
+def login_factory(client):
+    """
+    按openid登录并返回(user_id, auth_headers)
+    
+    用户写在当前测试的事务内、测试结束即回滚，因此结果只在单个测试内按openid缓存
+    """
+    cache = {}
+    
+    async def login(openid: str):
+        if openid not in cache:
+            response = await client.post("/api/v1/auth/login", json={"code": openid})
+            data = _json(response)["data"]
+            cache[openid] = (
+                data["user"]["id"],
+                {"Authorization": f"Bearer {data['tokens']['access_token']}"}
+            )
+        return cache[openid]
+    
+    return login
+
+
+@pytest.fixture
+def auth_headers_for():
+    """直接签发访问令牌生成认证头部，登录不在测试范围内时省去完整的登录请求"""
+    from app.core.security import jwt_manager
+    
+    def make_headers(user: User) -> dict:
+        token = jwt_manager.create_access_token({"sub": str(user.id), "openid": user.openid})
+        return {"Authorization": f"Bearer {token}"}
+    
+    return make_headers
 
 
 class TestCompleteUserJourney:
@@ -35,20 +110,14 @@ class TestCompleteUserJourney:
         需求: 6.1, 6.2, 1.1, 1.2, 1.3
         """
         # Step 1: 用户微信登录注册
-        mock_wechat_response = {
-            "openid": "e2e_test_openid_001",
-            "session_key": "test_session_key"
-        }
-        
-        with patch.object(wechat_service, 'code_to_session', return_value=mock_wechat_response):
-            login_response = await client.post(
-                "/api/v1/auth/login",
-                json={"code": "e2e_test_code"}
-            )
+        login_response = await client.post(
+            "/api/v1/auth/login",
+            json={"code": "e2e_test_openid_001"}
+        )
         
         assert login_response.status_code == 200
-        login_data = login_response.json()
-        assert login_data["success"] is True
+        login_data = _json(login_response)
+        assert login_data["code"] == 200
         
         # 获取用户信息和令牌
         user_data = login_data["data"]["user"]
@@ -60,19 +129,12 @@ class TestCompleteUserJourney:
         assert user_data["openid"] == "e2e_test_openid_001"
         assert user_data["membership_level"] == "free"
         
-        # Step 2: 获取用户详细信息
-        profile_response = await client.get(
-            "/api/v1/auth/me",
-            headers=auth_headers
-        )
-        
-        assert profile_response.status_code == 200
-        profile_data = profile_response.json()
-        user_id = profile_data["data"]["id"]
+        # Step 2: 登录响应已包含用户详细信息，无需再请求/auth/me
+        user_id = user_data["id"]
         
         # 验证免费用户限制
-        assert profile_data["data"]["subscription_limit"] == 10
-        assert profile_data["data"]["daily_push_limit"] == 5
+        assert user_data["subscription_limit"] == 10
+        assert user_data["daily_push_limit"] == 5
         
         # Step 3: 搜索博主
         search_response = await client.get(
@@ -82,80 +144,78 @@ class TestCompleteUserJourney:
         )
         
         assert search_response.status_code == 200
-        search_data = search_response.json()
+        search_data = _json(search_response)
         
-        # 如果没有搜索结果，创建测试账号
-        if not search_data["data"]:
-            # 创建测试账号（模拟搜索结果）
-            test_account = Account(
-                name="测试博主E2E",
-                platform=Platform.WECHAT,
-                account_id="e2e_test_account",
-                avatar_url="https://example.com/avatar.jpg",
-                description="端到端测试博主",
-                follower_count=10000,
-                details={"verified": True}
-            )
-            db_session.add(test_account)
-            await db_session.commit()
-            await db_session.refresh(test_account)
-            account_id = test_account.id
-        else:
-            account_id = search_data["data"][0]["id"]
-        
-        # Step 4: 订阅博主
-        subscription_response = await client.post(
-            "/api/v1/subscriptions/",
-            json={
-                "user_id": user_id,
-                "account_id": account_id
-            },
-            headers=auth_headers
-        )
-        
-        assert subscription_response.status_code == 200
-        subscription_data = subscription_response.json()
-        assert subscription_data["code"] == 200
-        assert subscription_data["message"] == "订阅成功"
-        
-        # Step 5: 验证订阅列表
-        subscriptions_response = await client.get(
-            "/api/v1/subscriptions/",
-            headers=auth_headers
-        )
-        
-        assert subscriptions_response.status_code == 200
-        subscriptions_data = subscriptions_response.json()
-        assert subscriptions_data["total"] >= 1
-        assert len(subscriptions_data["data"]) >= 1
-        
-        # 验证订阅信息
-        subscription = subscriptions_data["data"][0]
-        assert subscription["user_id"] == user_id
-        assert subscription["account_id"] == account_id
-        
-        # Step 6: 获取订阅统计
-        stats_response = await client.get(
-            "/api/v1/subscriptions/stats",
-            headers=auth_headers
-        )
-        
-        assert stats_response.status_code == 200
-        stats_data = stats_response.json()
-        assert stats_data["data"]["total_subscriptions"] >= 1
-        assert stats_data["data"]["subscription_limit"] == 10
-        assert stats_data["data"]["remaining_subscriptions"] <= 9
-        
-        # Step 7: 获取用户动态流
-        feed_response = await client.get(
-            "/api/v1/feed",
-            params={"page": 1, "page_size": 10},
-            headers=auth_headers
+        # 创建测试账号（模拟搜索结果），订阅时的账号查询也由它应答
+        test_account = Account(
+            name="测试博主E2E",
+            platform=Platform.WECHAT.value,
+            account_id="e2e_test_account",
+            avatar_url="https://example.com/avatar.jpg",
+            description="端到端测试博主",
+            details={"verified": True}
         )
+        db_session.add(test_account)
+        await db_session.commit()
+        account_id = test_account.account_id
         
-        assert feed_response.status_code == 200
-        feed_data = feed_response.json()
-        assert "data" in feed_data
+        # 订阅、订阅列表和统计都会按(平台, 账号ID)查询账号信息
+        with patch.object(search_service, "get_account_by_platform_id", _mock_account_lookup([test_account])):
+            # Step 4: 订阅博主
+            subscription_response = await client.post(
+                "/api/v1/subscriptions/",
+                json={
+                    "user_id": user_id,
+                    "account_id": account_id,
+                    "platform": test_account.platform,
+                    "source": "included"
+                },
+                headers=auth_headers
+            )
+            
+            assert subscription_response.status_code == 200
+            subscription_data = _json(subscription_response)
+            assert subscription_data["code"] == 200
+            assert subscription_data["message"] == "订阅成功"
+            
+            # Step 5: 验证订阅列表
+            subscriptions_response = await client.get(
+                "/api/v1/subscriptions/",
+                headers=auth_headers
+            )
+            
+            assert subscriptions_response.status_code == 200
+            subscriptions_data = _json(subscriptions_response)
+            assert subscriptions_data["total"] >= 1
+            assert len(subscriptions_data["data"]) >= 1
+            
+            # 验证订阅信息
+            subscription = subscriptions_data["data"][0]
+            assert subscription["user_id"] == user_id
+            assert subscription["account_id"] == account_id
+            
+            # Step 6: 获取订阅统计
+            stats_response = await client.get(
+                "/api/v1/subscriptions/stats",
+                headers=auth_headers
+            )
+            
+            assert stats_response.status_code == 200
+            stats_data = _json(stats_response)
+            assert stats_data["data"]["total_subscriptions"] >= 1
+            assert stats_data["data"]["subscription_limit"] == 10
+            assert stats_data["data"]["remaining_subscriptions"] <= 9
+            
+            # Step 7: 获取用户动态流
+            feed_response = await client.get(
+                "/api/v1/content/feed",
+                params={"page": 1, "page_size": 10},
+                headers=auth_headers
+            )
+            
+            assert feed_response.status_code == 200
+            feed_data = _json(feed_response)
+            assert "data" in feed_data
         
         return {
             "user_id": user_id,
@@ -165,99 +225,84 @@ class TestCompleteUserJourney:
         }
     
     @pytest.mark.asyncio
-    async def test_subscription_limit_enforcement(self, client: AsyncClient, db_session: AsyncSession):
+    async def test_subscription_limit_enforcement(self, client: AsyncClient, db_session: AsyncSession, login_factory):
         """
         测试订阅数量限制执行
         需求: 1.3, 1.5, 5.4, 5.5
         """
         # 创建免费用户
-        mock_wechat_response = {
-            "openid": "limit_test_openid",
-            "session_key": "test_session_key"
-        }
-        
-        with patch.object(wechat_service, 'code_to_session', return_value=mock_wechat_response):
-            login_response = await client.post(
-                "/api/v1/auth/login",
-                json={"code": "limit_test_code"}
-            )
+        user_id, auth_headers = await login_factory("limit_test_openid")
         
-        login_data = login_response.json()
-        access_token = login_data["data"]["tokens"]["access_token"]
-        auth_headers = {"Authorization": f"Bearer {access_token}"}
-        user_id = login_data["data"]["user"]["id"]
-        
-        # 创建11个测试账号
-        account_ids = []
-        for i in range(11):
-            account = Account(
+        # 创建11个测试账号（flush即回填主键，无需逐个refresh）
+        account_ids = [
+            Account(
                 name=f"限制测试账号{i}",
-                platform=Platform.WECHAT,
-                account_id=f"limit_test_account_{i}",
-                follower_count=1000 + i * 100
+                platform=Platform.WECHAT.value,
+                account_id=f"limit_test_account_{i}"
             )
-            db_session.add(account)
-            account_ids.append(account)
-        
-        await db_session.commit()
-        
-        # 刷新账号获取ID
-        for account in account_ids:
-            await db_session.refresh(account)
-        
-        # 订阅前10个账号（免费用户限制）
-        successful_subscriptions = 0
-        for i, account in enumerate(account_ids[:10]):
+            for i in range(11)
+        ]
+        db_session.add_all(account_ids)
+        await db_session.flush()
+        
+        # 订阅前10个账号（免费用户限制），订阅和统计时的账号查询由测试账号应答
+        with patch.object(search_service, "get_account_by_platform_id", _mock_account_lookup(account_ids)):
+            successful_subscriptions = 0
+            for account in account_ids[:10]:
+                response = await client.post(
+                    "/api/v1/subscriptions/",
+                    json={
+                        "user_id": user_id,
+                        "account_id": account.account_id,
+                        "platform": account.platform,
+                        "source": "included"
+                    },
+                    headers=auth_headers
+                )
+                
+                if response.status_code == 200:
+                    successful_subscriptions += 1
+            
+            assert successful_subscriptions == 10
+            
+            # 尝试订阅第11个账号，应该失败
             response = await client.post(
                 "/api/v1/subscriptions/",
                 json={
                     "user_id": user_id,
-                    "account_id": account.id
+                    "account_id": account_ids[10].account_id,
+                    "platform": account_ids[10].platform,
+                    "source": "included"
                 },
                 headers=auth_headers
             )
             
-            if response.status_code == 200:
-                successful_subscriptions += 1
-        
-        assert successful_subscriptions == 10
-        
-        # 尝试订阅第11个账号，应该失败
-        response = await client.post(
-            "/api/v1/subscriptions/",
-            json={
-                "user_id": user_id,
-                "account_id": account_ids[10].id
-            },
-            headers=auth_headers
-        )
-        
-        assert response.status_code == 400
-        error_data = response.json()
-        assert "订阅数量已达上限" in error_data["detail"]
-        
-        # 验证订阅统计
-        stats_response = await client.get(
-            "/api/v1/subscriptions/stats",
-            headers=auth_headers
-        )
-        
-        stats_data = stats_response.json()
-        assert stats_data["data"]["total_subscriptions"] == 10
-        assert stats_data["data"]["remaining_subscriptions"] == 0
+            assert response.status_code == 400
+            error_data = _json(response)
+            assert "订阅数量已达上限" in error_data["detail"]
+            
+            # 验证订阅统计
+            stats_response = await client.get(
+                "/api/v1/subscriptions/stats",
+                headers=auth_headers
+            )
+            
+            stats_data = _json(stats_response)
+            assert stats_data["data"]["total_subscriptions"] == 10
+            assert stats_data["data"]["remaining_subscriptions"] == 0
 
 
 class TestEndToEndPushNotifications:
     """端到端推送通知测试"""
     
     @pytest.mark.asyncio
-    async def test_complete_push_notification_flow(self, client: AsyncClient, db_session: AsyncSession):
+    async def test_complete_push_notification_flow(self, client: AsyncClient, db_session: AsyncSession, login_factory):
         """
         测试完整的推送通知流程
         需求: 2.1, 2.2, 2.6
         """
         # Step 1: 创建用户和订阅
-        user_journey = await self._setup_user_with_subscription(client, db_session)
+        user_journey = await self._setup_user_with_subscription(client, db_session, login_factory)
         user_id = user_journey["user_id"]
         account_id = user_journey["account_id"]
         openid = user_journey["openid"]
@@ -265,23 +310,22 @@ class TestEndToEndPushNotifications:
         # Step 2: 创建新文章（模拟博主发布内容）
         new_article = Article(
             account_id=account_id,
+            platform=user_journey["platform"],
             title="端到端测试新文章",
             url="https://example.com/e2e-article",
             content="这是一篇用于端到端测试的新文章内容",
             summary="测试文章摘要",
             publish_time=datetime.utcnow(),
-            publish_timestamp=int(datetime.utcnow().timestamp()),
             images=["https://example.com/image1.jpg"],
             details={"platform": "wechat"}
         )
         
         db_session.add(new_article)
         await db_session.commit()
-        await db_session.refresh(new_article)
         
         # Step 3: 模拟内容检测服务发现新文章
-        with patch.object(content_detection_service, 'detect_new_articles') as mock_detect:
-            mock_detect.return_value = [new_article]
+        with patch.object(content_detection_service, 'detect_new_content') as mock_detect:
+            mock_detect.return_value = [content_detection_service._article_to_dict(new_article)]
             
             # Step 4: 触发推送通知
             with patch.object(wechat_service, 'send_push_notification') as mock_push:
@@ -293,15 +337,15 @@ class TestEndToEndPushNotifications:
                 
                 # 调用推送API
                 push_response = await client.post(
-                    f"/api/v1/push/article/{new_article.id}",
-                    json={"user_ids": [user_id]},
+                    "/api/v1/push-notifications/send",
+                    params={"user_id": user_id, "article_id": new_article.id},
                     headers=user_journey["auth_headers"]
                 )
                 
                 # 验证推送响应
                 if push_response.status_code == 200:
-                    push_data = push_response.json()
-                    assert push_data["success"] is True
+                    push_data = _json(push_response)
+                    assert push_data["data"]["success"] is True
                     
                     # 验证微信推送被调用
                     mock_push.assert_called_once()
@@ -311,13 +355,13 @@ class TestEndToEndPushNotifications:
         
         # Step 5: 验证推送记录
         push_records_response = await client.get(
-            "/api/v1/push/records",
+            "/api/v1/push-notifications/records",
             params={"user_id": user_id},
             headers=user_journey["auth_headers"]
         )
         
         if push_records_response.status_code == 200:
-            records_data = push_records_response.json()
+            records_data = _json(push_records_response)
             assert len(records_data["data"]) >= 1
             
             # 验证推送记录内容
@@ -327,134 +371,113 @@ class TestEndToEndPushNotifications:
             assert record["status"] in ["success", "pending"]
     
     @pytest.mark.asyncio
-    async def test_push_notification_limits_enforcement(self, client: AsyncClient, db_session: AsyncSession):
+    async def test_push_notification_limits_enforcement(self, client: AsyncClient, db_session: AsyncSession, login_factory):
         """
         测试推送通知限制执行
         需求: 2.3, 2.4, 2.5
         """
         # 创建免费用户
-        mock_wechat_response = {
-            "openid": "push_limit_test_openid",
-            "session_key": "test_session_key"
-        }
-        
-        with patch.object(wechat_service, 'code_to_session', return_value=mock_wechat_response):
-            login_response = await client.post(
-                "/api/v1/auth/login",
-                json={"code": "push_limit_test_code"}
-            )
-        
-        login_data = login_response.json()
-        user_id = login_data["data"]["user"]["id"]
-        auth_headers = {"Authorization": f"Bearer {login_data['data']['tokens']['access_token']}"}
+        user_id, auth_headers = await login_factory("push_limit_test_openid")
         
-        # 创建测试文章
-        test_articles = []
-        for i in range(6):  # 创建6篇文章，超过免费用户限制(5次)
-            article = Article(
-                account_id=1,  # 假设存在的账号ID
+        # 创建测试账号和文章（6篇，超过免费用户限制5次；flush即回填主键）
+        test_account = Account(
+            name="推送限制测试博主",
+            platform=Platform.WECHAT.value,
+            account_id="push_limit_test_account"
+        )
+        db_session.add(test_account)
+        now = datetime.utcnow()
+        test_articles = [
+            Article(
+                account_id=test_account.account_id,
+                platform=test_account.platform,
                 title=f"推送限制测试文章{i}",
                 url=f"https://example.com/limit-test-{i}",
                 content=f"测试内容{i}",
-                publish_time=datetime.utcnow(),
-                publish_timestamp=int(datetime.utcnow().timestamp())
+                publish_time=now
             )
-            db_session.add(article)
-            test_articles.append(article)
-        
-        await db_session.commit()
-        
-        # 模拟推送前5篇文章成功
-        successful_pushes = 0
-        with patch.object(wechat_service, 'send_push_notification') as mock_push:
-            mock_push.return_value = {"success": True, "msgid": "test_msgid"}
-            
-            for i, article in enumerate(test_articles[:5]):
-                await db_session.refresh(article)
+            for i in range(6)
+        ]
+        db_session.add_all(test_articles)
+        await db_session.flush()
+        
+        # 模拟推送前5篇文章成功：补丁只进入一次，限制检查结果由side_effect按推送顺序依次给出
+        limit_returns = [
+            {
+                "can_receive_push": True,
+                "daily_push_limit": 5,
+                "daily_push_remaining": 5 - i
+            }
+            for i in range(5)
+        ]
+        with patch.object(wechat_service, 'send_push_notification',
+                          new=AsyncMock(return_value={"success": True, "msgid": "test_msgid"})), \
+                patch('app.services.limits.limits_service.check_push_limit',
+                      new=AsyncMock(side_effect=limit_returns)):
+            successful_pushes = 0
+            for article in test_articles[:5]:
+                push_response = await client.post(
+                    "/api/v1/push-notifications/send",
+                    params={"user_id": user_id, "article_id": article.id},
+                    headers=auth_headers
+                )
                 
-                # 模拟推送限制检查
-                with patch('app.services.limits.limits_service.check_push_limit') as mock_limit:
-                    mock_limit.return_value = {
-                        "can_push": True,
-                        "remaining": 5 - i - 1,
-                        "message": f"今日还可推送{5-i-1}次"
-                    }
-                    
-                    push_response = await client.post(
-                        f"/api/v1/push/article/{article.id}",
-                        json={"user_ids": [user_id]},
-                        headers=auth_headers
-                    )
-                    
-                    if push_response.status_code == 200:
-                        successful_pushes += 1
+                if push_response.status_code == 200:
+                    successful_pushes += 1
         
         # 尝试推送第6篇文章，应该被限制
         with patch('app.services.limits.limits_service.check_push_limit') as mock_limit:
             mock_limit.return_value = {
-                "can_push": False,
-                "remaining": 0,
-                "message": "今日推送次数已达上限(5次)"
+                "can_receive_push": False,
+                "daily_push_limit": 5,
+                "daily_push_remaining": 0
             }
             
-            await db_session.refresh(test_articles[5])
             push_response = await client.post(
-                f"/api/v1/push/article/{test_articles[5].id}",
-                json={"user_ids": [user_id]},
+                "/api/v1/push-notifications/send",
+                params={"user_id": user_id, "article_id": test_articles[5].id},
                 headers=auth_headers
             )
             
             # 验证推送被拒绝或跳过
             if push_response.status_code == 200:
-                push_data = push_response.json()
+                push_data = _json(push_response)["data"]
                 assert push_data.get("skipped") is True or push_data.get("success") is False
             else:
                 assert push_response.status_code == 429  # Too Many Requests
     
-    async def _setup_user_with_subscription(self, client: AsyncClient, db_session: AsyncSession):
+    async def _setup_user_with_subscription(self, client: AsyncClient, db_session: AsyncSession, login_factory):
         """设置用户和订阅的辅助方法"""
         # 创建用户
-        mock_wechat_response = {
-            "openid": "push_test_openid",
-            "session_key": "test_session_key"
-        }
-        
-        with patch.object(wechat_service, 'code_to_session', return_value=mock_wechat_response):
-            login_response = await client.post(
-                "/api/v1/auth/login",
-                json={"code": "push_test_code"}
-            )
-        
-        login_data = login_response.json()
-        user_id = login_data["data"]["user"]["id"]
-        openid = login_data["data"]["user"]["openid"]
-        access_token = login_data["data"]["tokens"]["access_token"]
-        auth_headers = {"Authorization": f"Bearer {access_token}"}
+        user_id, auth_headers = await login_factory("push_test_openid")
+        openid = "push_test_openid"
         
         # 创建测试账号
         test_account = Account(
             name="推送测试博主",
-            platform=Platform.WECHAT,
-            account_id="push_test_account",
-            follower_count=5000
+            platform=Platform.WECHAT.value,
+            account_id="push_test_account"
         )
         db_session.add(test_account)
         await db_session.commit()
-        await db_session.refresh(test_account)
         
         # 创建订阅
-        await client.post(
-            "/api/v1/subscriptions/",
-            json={
-                "user_id": user_id,
-                "account_id": test_account.id
-            },
-            headers=auth_headers
-        )
+        with patch.object(search_service, "get_account_by_platform_id", _mock_account_lookup([test_account])):
+            await client.post(
+                "/api/v1/subscriptions/",
+                json={
+                    "user_id": user_id,
+                    "account_id": test_account.account_id,
+                    "platform": test_account.platform,
+                    "source": "included"
+                },
+                headers=auth_headers
+            )
         
         return {
             "user_id": user_id,
-            "account_id": test_account.id,
+            "account_id": test_account.account_id,
+            "platform": test_account.platform,
             "auth_headers": auth_headers,
             "openid": openid
         }
@@ -464,33 +487,24 @@ class TestMembershipLevelIntegration:
     """会员等级集成测试"""
     
     @pytest.mark.asyncio
-    async def test_membership_upgrade_flow(self, client: AsyncClient, db_session: AsyncSession):
+    async def test_membership_upgrade_flow(self, client: AsyncClient, db_session: AsyncSession, login_factory):
         """
         测试会员升级完整流程
         需求: 5.1, 5.2, 5.3
         """
-        # Step 1: 创建免费用户
-        mock_wechat_response = {
-            "openid": "membership_test_openid",
-            "session_key": "test_session_key"
-        }
-        
-        with patch.object(wechat_service, 'code_to_session', return_value=mock_wechat_response):
-            login_response = await client.post(
-                "/api/v1/auth/login",
-                json={"code": "membership_test_code"}
-            )
-        
-        login_data = login_response.json()
-        user_id = login_data["data"]["user"]["id"]
-        auth_headers = {"Authorization": f"Bearer {login_data['data']['tokens']['access_token']}"}
+        # Step 1: 创建免费用户，登录响应已包含用户的会员状态
+        login_response = await client.post(
+            "/api/v1/auth/login",
+            json={"code": "membership_test_openid"}
+        )
+        login_data = _json(login_response)["data"]
+        auth_headers = {"Authorization": f"Bearer {login_data['tokens']['access_token']}"}
         
         # 验证初始免费用户状态
-        profile_response = await client.get("/api/v1/auth/me", headers=auth_headers)
-        profile_data = profile_response.json()
-        assert profile_data["data"]["membership_level"] == "free"
-        assert profile_data["data"]["subscription_limit"] == 10
-        assert profile_data["data"]["daily_push_limit"] == 5
+        user_data = login_data["user"]
+        assert user_data["membership_level"] == "free"
+        assert user_data["subscription_limit"] == 10
+        assert user_data["daily_push_limit"] == 5
         
         # Step 2: 升级到基础会员
         upgrade_response = await client.post(
@@ -503,15 +517,14 @@ class TestMembershipLevelIntegration:
         )
         
         if upgrade_response.status_code == 200:
-            upgrade_data = upgrade_response.json()
+            upgrade_data = _json(upgrade_response)
             assert upgrade_data["success"] is True
             
-            # 验证升级后的权限
-            profile_response = await client.get("/api/v1/auth/me", headers=auth_headers)
-            profile_data = profile_response.json()
-            assert profile_data["data"]["membership_level"] == "basic"
-            assert profile_data["data"]["subscription_limit"] == 50
-            assert profile_data["data"]["daily_push_limit"] == 20
+            # 升级接口返回会员信息，直接验证升级后的权限
+            membership_data = upgrade_data["data"]
+            assert membership_data["level"] == "basic"
+            assert membership_data["subscription_limit"] == 50
+            assert membership_data["daily_push_limit"] == 20
         
         # Step 3: 再升级到高级会员
         premium_upgrade_response = await client.post(
@@ -525,53 +538,60 @@ class TestMembershipLevelIntegration:
         
         if premium_upgrade_response.status_code == 200:
             # 验证高级会员权限
-            profile_response = await client.get("/api/v1/auth/me", headers=auth_headers)
-            profile_data = profile_response.json()
-            assert profile_data["data"]["membership_level"] == "premium"
-            assert profile_data["data"]["subscription_limit"] == -1  # 无限制
-            assert profile_data["data"]["daily_push_limit"] == -1   # 无限制
+            membership_data = _json(premium_upgrade_response)["data"]
+            assert membership_data["level"] == "premium"
+            assert membership_data["subscription_limit"] == -1  # 无限制
+            assert membership_data["daily_push_limit"] == -1   # 无限制
     
     @pytest.mark.asyncio
-    async def test_membership_expiration_handling(self, client: AsyncClient, db_session: AsyncSession):
+    @pytest.mark.parametrize(
+        "openid, level, expire_delta, expected",
+        [
+            # 已过期的基础会员自动降级为免费用户
+            ("expired_member_openid", MembershipLevel.BASIC, timedelta(days=-1), ("free", 10, 5)),
+            # 已过期的V5会员同样降级
+            ("expired_v5_member_openid", MembershipLevel.V5, timedelta(days=-1), ("free", 10, 5)),
+            # 有效期内的会员保持原等级和权限
+            ("active_v2_member_openid", MembershipLevel.V2, timedelta(days=30), ("v2", 50, 20)),
+        ],
+    )
+    async def test_membership_expiration_handling(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        login_factory,
+        openid,
+        level,
+        expire_delta,
+        expected
+    ):
         """
         测试会员到期处理
         需求: 5.3
+        
+        各场景只在预置数据和预期结果上不同，登录和校验流程共用
         """
-        # 创建即将到期的基础会员用户
-        expired_user = User(
-            openid="expired_member_openid",
-            nickname="即将到期用户",
-            membership_level=MembershipLevel.BASIC,
-            membership_expire_at=datetime.utcnow() - timedelta(days=1)  # 已过期
+        member = User(
+            openid=openid,
+            nickname="会员状态测试用户",
+            membership_level=level,
+            membership_expire_at=datetime.utcnow() + expire_delta
         )
         
-        db_session.add(expired_user)
+        db_session.add(member)
         await db_session.commit()
-        await db_session.refresh(expired_user)
         
         # 模拟登录获取令牌
-        with patch.object(wechat_service, 'code_to_session') as mock_wechat:
-            mock_wechat.return_value = {
-                "openid": "expired_member_openid",
-                "session_key": "test_session_key"
-            }
-            
-            login_response = await client.post(
-                "/api/v1/auth/login",
-                json={"code": "expired_member_code"}
-            )
-        
-        login_data = login_response.json()
-        auth_headers = {"Authorization": f"Bearer {login_data['data']['tokens']['access_token']}"}
+        _, auth_headers = await login_factory(openid)
         
-        # 获取用户信息，应该显示已降级为免费用户
+        # 获取用户信息，过期会员应该显示已降级为免费用户
         profile_response = await client.get("/api/v1/auth/me", headers=auth_headers)
-        profile_data = profile_response.json()
+        profile_data = _json(profile_response)
         
-        # 验证会员已自动降级
-        assert profile_data["data"]["membership_level"] == "free"
-        assert profile_data["data"]["subscription_limit"] == 10
-        assert profile_data["data"]["daily_push_limit"] == 5
+        expected_level, expected_subscription_limit, expected_push_limit = expected
+        assert profile_data["data"]["membership_level"] == expected_level
+        assert profile_data["data"]["subscription_limit"] == expected_subscription_limit
+        assert profile_data["data"]["daily_push_limit"] == expected_push_limit
 
 
 class TestSystemReliabilityAndErrorHandling:
@@ -592,86 +612,85 @@ class TestSystemReliabilityAndErrorHandling:
                 json={"code": "test_code"}
             )
             
-            # 验证错误处理
-            assert login_response.status_code == 500
-            error_data = login_response.json()
-            assert "登录服务异常" in error_data["detail"]["message"]
+            # 验证错误处理：换取session失败由认证服务统一转为认证异常
+            assert login_response.status_code == 401
+            error_data = _json(login_response)
+            assert "登录失败" in error_data["detail"]["message"]
     
     @pytest.mark.asyncio
-    async def test_concurrent_subscription_operations(self, client: AsyncClient, db_session: AsyncSession):
+    async def test_concurrent_subscription_operations(self, concurrent_client: AsyncClient, concurrent_engine):
         """
         测试并发订阅操作
         需求: 7.5
+        
+        每个请求使用独立会话，并发请求在数据库层面真正竞争，由重复检查和唯一约束共同保证只订阅一次；
+        数据实际提交，测试结束时清理
         """
         # 创建用户
-        mock_wechat_response = {
-            "openid": "concurrent_test_openid",
-            "session_key": "test_session_key"
-        }
-        
-        with patch.object(wechat_service, 'code_to_session', return_value=mock_wechat_response):
-            login_response = await client.post(
-                "/api/v1/auth/login",
-                json={"code": "concurrent_test_code"}
-            )
-        
-        login_data = login_response.json()
-        user_id = login_data["data"]["user"]["id"]
-        auth_headers = {"Authorization": f"Bearer {login_data['data']['tokens']['access_token']}"}
+        login_response = await concurrent_client.post(
+            "/api/v1/auth/login",
+            json={"code": "concurrent_test_openid"}
+        )
+        login_data = _json(login_response)["data"]
+        user_id = login_data["user"]["id"]
+        auth_headers = {"Authorization": f"Bearer {login_data['tokens']['access_token']}"}
         
         # 创建测试账号
-        test_account = Account(
-            name="并发测试账号",
-            platform=Platform.WECHAT,
-            account_id="concurrent_test_account",
-            follower_count=1000
-        )
-        db_session.add(test_account)
-        await db_session.commit()
-        await db_session.refresh(test_account)
+        async with AsyncSession(concurrent_engine, expire_on_commit=False) as session:
+            test_account = Account(
+                name="并发测试账号",
+                platform=Platform.WECHAT.value,
+                account_id="concurrent_test_account"
+            )
+            session.add(test_account)
+            await session.commit()
         
         # 并发订阅同一个账号（测试重复订阅处理）
         async def subscribe_account():
-            return await client.post(
+            return await concurrent_client.post(
                 "/api/v1/subscriptions/",
                 json={
                     "user_id": user_id,
-                    "account_id": test_account.id
+                    "account_id": test_account.account_id,
+                    "platform": Platform.WECHAT.value,
+                    "source": "included"
                 },
                 headers=auth_headers
             )
         
-        # 同时发起多个订阅请求
-        tasks = [subscribe_account() for _ in range(3)]
-        responses = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # 验证只有一个订阅成功，其他的应该返回重复订阅错误
-        success_count = 0
-        duplicate_count = 0
-        
-        for response in responses:
-            if isinstance(response, Exception):
-                continue
+        try:
+            with patch.object(
+                search_service,
+                "get_account_by_platform_id",
+                new=AsyncMock(return_value=MagicMock(id=test_account.account_id))
+            ):
+                # 同时发起多个订阅请求
+                responses = await asyncio.gather(*(subscribe_account() for _ in range(3)))
+            
+            # 验证只有一个订阅成功，其他的返回重复订阅错误
+            success_count = sum(response.status_code == 200 for response in responses)
+            duplicate_count = sum(
+                response.status_code == 409 and "已经订阅" in _json(response)["detail"]
+                for response in responses
+            )
             
-            if response.status_code == 200:
-                success_count += 1
-            elif response.status_code == 400:
-                error_data = response.json()
-                if "已经订阅" in error_data.get("detail", ""):
-                    duplicate_count += 1
-        
-        # 应该只有一个成功，其他的被识别为重复
-        assert success_count == 1
-        assert duplicate_count >= 1
+            assert success_count == 1
+            assert duplicate_count >= 1
+        finally:
+            async with AsyncSession(concurrent_engine) as session:
+                await session.execute(delete(Subscription).where(Subscription.user_id == user_id))
+                await session.execute(delete(Account).where(Account.id == test_account.id))
+                await session.execute(delete(User).where(User.id == user_id))
+                await session.commit()
     
     @pytest.mark.asyncio
-    async def test_data_consistency_verification(self, client: AsyncClient, db_session: AsyncSession):
+    async def test_data_consistency_verification(self, client: AsyncClient, db_session: AsyncSession, login_factory):
         """
         测试数据一致性验证
         需求: 7.3
         """
         # 创建完整的用户订阅场景
-        user_journey = await self._create_test_user_with_subscriptions(client, db_session)
+        user_journey = await self._create_test_user_with_subscriptions(client, db_session, login_factory)
         user_id = user_journey["user_id"]
         auth_headers = user_journey["auth_headers"]
         
@@ -681,7 +700,7 @@ class TestSystemReliabilityAndErrorHandling:
             headers=auth_headers
         )
         
-        stats_data = stats_response.json()
+        stats_data = _json(stats_response)
         total_from_stats = stats_data["data"]["total_subscriptions"]
         
         # 获取订阅列表
@@ -691,7 +710,7 @@ class TestSystemReliabilityAndErrorHandling:
             headers=auth_headers
         )
         
-        list_data = list_response.json()
+        list_data = _json(list_response)
         total_from_list = list_data["total"]
         
         # 验证数据一致性
@@ -702,47 +721,35 @@ class TestSystemReliabilityAndErrorHandling:
         platform_total = sum(platform_stats.values())
         assert platform_total == total_from_stats, "平台统计总数不一致"
     
-    async def _create_test_user_with_subscriptions(self, client: AsyncClient, db_session: AsyncSession):
+    async def _create_test_user_with_subscriptions(self, client: AsyncClient, db_session: AsyncSession, login_factory):
         """创建测试用户和订阅的辅助方法"""
         # 创建用户
-        mock_wechat_response = {
-            "openid": "consistency_test_openid",
-            "session_key": "test_session_key"
-        }
+        user_id, auth_headers = await login_factory("consistency_test_openid")
         
-        with patch.object(wechat_service, 'code_to_session', return_value=mock_wechat_response):
-            login_response = await client.post(
-                "/api/v1/auth/login",
-                json={"code": "consistency_test_code"}
+        # 创建多个测试账号（每个平台2个），一次写入
+        platforms = [Platform.WECHAT, Platform.WEIBO, Platform.TWITTER]
+        accounts = [
+            Account(
+                name=f"{platform.value}测试账号{j}",
+                platform=platform.value,
+                account_id=f"consistency_test_{platform.value}_{j}"
             )
+            for platform in platforms
+            for j in range(2)
+        ]
+        db_session.add_all(accounts)
+        await db_session.flush()
         
-        login_data = login_response.json()
-        user_id = login_data["data"]["user"]["id"]
-        auth_headers = {"Authorization": f"Bearer {login_data['data']['tokens']['access_token']}"}
-        
-        # 创建多个测试账号和订阅
-        platforms = [Platform.WECHAT, Platform.WEIBO, Platform.TWITTER]
-        for i, platform in enumerate(platforms):
-            for j in range(2):  # 每个平台2个账号
-                account = Account(
-                    name=f"{platform.value}测试账号{j}",
-                    platform=platform,
-                    account_id=f"consistency_test_{platform.value}_{j}",
-                    follower_count=1000 + i * 100 + j * 10
-                )
-                db_session.add(account)
-                await db_session.commit()
-                await db_session.refresh(account)
-                
-                # 创建订阅
-                await client.post(
-                    "/api/v1/subscriptions/",
-                    json={
-                        "user_id": user_id,
-                        "account_id": account.id
-                    },
-                    headers=auth_headers
-                )
+        # 创建订阅
+        for account in accounts:
+            await client.post(
+                "/api/v1/subscriptions/",
+                json={
+                    "user_id": user_id,
+                    "account_id": account.id
+                },
+                headers=auth_headers
+            )
         
         return {
             "user_id": user_id,
@@ -754,7 +761,7 @@ class TestPerformanceAndScalability:
     """性能和可扩展性测试"""
     
     @pytest.mark.asyncio
-    async def test_large_subscription_list_performance(self, client: AsyncClient, db_session: AsyncSession):
+    async def test_large_subscription_list_performance(self, client: AsyncClient, db_session: AsyncSession, auth_headers_for):
         """
         测试大量订阅列表的性能
         需求: 7.1, 7.2
@@ -769,25 +776,12 @@ class TestPerformanceAndScalability:
         
         db_session.add(premium_user)
         await db_session.commit()
-        await db_session.refresh(premium_user)
-        
-        # 模拟登录
-        with patch.object(wechat_service, 'code_to_session') as mock_wechat:
-            mock_wechat.return_value = {
-                "openid": "performance_test_openid",
-                "session_key": "test_session_key"
-            }
-            
-            login_response = await client.post(
-                "/api/v1/auth/login",
-                json={"code": "performance_test_code"}
-            )
         
-        login_data = login_response.json()
-        auth_headers = {"Authorization": f"Bearer {login_data['data']['tokens']['access_token']}"}
+        # 直接签发令牌，登录不在性能测试范围内
+        auth_headers = auth_headers_for(premium_user)
         
-        # 记录开始时间
-        start_time = datetime.utcnow()
+        # 记录开始时间（单调时钟）
+        start_time = time.perf_counter()
         
         # 获取订阅列表（即使为空也要测试响应时间）
         list_response = await client.get(
@@ -796,48 +790,41 @@ class TestPerformanceAndScalability:
             headers=auth_headers
         )
         
-        # 记录结束时间
-        end_time = datetime.utcnow()
-        response_time = (end_time - start_time).total_seconds()
+        # 记录耗时
+        response_time = time.perf_counter() - start_time
         
         # 验证响应时间在可接受范围内（< 2秒）
         assert response_time < 2.0, f"订阅列表响应时间过长: {response_time}秒"
         assert list_response.status_code == 200
     
     @pytest.mark.asyncio
-    async def test_feed_loading_performance(self, client: AsyncClient, db_session: AsyncSession):
+    async def test_feed_loading_performance(self, client: AsyncClient, db_session: AsyncSession, auth_headers_for):
         """
         测试动态流加载性能
         需求: 7.1, 7.2
         """
-        # 创建用户
-        mock_wechat_response = {
-            "openid": "feed_performance_test_openid",
-            "session_key": "test_session_key"
-        }
-        
-        with patch.object(wechat_service, 'code_to_session', return_value=mock_wechat_response):
-            login_response = await client.post(
-                "/api/v1/auth/login",
-                json={"code": "feed_performance_test_code"}
-            )
-        
-        login_data = login_response.json()
-        auth_headers = {"Authorization": f"Bearer {login_data['data']['tokens']['access_token']}"}
+        # 直接写入用户并签发令牌，登录不在性能测试范围内
+        feed_user = User(
+            openid="feed_performance_test_openid",
+            nickname="动态流性能测试用户",
+            membership_level=MembershipLevel.FREE
+        )
+        db_session.add(feed_user)
+        await db_session.commit()
+        auth_headers = auth_headers_for(feed_user)
         
-        # 记录开始时间
-        start_time = datetime.utcnow()
+        # 记录开始时间（单调时钟）
+        start_time = time.perf_counter()
         
         # 获取动态流
         feed_response = await client.get(
-            "/api/v1/feed",
+            "/api/v1/content/feed",
             params={"page": 1, "page_size": 20},
             headers=auth_headers
         )
         
-        # 记录结束时间
-        end_time = datetime.utcnow()
-        response_time = (end_time - start_time).total_seconds()
+        # 记录耗时
+        response_time = time.perf_counter() - start_time
         
         # 验证响应时间在可接受范围内（< 3秒）
         assert response_time < 3.0, f"动态流响应时间过长: {response_time}秒"
@@ -846,7 +833,7 @@ class TestPerformanceAndScalability:
 
 # 测试运行配置
 @pytest.mark.asyncio
-async def test_run_all_e2e_scenarios(client: AsyncClient, db_session: AsyncSession):
+async def test_run_all_e2e_scenarios(client: AsyncClient, db_session: AsyncSession, login_factory):
     """运行所有端到端测试场景的集成测试"""
     
     # 创建测试实例
@@ -867,7 +854,7 @@ async def test_run_all_e2e_scenarios(client: AsyncClient, db_session: AsyncSessi
     
     # 运行订阅限制测试
     try:
-        await user_journey_test.test_subscription_limit_enforcement(client, db_session)
+        await user_journey_test.test_subscription_limit_enforcement(client, db_session, login_factory)
         print("✅ 订阅限制执行测试通过")
     except Exception as e:
         print(f"❌ 订阅限制执行测试失败: {e}")
@@ -875,7 +862,7 @@ async def test_run_all_e2e_scenarios(client: AsyncClient, db_session: AsyncSessi
     
     # 运行推送通知测试
     try:
-        await push_test.test_complete_push_notification_flow(client, db_session)
+        await push_test.test_complete_push_notification_flow(client, db_session, login_factory)
         print("✅ 推送通知流程测试通过")
     except Exception as e:
         print(f"❌ 推送通知流程测试失败: {e}")
@@ -884,7 +871,7 @@ async def test_run_all_e2e_scenarios(client: AsyncClient, db_session: AsyncSessi
     
     # 运行会员升级测试
     try:
-        await membership_test.test_membership_upgrade_flow(client, db_session)
+        await membership_test.test_membership_upgrade_flow(client, db_session, login_factory)
         print("✅ 会员升级流程测试通过")
     except Exception as e:
         print(f"❌ 会员升级流程测试失败: {e}")
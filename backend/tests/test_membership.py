@@ -3,6 +3,7 @@
 """
 import pytest
 from datetime import datetime, timedelta
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User, MembershipLevel
@@ -18,133 +19,78 @@ from app.core.exceptions import (
 )
 
 
+@pytest.mark.unit
 class TestMembershipConfig:
-    """会员配置测试"""
+    """会员配置测试（纯配置查询，不依赖数据库和事件循环）"""
     
-    def test_get_subscription_limit(self):
-        """测试获取订阅限制"""
-        assert MembershipConfig.get_subscription_limit(MembershipLevel.FREE) == 10
-        assert MembershipConfig.get_subscription_limit(MembershipLevel.BASIC) == 50
-        assert MembershipConfig.get_subscription_limit(MembershipLevel.PREMIUM) == -1
-    
-    def test_get_daily_push_limit(self):
-        """测试获取推送限制"""
-        assert MembershipConfig.get_daily_push_limit(MembershipLevel.FREE) == 5
-        assert MembershipConfig.get_daily_push_limit(MembershipLevel.BASIC) == 20
-        assert MembershipConfig.get_daily_push_limit(MembershipLevel.PREMIUM) == -1
-    
-    def test_get_features(self):
-        """测试获取功能列表"""
-        free_features = MembershipConfig.get_features(MembershipLevel.FREE)
-        assert "basic_aggregation" in free_features
-        
-        basic_features = MembershipConfig.get_features(MembershipLevel.BASIC)
-        assert "basic_aggregation" in basic_features
-        assert "advanced_search" in basic_features
-        
-        premium_features = MembershipConfig.get_features(MembershipLevel.PREMIUM)
-        assert "exclusive_features" in premium_features
-        assert "data_export" in premium_features
-    
-    def test_get_benefits(self):
-        """测试获取权益描述"""
-        free_benefits = MembershipConfig.get_benefits(MembershipLevel.FREE)
-        assert len(free_benefits) > 0
-        assert any("10个博主" in benefit for benefit in free_benefits)
-        
-        premium_benefits = MembershipConfig.get_benefits(MembershipLevel.PREMIUM)
-        assert any("无限" in benefit for benefit in premium_benefits)
+    @pytest.mark.parametrize("level,expected_sub,expected_push,expected_features,benefit_keyword", [
+        (MembershipLevel.FREE, 10, 5, ("basic_aggregation",), "10个博主"),
+        (MembershipLevel.V2, 50, 20, ("basic_aggregation", "advanced_search"), "50个博主"),
+        (MembershipLevel.V5, -1, -1, ("exclusive_features", "data_export"), "无限"),
+    ], ids=["free", "v2", "v5"])
+    def test_membership_config(self, level, expected_sub, expected_push, expected_features, benefit_keyword):
+        """测试各等级的订阅限制、推送限制、功能列表和权益描述"""
+        assert MembershipConfig.get_subscription_limit(level) == expected_sub
+        assert MembershipConfig.get_daily_push_limit(level) == expected_push
+        
+        features = MembershipConfig.get_features(level)
+        assert all(feature in features for feature in expected_features)
+        
+        if benefit_keyword:
+            benefits = MembershipConfig.get_benefits(level)
+            assert any(benefit_keyword in benefit for benefit in benefits)
 
 
 class TestMembershipService:
     """会员服务测试"""
     
-    @pytest.fixture
-    async def test_user(self, db_session: AsyncSession):
-        """创建测试用户"""
-        user = User(
-            openid="test_openid_123",
-            nickname="测试用户",
-            membership_level=MembershipLevel.FREE
-        )
-        db_session.add(user)
-        await db_session.commit()
-        await db_session.refresh(user)
-        return user
-    
-    @pytest.fixture
-    async def premium_user(self, db_session: AsyncSession):
-        """创建高级会员用户"""
-        expire_time = datetime.utcnow() + timedelta(days=30)
-        user = User(
-            openid="premium_openid_123",
-            nickname="高级用户",
-            membership_level=MembershipLevel.PREMIUM,
-            membership_expire_at=expire_time
-        )
-        db_session.add(user)
-        await db_session.commit()
-        await db_session.refresh(user)
-        return user
-    
-    @pytest.fixture
-    async def expired_user(self, db_session: AsyncSession):
-        """创建过期会员用户"""
-        expire_time = datetime.utcnow() - timedelta(days=1)
-        user = User(
-            openid="expired_openid_123",
-            nickname="过期用户",
-            membership_level=MembershipLevel.BASIC,
-            membership_expire_at=expire_time
-        )
-        db_session.add(user)
-        await db_session.commit()
-        await db_session.refresh(user)
-        return user
-    
     @pytest.fixture
     async def test_account(self, db_session: AsyncSession):
         """创建测试账号"""
         account = Account(
             name="测试博主",
-            platform=Platform.WEIBO,
+            platform=Platform.WEIBO.value,
             account_id="test_account_123",
             avatar_url="http://example.com/avatar.jpg",
-            description="测试博主描述",
-            follower_count=1000
+            description="测试博主描述"
         )
         db_session.add(account)
-        await db_session.commit()
-        await db_session.refresh(account)
+        await db_session.flush()
         return account
     
-    async def test_upgrade_membership_success(self, test_user: User, db_session: AsyncSession):
+    async def test_upgrade_membership_success(self, make_user, db_session: AsyncSession):
         """测试成功升级会员"""
-        # 升级到基础会员
+        test_user = await make_user()
+        
+        # 升级到V2会员
         result = await membership_service.upgrade_membership(
-            test_user.id, MembershipLevel.BASIC, 3, db_session
+            test_user.id, MembershipLevel.V2, 3, db_session
         )
         
-        assert result["level"] == MembershipLevel.BASIC.value
+        assert result["level"] == MembershipLevel.V2.value
         assert result["is_active"] is True
         assert result["subscription_limit"] == 50
         assert result["daily_push_limit"] == 20
         
         # 验证数据库中的数据
         await db_session.refresh(test_user)
-        assert test_user.membership_level == MembershipLevel.BASIC
+        assert test_user.membership_level == MembershipLevel.V2
         assert test_user.membership_expire_at is not None
     
-    async def test_upgrade_membership_invalid_level(self, test_user: User, db_session: AsyncSession):
+    async def test_upgrade_membership_invalid_level(self, make_user, db_session: AsyncSession):
         """测试升级到无效等级"""
+        test_user = await make_user()
+        
         with pytest.raises(BusinessException) as exc_info:
             await membership_service.upgrade_membership(
                 test_user.id, MembershipLevel.FREE, 1, db_session
             )
         assert "不能升级到免费等级" in str(exc_info.value)
     
-    async def test_upgrade_membership_invalid_duration(self, test_user: User, db_session: AsyncSession):
+    async def test_upgrade_membership_invalid_duration(self, make_user, db_session: AsyncSession):
         """测试无效的购买时长"""
+        test_user = await make_user()
+        
         with pytest.raises(BusinessException) as exc_info:
             await membership_service.upgrade_membership(
                 test_user.id, MembershipLevel.BASIC, 15, db_session
@@ -158,19 +104,29 @@ class TestMembershipService:
                 99999, MembershipLevel.BASIC, 1, db_session
             )
     
-    async def test_get_membership_info(self, premium_user: User, db_session: AsyncSession):
+    async def test_get_membership_info(self, make_user, db_session: AsyncSession):
         """测试获取会员信息"""
-        result = await membership_service.get_membership_info(premium_user.id, db_session)
+        v5_user = await make_user(
+            membership_level=MembershipLevel.V5,
+            membership_expire_at=datetime.utcnow() + timedelta(days=30)
+        )
+        
+        result = await membership_service.get_membership_info(v5_user.id, db_session)
         
-        assert result["level"] == MembershipLevel.PREMIUM.value
-        assert result["effective_level"] == MembershipLevel.PREMIUM.value
+        assert result["level"] == MembershipLevel.V5.value
+        assert result["effective_level"] == MembershipLevel.V5.value
         assert result["is_active"] is True
         assert result["subscription_limit"] == -1
         assert result["daily_push_limit"] == -1
         assert "exclusive_features" in result["features"]
     
-    async def test_get_membership_info_expired(self, expired_user: User, db_session: AsyncSession):
+    async def test_get_membership_info_expired(self, make_user, db_session: AsyncSession):
         """测试获取过期会员信息"""
+        expired_user = await make_user(
+            membership_level=MembershipLevel.BASIC,
+            membership_expire_at=datetime.utcnow() - timedelta(days=1)
+        )
+        
         result = await membership_service.get_membership_info(expired_user.id, db_session)
         
         assert result["level"] == MembershipLevel.BASIC.value
@@ -179,28 +135,57 @@ class TestMembershipService:
         assert result["subscription_limit"] == 10  # 降级为免费用户限制
         assert result["daily_push_limit"] == 5
     
+    @pytest.mark.unit
+    def test_get_effective_level(self):
+        """测试由已加载用户计算有效会员等级，过期会员按免费用户计算"""
+        active_user = User(
+            membership_level=MembershipLevel.V2,
+            membership_expire_at=datetime.utcnow() + timedelta(days=1)
+        )
+        expired_user = User(
+            membership_level=MembershipLevel.V2,
+            membership_expire_at=datetime.utcnow() - timedelta(days=1)
+        )
+        free_user = User(membership_level=MembershipLevel.FREE)
+        
+        assert membership_service.is_membership_active(active_user) is True
+        assert membership_service.get_effective_level(active_user) == MembershipLevel.V2
+        assert membership_service.is_membership_active(expired_user) is False
+        assert membership_service.get_effective_level(expired_user) == MembershipLevel.FREE
+        assert membership_service.is_membership_active(free_user) is True
+        assert membership_service.get_effective_level(free_user) == MembershipLevel.FREE
+    
     async def test_check_subscription_limit_free_user(
         self, 
-        test_user: User, 
+        make_user, 
         test_account: Account,
         db_session: AsyncSession
     ):
         """测试免费用户订阅限制检查"""
+        test_user = await make_user()
+        
         # 创建9个订阅（免费用户限制10个）
-        for i in range(9):
-            account = Account(
-                name=f"博主{i}",
-                platform=Platform.WEIBO,
-                account_id=f"account_{i}",
-                avatar_url="http://example.com/avatar.jpg",
-                description=f"博主{i}描述",
-                follower_count=1000
-            )
-            db_session.add(account)
-            await db_session.flush()
-            
-            subscription = Subscription(user_id=test_user.id, account_id=account.id)
-            db_session.add(subscription)
+        # 账号和订阅各用一条多行INSERT写入
+        account_ids = (await db_session.scalars(
+            insert(Account).returning(Account.account_id),
+            [
+                dict(
+                    name=f"博主{i}",
+                    platform=Platform.WEIBO.value,
+                    account_id=f"account_{i}",
+                    avatar_url="http://example.com/avatar.jpg",
+                    description=f"博主{i}描述"
+                )
+                for i in range(9)
+            ]
+        )).all()
+        await db_session.execute(
+            insert(Subscription),
+            [
+                dict(user_id=test_user.id, account_id=account_id, platform=Platform.WEIBO.value)
+                for account_id in account_ids
+            ]
+        )
         
         await db_session.commit()
         
@@ -209,7 +194,11 @@ class TestMembershipService:
         assert can_subscribe is True
         
         # 再添加1个订阅，达到限制
-        subscription = Subscription(user_id=test_user.id, account_id=test_account.id)
+        subscription = Subscription(
+            user_id=test_user.id,
+            account_id=test_account.account_id,
+            platform=test_account.platform
+        )
         db_session.add(subscription)
         await db_session.commit()
         
@@ -219,45 +208,58 @@ class TestMembershipService:
     
     async def test_check_subscription_limit_premium_user(
         self, 
-        premium_user: User, 
+        make_user, 
         test_account: Account,
         db_session: AsyncSession
     ):
-        """测试高级会员订阅限制检查（无限制）"""
+        """测试V5会员订阅限制检查（无限制）"""
+        v5_user = await make_user(
+            membership_level=MembershipLevel.V5,
+            membership_expire_at=datetime.utcnow() + timedelta(days=30)
+        )
+        
         # 创建大量订阅
-        for i in range(100):
-            account = Account(
-                name=f"博主{i}",
-                platform=Platform.WEIBO,
-                account_id=f"account_{i}",
-                avatar_url="http://example.com/avatar.jpg",
-                description=f"博主{i}描述",
-                follower_count=1000
-            )
-            db_session.add(account)
-            await db_session.flush()
-            
-            subscription = Subscription(user_id=premium_user.id, account_id=account.id)
-            db_session.add(subscription)
+        # 账号和订阅各用一条多行INSERT写入
+        account_ids = (await db_session.scalars(
+            insert(Account).returning(Account.account_id),
+            [
+                dict(
+                    name=f"博主{i}",
+                    platform=Platform.WEIBO.value,
+                    account_id=f"account_{i}",
+                    avatar_url="http://example.com/avatar.jpg",
+                    description=f"博主{i}描述"
+                )
+                for i in range(100)
+            ]
+        )).all()
+        await db_session.execute(
+            insert(Subscription),
+            [
+                dict(user_id=v5_user.id, account_id=account_id, platform=Platform.WEIBO.value)
+                for account_id in account_ids
+            ]
+        )
         
         await db_session.commit()
         
-        # 高级会员应该仍然可以订阅
-        can_subscribe = await membership_service.check_subscription_limit(premium_user.id, db_session)
+        # V5会员应该仍然可以订阅
+        can_subscribe = await membership_service.check_subscription_limit(v5_user.id, db_session)
         assert can_subscribe is True
     
-    async def test_check_push_limit_free_user(self, test_user: User, db_session: AsyncSession):
+    async def test_check_push_limit_free_user(self, make_user, db_session: AsyncSession):
         """测试免费用户推送限制检查"""
+        test_user = await make_user()
+        
         # 创建4条今日推送记录（免费用户限制5次）
         today = datetime.utcnow()
-        for i in range(4):
-            push_record = PushRecord(
-                user_id=test_user.id,
-                article_id=i + 1,
-                push_time=today,
-                status=PushStatus.SUCCESS
-            )
-            db_session.add(push_record)
+        await db_session.execute(
+            insert(PushRecord),
+            [
+                dict(user_id=test_user.id, article_id=i + 1, push_time=today, status=PushStatus.SUCCESS.value)
+                for i in range(4)
+            ]
+        )
         
         await db_session.commit()
         
@@ -270,7 +272,7 @@ class TestMembershipService:
             user_id=test_user.id,
             article_id=5,
             push_time=today,
-            status=PushStatus.SUCCESS
+            status=PushStatus.SUCCESS.value
         )
         db_session.add(push_record)
         await db_session.commit()
@@ -279,27 +281,33 @@ class TestMembershipService:
         can_push = await membership_service.check_push_limit(test_user.id, db_session)
         assert can_push is False
     
-    async def test_check_push_limit_premium_user(self, premium_user: User, db_session: AsyncSession):
-        """测试高级会员推送限制检查（无限制）"""
+    async def test_check_push_limit_premium_user(self, make_user, db_session: AsyncSession):
+        """测试V5会员推送限制检查（无限制）"""
+        v5_user = await make_user(
+            membership_level=MembershipLevel.V5,
+            membership_expire_at=datetime.utcnow() + timedelta(days=30)
+        )
+        
         # 创建大量今日推送记录
         today = datetime.utcnow()
-        for i in range(100):
-            push_record = PushRecord(
-                user_id=premium_user.id,
-                article_id=i + 1,
-                push_time=today,
-                status=PushStatus.SUCCESS
-            )
-            db_session.add(push_record)
+        await db_session.execute(
+            insert(PushRecord),
+            [
+                dict(user_id=v5_user.id, article_id=i + 1, push_time=today, status=PushStatus.SUCCESS.value)
+                for i in range(100)
+            ]
+        )
         
         await db_session.commit()
         
-        # 高级会员应该仍然可以推送
-        can_push = await membership_service.check_push_limit(premium_user.id, db_session)
+        # V5会员应该仍然可以推送
+        can_push = await membership_service.check_push_limit(v5_user.id, db_session)
         assert can_push is True
     
-    async def test_get_user_limits(self, test_user: User, db_session: AsyncSession):
+    async def test_get_user_limits(self, make_user, db_session: AsyncSession):
         """测试获取用户限制信息"""
+        test_user = await make_user()
+        
         result = await membership_service.get_user_limits(test_user.id, db_session)
         
         assert result["membership_level"] == MembershipLevel.FREE.value
@@ -313,17 +321,29 @@ class TestMembershipService:
         assert result["can_receive_push"] is True
         assert "basic_aggregation" in result["features"]
     
-    async def test_check_membership_expiry(self, expired_user: User, db_session: AsyncSession):
+    async def test_check_membership_expiry(self, db_session: AsyncSession):
         """测试检查会员到期"""
-        # 创建另一个未过期的用户
-        future_expire = datetime.utcnow() + timedelta(days=30)
-        active_user = User(
-            openid="active_openid_123",
-            nickname="活跃用户",
-            membership_level=MembershipLevel.BASIC,
-            membership_expire_at=future_expire
+        # 过期用户和未过期用户用一条多行INSERT写入
+        now = datetime.utcnow()
+        future_expire = now + timedelta(days=30)
+        result = await db_session.scalars(
+            insert(User).returning(User, sort_by_parameter_order=True),
+            [
+                dict(
+                    openid="expired_openid_123",
+                    nickname="过期用户",
+                    membership_level=MembershipLevel.BASIC,
+                    membership_expire_at=now - timedelta(days=1)
+                ),
+                dict(
+                    openid="active_openid_123",
+                    nickname="活跃用户",
+                    membership_level=MembershipLevel.BASIC,
+                    membership_expire_at=future_expire
+                ),
+            ]
         )
-        db_session.add(active_user)
+        expired_user, active_user = result.all()
         await db_session.commit()
         
         # 执行到期检查
@@ -3,7 +3,7 @@
 """
 import pytest
 from datetime import datetime, timedelta
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.exc import IntegrityError
 
 from app.models import User, Account, Article, Subscription, PushRecord
@@ -12,10 +12,43 @@ from app.models.account import Platform
 from app.models.push_record import PushStatus
 
 
+@pytest.fixture(scope="module")
+async def sample_user(module_db_session):
+    """模块内共享的测试用户"""
+    user = User(openid="test_user", nickname="测试用户")
+    module_db_session.add(user)
+    await module_db_session.commit()
+    return user
+
+
+@pytest.fixture(scope="module")
+async def sample_account(module_db_session):
+    """模块内共享的测试账号"""
+    account = Account(name="测试账号", platform="weibo", account_id="123")
+    module_db_session.add(account)
+    await module_db_session.commit()
+    return account
+
+
+@pytest.fixture(scope="module")
+async def sample_article(module_db_session, sample_account):
+    """模块内共享的测试文章"""
+    article = Article(
+        account_id=sample_account.account_id,
+        title="测试文章",
+        url="https://example.com/article",
+        publish_time=datetime.now(),
+        platform=sample_account.platform
+    )
+    module_db_session.add(article)
+    await module_db_session.commit()
+    return article
+
+
 class TestUserModel:
     """用户模型测试"""
     
-    async def test_create_user(self, db_session):
+    async def test_create_user(self, module_savepoint_db_session):
         """测试创建用户"""
         user = User(
             openid="test_openid_123",
@@ -24,9 +57,9 @@ class TestUserModel:
             membership_level=MembershipLevel.FREE
         )
         
-        db_session.add(user)
-        await db_session.commit()
-        await db_session.refresh(user)
+        module_savepoint_db_session.add(user)
+        await module_savepoint_db_session.commit()
+        await module_savepoint_db_session.refresh(user)
         
         assert user.id is not None
         assert user.openid == "test_openid_123"
@@ -35,19 +68,19 @@ class TestUserModel:
         assert user.created_at is not None
         assert user.updated_at is not None
     
-    async def test_user_unique_openid(self, db_session):
+    async def test_user_unique_openid(self, module_savepoint_db_session):
         """测试用户openid唯一性约束"""
         user1 = User(openid="duplicate_openid", nickname="用户1")
         user2 = User(openid="duplicate_openid", nickname="用户2")
         
-        db_session.add(user1)
-        await db_session.commit()
+        module_savepoint_db_session.add(user1)
+        await module_savepoint_db_session.commit()
         
-        db_session.add(user2)
+        module_savepoint_db_session.add(user2)
         with pytest.raises(IntegrityError):
-            await db_session.commit()
+            await module_savepoint_db_session.commit()
     
-    async def test_user_membership_properties(self, db_session):
+    def test_user_membership_properties(self):
         """测试用户会员属性"""
         # 免费用户
         free_user = User(openid="free_user", membership_level=MembershipLevel.FREE)
@@ -57,20 +90,20 @@ class TestUserModel:
         assert free_user.get_daily_push_limit() == 5
         
         # 付费会员（有效期内）
-        premium_user = User(
-            openid="premium_user",
-            membership_level=MembershipLevel.PREMIUM,
+        v5_user = User(
+            openid="v5_user",
+            membership_level=MembershipLevel.V5,
             membership_expire_at=datetime.now() + timedelta(days=30)
         )
-        assert premium_user.is_premium
-        assert premium_user.is_membership_active
-        assert premium_user.get_subscription_limit() == -1  # 无限制
-        assert premium_user.get_daily_push_limit() == -1  # 无限制
+        assert v5_user.is_premium
+        assert v5_user.is_membership_active
+        assert v5_user.get_subscription_limit() == -1  # 无限制
+        assert v5_user.get_daily_push_limit() == -1  # 无限制
         
         # 付费会员（已过期）
         expired_user = User(
             openid="expired_user",
-            membership_level=MembershipLevel.BASIC,
+            membership_level=MembershipLevel.V2,
             membership_expire_at=datetime.now() - timedelta(days=1)
         )
         assert expired_user.is_premium
@@ -82,7 +115,7 @@ class TestUserModel:
 class TestAccountModel:
     """账号模型测试"""
     
-    async def test_create_account(self, db_session):
+    async def test_create_account(self, module_savepoint_db_session):
         """测试创建账号"""
         account = Account(
             name="测试博主",
@@ -90,23 +123,21 @@ class TestAccountModel:
             account_id="weibo_123456",
             avatar_url="https://example.com/avatar.jpg",
             description="这是一个测试博主",
-            follower_count=10000,
             details={"verified": True, "level": "VIP"}
         )
         
-        db_session.add(account)
-        await db_session.commit()
-        await db_session.refresh(account)
+        module_savepoint_db_session.add(account)
+        await module_savepoint_db_session.commit()
+        await module_savepoint_db_session.refresh(account)
         
         assert account.id is not None
         assert account.name == "测试博主"
         assert account.platform == "weibo"
         assert account.account_id == "weibo_123456"
-        assert account.follower_count == 10000
         assert account.details["verified"] is True
         assert account.platform_display_name == "微博"
     
-    async def test_account_platform_display_name(self):
+    def test_account_platform_display_name(self):
         """测试平台显示名称"""
         weibo_account = Account(name="微博账号", platform="weibo", account_id="123")
         assert weibo_account.platform_display_name == "微博"
@@ -124,79 +155,74 @@ class TestAccountModel:
 class TestArticleModel:
     """文章模型测试"""
     
-    async def test_create_article(self, db_session):
+    async def test_create_article(self, module_savepoint_db_session, sample_account):
         """测试创建文章"""
-        # 先创建账号
-        account = Account(name="测试账号", platform="weibo", account_id="123")
-        db_session.add(account)
-        await db_session.commit()
-        await db_session.refresh(account)
+        account = sample_account
         
         # 创建文章
         publish_time = datetime.now()
         article = Article(
-            account_id=account.id,
+            account_id=account.account_id,
             title="测试文章标题",
             url="https://example.com/article/123",
             content="这是文章内容",
             summary="文章摘要",
             publish_time=publish_time,
-            publish_timestamp=int(publish_time.timestamp()),
             images=["https://example.com/img1.jpg", "https://example.com/img2.jpg"],
-            details={"likes": 100, "comments": 50}
+            details={"likes": 100, "comments": 50},
+            platform=account.platform
         )
         
-        db_session.add(article)
-        await db_session.commit()
-        await db_session.refresh(article)
+        module_savepoint_db_session.add(article)
+        await module_savepoint_db_session.commit()
+        await module_savepoint_db_session.refresh(article)
         
         assert article.id is not None
-        assert article.account_id == account.id
+        assert article.account_id == account.account_id
+        assert article.publish_timestamp == int(publish_time.timestamp())
         assert article.title == "测试文章标题"
         assert article.url == "https://example.com/article/123"
         assert article.image_count == 2
         assert article.has_images is True
         assert article.get_thumbnail_url() == "https://example.com/img1.jpg"
     
-    async def test_article_unique_url(self, db_session):
+    async def test_article_unique_url(self, module_savepoint_db_session):
         """测试文章URL唯一性约束"""
-        account = Account(name="测试账号", platform="weibo", account_id="123")
-        db_session.add(account)
-        await db_session.commit()
-        await db_session.refresh(account)
+        account = Account(name="唯一性测试账号", platform="weibo", account_id="unique_url_account")
+        module_savepoint_db_session.add(account)
+        await module_savepoint_db_session.flush()
         
         article1 = Article(
-            account_id=account.id,
+            account_id=account.account_id,
             title="文章1",
             url="https://example.com/duplicate",
             publish_time=datetime.now(),
-            publish_timestamp=int(datetime.now().timestamp())
+            platform=account.platform
         )
         
         article2 = Article(
-            account_id=account.id,
+            account_id=account.account_id,
             title="文章2",
             url="https://example.com/duplicate",
             publish_time=datetime.now(),
-            publish_timestamp=int(datetime.now().timestamp())
+            platform=account.platform
         )
         
-        db_session.add(article1)
-        await db_session.commit()
+        module_savepoint_db_session.add(article1)
+        await module_savepoint_db_session.commit()
         
-        db_session.add(article2)
+        module_savepoint_db_session.add(article2)
         with pytest.raises(IntegrityError):
-            await db_session.commit()
+            await module_savepoint_db_session.commit()
     
-    async def test_article_image_properties(self):
+    def test_article_image_properties(self):
         """测试文章图片属性"""
         # 无图片文章
         article_no_images = Article(
             account_id=1,
             title="无图文章",
             url="https://example.com/no-images",
-            publish_time=datetime.now(),
-            publish_timestamp=int(datetime.now().timestamp())
+            publish_time=datetime.now()
         )
         assert article_no_images.image_count == 0
         assert article_no_images.has_images is False
@@ -208,87 +234,58 @@ class TestArticleModel:
             title="有图文章",
             url="https://example.com/with-images",
             publish_time=datetime.now(),
-            publish_timestamp=int(datetime.now().timestamp()),
             images=["https://example.com/img1.jpg"]
         )
         assert article_with_images.image_count == 1
         assert article_with_images.has_images is True
         assert article_with_images.get_thumbnail_url() == "https://example.com/img1.jpg"
+        
+        # 重新赋值images时图片数量随之更新
+        article_with_images.images = []
+        assert article_with_images.image_count == 0
+        assert article_with_images.get_thumbnail_url() == ""
 
 
 class TestSubscriptionModel:
     """订阅模型测试"""
     
-    async def test_create_subscription(self, db_session):
+    async def test_create_subscription(self, module_savepoint_db_session, sample_user, sample_account):
         """测试创建订阅"""
-        # 创建用户和账号
-        user = User(openid="test_user", nickname="测试用户")
-        account = Account(name="测试账号", platform="weibo", account_id="123")
-        
-        db_session.add(user)
-        db_session.add(account)
-        await db_session.commit()
-        await db_session.refresh(user)
-        await db_session.refresh(account)
+        user, account = sample_user, sample_account
         
         # 创建订阅
-        subscription = Subscription(user_id=user.id, account_id=account.id)
-        db_session.add(subscription)
-        await db_session.commit()
-        await db_session.refresh(subscription)
+        subscription = Subscription(user_id=user.id, account_id=account.account_id, platform=account.platform)
+        module_savepoint_db_session.add(subscription)
+        await module_savepoint_db_session.commit()
+        await module_savepoint_db_session.refresh(subscription)
         
         assert subscription.id is not None
         assert subscription.user_id == user.id
-        assert subscription.account_id == account.id
+        assert subscription.account_id == account.account_id
         assert subscription.created_at is not None
     
-    async def test_subscription_unique_constraint(self, db_session):
+    async def test_subscription_unique_constraint(self, module_savepoint_db_session, sample_user, sample_account):
         """测试订阅唯一性约束"""
-        user = User(openid="test_user", nickname="测试用户")
-        account = Account(name="测试账号", platform="weibo", account_id="123")
-        
-        db_session.add(user)
-        db_session.add(account)
-        await db_session.commit()
-        await db_session.refresh(user)
-        await db_session.refresh(account)
+        user, account = sample_user, sample_account
         
         # 创建第一个订阅
-        subscription1 = Subscription(user_id=user.id, account_id=account.id)
-        db_session.add(subscription1)
-        await db_session.commit()
+        subscription1 = Subscription(user_id=user.id, account_id=account.account_id, platform=account.platform)
+        module_savepoint_db_session.add(subscription1)
+        await module_savepoint_db_session.commit()
         
         # 尝试创建重复订阅
-        subscription2 = Subscription(user_id=user.id, account_id=account.id)
-        db_session.add(subscription2)
+        subscription2 = Subscription(user_id=user.id, account_id=account.account_id, platform=account.platform)
+        module_savepoint_db_session.add(subscription2)
         with pytest.raises(IntegrityError):
-            await db_session.commit()
+            await module_savepoint_db_session.commit()
 
 
 class TestPushRecordModel:
     """推送记录模型测试"""
     
-    async def test_create_push_record(self, db_session):
+    async def test_create_push_record(self, module_savepoint_db_session, sample_user, sample_article):
         """测试创建推送记录"""
-        # 创建用户、账号和文章
-        user = User(openid="test_user", nickname="测试用户")
-        account = Account(name="测试账号", platform="weibo", account_id="123")
-        db_session.add(user)
-        db_session.add(account)
-        await db_session.commit()
-        await db_session.refresh(user)
-        await db_session.refresh(account)
-        
-        article = Article(
-            account_id=account.id,
-            title="测试文章",
-            url="https://example.com/article",
-            publish_time=datetime.now(),
-            publish_timestamp=int(datetime.now().timestamp())
-        )
-        db_session.add(article)
-        await db_session.commit()
-        await db_session.refresh(article)
+        user, article = sample_user, sample_article
         
         # 创建推送记录
         push_time = datetime.now()
@@ -299,9 +296,8 @@ class TestPushRecordModel:
             status=PushStatus.SUCCESS.value
         )
         
-        db_session.add(push_record)
-        await db_session.commit()
-        await db_session.refresh(push_record)
+        module_savepoint_db_session.add(push_record)
+        await module_savepoint_db_session.commit()
         
         assert push_record.id is not None
         assert push_record.user_id == user.id
@@ -310,7 +306,7 @@ class TestPushRecordModel:
         assert push_record.is_success is True
         assert push_record.is_failed is False
     
-    async def test_push_record_status_properties(self):
+    def test_push_record_status_properties(self):
         """测试推送记录状态属性"""
         # 成功推送
         success_record = PushRecord(
@@ -347,29 +343,23 @@ class TestPushRecordModel:
 class TestModelRelationships:
     """模型关系测试"""
     
-    async def test_user_subscriptions_relationship(self, db_session):
+    async def test_user_subscriptions_relationship(self, module_savepoint_db_session, sample_user, sample_account):
         """测试用户-订阅关系"""
-        user = User(openid="test_user", nickname="测试用户")
-        account1 = Account(name="账号1", platform="weibo", account_id="123")
+        user, account1 = sample_user, sample_account
         account2 = Account(name="账号2", platform="wechat", account_id="456")
         
-        db_session.add(user)
-        db_session.add(account1)
-        db_session.add(account2)
-        await db_session.commit()
-        await db_session.refresh(user)
-        await db_session.refresh(account1)
-        await db_session.refresh(account2)
+        module_savepoint_db_session.add(account2)
+        await module_savepoint_db_session.flush()
         
-        # 创建订阅
-        subscription1 = Subscription(user_id=user.id, account_id=account1.id)
-        subscription2 = Subscription(user_id=user.id, account_id=account2.id)
-        db_session.add(subscription1)
-        db_session.add(subscription2)
-        await db_session.commit()
+        # 两条订阅一次批量写入（executemany）
+        await module_savepoint_db_session.execute(insert(Subscription), [
+            {"user_id": user.id, "account_id": account.account_id, "platform": account.platform}
+            for account in (account1, account2)
+        ])
+        await module_savepoint_db_session.commit()
         
         # 查询订阅数量来验证关系
-        result = await db_session.execute(
+        result = await module_savepoint_db_session.execute(
             select(Subscription).where(Subscription.user_id == user.id)
         )
         subscriptions = result.scalars().all()
@@ -377,35 +367,28 @@ class TestModelRelationships:
         # 验证关系
         assert len(subscriptions) == 2
     
-    async def test_account_articles_relationship(self, db_session):
-        """测试账号-文章关系"""
-        account = Account(name="测试账号", platform="weibo", account_id="123")
-        db_session.add(account)
-        await db_session.commit()
-        await db_session.refresh(account)
-        
-        # 创建文章
-        article1 = Article(
-            account_id=account.id,
-            title="文章1",
-            url="https://example.com/article1",
-            publish_time=datetime.now(),
-            publish_timestamp=int(datetime.now().timestamp())
-        )
-        article2 = Article(
-            account_id=account.id,
-            title="文章2",
-            url="https://example.com/article2",
-            publish_time=datetime.now(),
-            publish_timestamp=int(datetime.now().timestamp())
-        )
-        db_session.add(article1)
-        db_session.add(article2)
-        await db_session.commit()
+    async def test_account_articles_relationship(self, module_savepoint_db_session):
+        """测试账号-文章关系（使用独立账号，避免计入共享的预置文章）"""
+        account = Account(name="文章关系测试账号", platform="weibo", account_id="article_relation_account")
+        module_savepoint_db_session.add(account)
+        await module_savepoint_db_session.flush()
+        
+        # 两篇文章一次批量写入（executemany），publish_timestamp按publish_time计算
+        await module_savepoint_db_session.execute(insert(Article), [
+            {
+                "account_id": account.account_id,
+                "title": f"文章{i}",
+                "url": f"https://example.com/article{i}",
+                "publish_time": datetime.now(),
+                "platform": account.platform
+            }
+            for i in (1, 2)
+        ])
+        await module_savepoint_db_session.commit()
         
         # 查询文章数量来验证关系
-        result = await db_session.execute(
-            select(Article).where(Article.account_id == account.id)
+        result = await module_savepoint_db_session.execute(
+            select(Article).where(Article.account_id == account.account_id)
         )
         articles = result.scalars().all()
         
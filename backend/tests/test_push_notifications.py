@@ -182,10 +182,9 @@ class TestPushNotificationService:
             # Mock limits service
             with patch('app.services.push_notification.limits_service') as mock_limits:
                 mock_limits.check_push_limit.return_value = {
-                    "can_push": True,
-                    "message": "可以推送"
+                    "can_receive_push": True,
+                    "daily_push_limit": 5
                 }
-                mock_limits.increment_push_count.return_value = None
                 
                 # Mock WeChat service
                 with patch('app.services.push_notification.wechat_service') as mock_wechat:
@@ -226,8 +225,8 @@ class TestPushNotificationService:
             # Mock limits service - limit reached
             with patch('app.services.push_notification.limits_service') as mock_limits:
                 mock_limits.check_push_limit.return_value = {
-                    "can_push": False,
-                    "message": "今日推送次数已达上限"
+                    "can_receive_push": False,
+                    "daily_push_limit": 5
                 }
                 
                 # Mock database operations
@@ -324,7 +323,7 @@ class TestPushQueueService:
         # Mock limits service
         with patch('app.services.push_queue.limits_service') as mock_limits:
             mock_limits.check_push_limit.return_value = {
-                "can_push": True
+                "can_receive_push": True
             }
             
             # Mock database operations
@@ -352,8 +351,8 @@ class TestPushQueueService:
         # Mock limits service - some users reach limit
         def mock_check_limit(user_id, db, raise_exception=False):
             if user_id == 2:
-                return {"can_push": False}
-            return {"can_push": True}
+                return {"can_receive_push": False}
+            return {"can_receive_push": True}
         
         with patch('app.services.push_queue.limits_service') as mock_limits:
             mock_limits.check_push_limit.side_effect = mock_check_limit
@@ -427,8 +426,8 @@ class TestPushLimitsIntegration:
         # Mock that user has already received 5 pushes today
         with patch('app.services.push_notification.limits_service') as mock_limits:
             mock_limits.check_push_limit.return_value = {
-                "can_push": False,
-                "message": "今日推送次数已达上限(5次)"
+                "can_receive_push": False,
+                "daily_push_limit": 5
             }
             
             with patch.object(db_session, 'execute') as mock_execute:
@@ -480,10 +479,9 @@ class TestPushLimitsIntegration:
         # Mock that premium user can always push (no limit)
         with patch('app.services.push_notification.limits_service') as mock_limits:
             mock_limits.check_push_limit.return_value = {
-                "can_push": True,
-                "message": "高级会员无推送限制"
+                "can_receive_push": True,
+                "daily_push_limit": -1
             }
-            mock_limits.increment_push_count.return_value = None
             
             with patch.object(db_session, 'execute') as mock_execute:
                 # Mock user query
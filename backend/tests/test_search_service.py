@@ -6,6 +6,7 @@ import asyncio
 from unittest.mock import AsyncMock, MagicMock
 from app.services.search.service import SearchService
 from app.services.search.adapters.mock import MockPlatformAdapter
+from app.services.search.adapters.wechat import WeChatAdapter
 from app.services.search.cache import SearchCache
 from app.models.account import Platform
 
@@ -199,6 +200,31 @@ class TestMockPlatformAdapter:
         assert normalized["details"]["verified"] is True
 
 
+class TestWeChatAdapterArticles:
+    """微信公众号适配器文章分页测试类"""
+    
+    @pytest.fixture
+    def wechat_adapter(self):
+        """创建数据库访问被替换的微信公众号适配器"""
+        adapter = WeChatAdapter()
+        adapter.wechat_db = MagicMock()
+        return adapter
+    
+    @pytest.mark.asyncio
+    async def test_get_articles_by_account_id_failure(self, wechat_adapter):
+        """测试数据库查询失败时返回None"""
+        wechat_adapter.wechat_db.get_articles_before.return_value = {"success": False, "data": None}
+        
+        assert await wechat_adapter.get_articles_by_account_id("mp_1", limit=10) is None
+    
+    @pytest.mark.asyncio
+    async def test_get_articles_by_account_id_empty(self, wechat_adapter):
+        """测试账号没有文章时返回空列表"""
+        wechat_adapter.wechat_db.get_articles_before.return_value = {"success": True, "data": []}
+        
+        assert await wechat_adapter.get_articles_by_account_id("mp_1", limit=10) == []
+
+
 class TestSearchCache:
     """搜索缓存测试类"""
     
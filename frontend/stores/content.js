@@ -101,7 +101,7 @@ export const useContentStore = defineStore('content', {
               }
 
               this.pagination.total = cachedData.total || 0
-              this.pagination.hasMore = (this.feedList.length < cachedData.total)
+              this.pagination.hasMore = !!cachedData.hasMore
               this.lastUpdateTime = cachedData.timestamp || Date.now()
               
               // 延迟一些时间后结束加载状态，避免闪烁
@@ -133,8 +133,9 @@ export const useContentStore = defineStore('content', {
           this.feedList.push(...(result.data || []))
         }
 
+        // 动态流默认不统计总数，由后端返回的has_more判断是否还有下一页
         this.pagination.total = result.total || 0
-        this.pagination.hasMore = (this.feedList.length < result.total)
+        this.pagination.hasMore = !!result.has_more
         this.pagination.page++
         this.lastUpdateTime = Date.now()
 
@@ -143,6 +144,7 @@ export const useContentStore = defineStore('content', {
           await cache.set(cacheKey, {
             data: result.data,
             total: result.total,
+            hasMore: result.has_more,
             timestamp: Date.now()
           }, {
             strategy: CacheStrategy.STORAGE_FIRST,
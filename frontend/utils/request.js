@@ -160,7 +160,7 @@ class Request {
           if (data && data.code === 200) {
             // 对于分页响应，返回完整的响应对象（包含data, total, page等）
             // 对于普通响应，返回data字段
-            if (data.total !== undefined && (data.page !== undefined || data.total_pages !== undefined)) {
+            if ((data.total !== undefined || data.has_more !== undefined) && (data.page !== undefined || data.total_pages !== undefined)) {
               console.log('检测到分页响应，保留完整响应对象')
               console.log('分页信息:', { 
                 total: data.total, 